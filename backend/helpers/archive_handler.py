@@ -0,0 +1,246 @@
+import json
+import mmap
+import os
+import threading
+import time
+import zlib
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class ArchiveHandler:
+    """
+    Append-only archive of every fetched page, used to re-parse pages without any network I/O.
+
+    Pages are zlib compressed and appended to segment files, an index file records for each page its url, fetch
+    time and position in the segments. Segments are memory-mapped when read. Processes sharing a directory (e.g. the
+    shards of a scrape, see shard_index) append under an exclusive lock of the index file, where fcntl is available,
+    and see the pages appended by the others once they reload the index (see close).
+
+    The archive is not pruned, HttpHandler only appends to it when its use_archive setting is on.
+
+    Attributes
+    ----------
+        directory        Directory holding the segments and the index
+        segment_bytes    Size above which a new segment is started
+
+    Methods
+    -------
+        configure(directory=None, segment_bytes=None):
+            Changes the archive settings.
+        append(url, response):
+            Appends a page to the archive.
+        get_entries(url):
+            Retrieves the index entries of an url, oldest first.
+        read(url, at=None):
+            Reads an archived page back as a response.
+        close():
+            Closes the memory maps and forgets the loaded index.
+    """
+
+    directory = os.path.join('.cache', 'archive')
+    segment_bytes = 256 * 1024 ** 2
+
+    __index = None
+    __maps = {}
+    __lock = threading.RLock()
+
+    @staticmethod
+    def configure(directory=None, segment_bytes=None):
+        """
+        Changes the archive settings.
+
+        :param str directory: Specify the directory holding the segments and the index
+        :param int segment_bytes: Specify the size above which a new segment is started
+        """
+
+        with ArchiveHandler.__lock:
+            if directory is not None:
+                ArchiveHandler.close()
+                ArchiveHandler.directory = directory
+            if segment_bytes is not None:
+                ArchiveHandler.segment_bytes = segment_bytes
+
+    @staticmethod
+    def __get_index():
+        """
+        Retrieves the index, loads it from the index file on first use.
+
+        :return: A dict of index entries lists keyed by url
+        """
+
+        if ArchiveHandler.__index is None:
+            index = {}
+            path = os.path.join(ArchiveHandler.directory, 'index.jsonl')
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        if not line.endswith('\n'):
+                            break  # Entry of an interrupted append, its page is ignored
+                        entry = json.loads(line)
+                        index.setdefault(entry['url'], []).append(entry)
+            ArchiveHandler.__index = index
+
+        return ArchiveHandler.__index
+
+    @staticmethod
+    def __drop_partial_line(path):
+        """
+        Cuts the entry of an interrupted append off the end of the index, so that the next entry starts on a line of
+        its own.
+
+        :param str path: Specify the path of the index
+        """
+
+        size = os.path.getsize(path)
+        if size == 0:
+            return
+
+        with open(path, 'rb+') as f:
+            # Entries are short, the last complete one ends within the tail of the index
+            start = max(0, size - 64 * 1024)
+            f.seek(start)
+            tail = f.read()
+            if not tail.endswith(b'\n'):
+                f.truncate(start + tail.rfind(b'\n') + 1)
+
+    @staticmethod
+    def __get_segment_path(segment):
+        return os.path.join(ArchiveHandler.directory, f'pages-{segment:05d}.arc')
+
+    @staticmethod
+    def __get_current_segment():
+        """
+        Retrieves the segment new pages are appended to.
+
+        :return: The segment number
+        """
+
+        segments = [int(x[6:11]) for x in os.listdir(ArchiveHandler.directory)
+                    if x.startswith('pages-') and x.endswith('.arc')]
+        segment = max(segments, default=0)
+
+        path = ArchiveHandler.__get_segment_path(segment)
+        if os.path.exists(path) and os.path.getsize(path) >= ArchiveHandler.segment_bytes:
+            segment += 1
+
+        return segment
+
+    @staticmethod
+    def append(url, response):
+        """
+        Appends a page to the archive.
+
+        :param str url: Specify the url
+        :param requests.Response response: Specify the response
+        """
+
+        record = zlib.compress(response.content)
+
+        with ArchiveHandler.__lock:
+            os.makedirs(ArchiveHandler.directory, exist_ok=True)
+            index = ArchiveHandler.__get_index()
+
+            with open(os.path.join(ArchiveHandler.directory, 'index.jsonl'), 'a', encoding='utf-8') as index_file:
+                # Other processes appending to the directory wait until the page and its entry are both written
+                if fcntl is not None:
+                    fcntl.flock(index_file, fcntl.LOCK_EX)
+                ArchiveHandler.__drop_partial_line(index_file.name)
+
+                segment = ArchiveHandler.__get_current_segment()
+                with open(ArchiveHandler.__get_segment_path(segment), 'ab') as f:
+                    f.seek(0, os.SEEK_END)
+                    offset = f.tell()
+                    f.write(record)
+
+                entry = {
+                    'url': url,
+                    'fetched_at': time.time(),
+                    'status': response.status_code,
+                    'content_type': response.headers.get('Content-Type'),
+                    'segment': segment,
+                    'offset': offset,
+                    'length': len(record),
+                }
+                index_file.write(json.dumps(entry) + '\n')
+                index_file.flush()
+
+            index.setdefault(url, []).append(entry)
+
+    @staticmethod
+    def get_entries(url):
+        """
+        Retrieves the index entries of an url, oldest first.
+
+        :param str url: Specify the url
+        :return: A list of dict with the url, fetched_at, status, content_type, segment, offset and length keys
+        """
+
+        with ArchiveHandler.__lock:
+            return list(ArchiveHandler.__get_index().get(url, []))
+
+    @staticmethod
+    def __get_map(segment, end):
+        """
+        Retrieves the memory map of a segment, maps it again if it grew past the mapped size.
+
+        :param int segment: Specify the segment number
+        :param int end: Specify the offset the map has to reach
+        :return: A read only memory map
+        """
+
+        segment_map = ArchiveHandler.__maps.get(segment)
+        if segment_map is None or len(segment_map) < end:
+            if segment_map is not None:
+                segment_map.close()
+            with open(ArchiveHandler.__get_segment_path(segment), 'rb') as f:
+                segment_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            ArchiveHandler.__maps[segment] = segment_map
+
+        return segment_map
+
+    @staticmethod
+    def read(url, at=None):
+        """
+        Reads an archived page back as a response.
+
+        :param str url: Specify the url
+        :param float at: Specify a unix timestamp, reads the last page fetched before it instead of the last one
+        :return: The response, None if the url was never archived
+        """
+
+        with ArchiveHandler.__lock:
+            entries = [x for x in ArchiveHandler.__get_index().get(url, []) if at is None or x['fetched_at'] <= at]
+            if not entries:
+                return None
+
+            entry = entries[-1]
+            end = entry['offset'] + entry['length']
+            record = ArchiveHandler.__get_map(entry['segment'], end)[entry['offset']:end]
+
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.url = url
+        response.headers = CaseInsensitiveDict({'Content-Type': entry['content_type']} if entry['content_type'] else {})
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response._content = zlib.decompress(record)
+
+        return response
+
+    @staticmethod
+    def close():
+        """
+        Closes the memory maps and forgets the loaded index.
+        """
+
+        with ArchiveHandler.__lock:
+            for segment_map in ArchiveHandler.__maps.values():
+                segment_map.close()
+            ArchiveHandler.__maps = {}
+            ArchiveHandler.__index = None
@@ -0,0 +1,286 @@
+import datetime
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+class CacheHandler:
+    """
+    Persistent HTTP response cache keyed by url, with conditional revalidation and a size bounded LRU eviction.
+
+    Bodies are kept as files under directory, their metadata in an sqlite index next to them.
+
+    Attributes
+    ----------
+        directory      Directory holding the cached responses
+        max_bytes      Total size of the cached bodies above which the least recently used ones are evicted
+        ttls           List of (url pattern, seconds) pairs, the first matching pattern gives the url's time to live,
+                       None means the response never expires
+        default_ttl    Time to live, in seconds, of urls matching none of the ttls patterns
+        settle_days    Number of days after the date of a dated url past which its response is final
+
+    Methods
+    -------
+        configure(directory=None, max_bytes=None, ttls=None, default_ttl=None):
+            Changes the cache settings.
+        get_ttl(url, fetched_at=None):
+            Retrieves the time to live of an url's response.
+        lookup(url):
+            Retrieves a cached response and whether it is still fresh.
+        get_conditional_headers(response):
+            Builds the headers revalidating a cached response.
+        store(url, response):
+            Stores a response.
+        touch(url):
+            Marks a cached response as revalidated.
+        clear():
+            Removes every cached response.
+    """
+
+    directory = os.path.join('.cache', 'http')
+    max_bytes = 1024 ** 3
+    ttls = [
+        # Fixtures, schedules and scoreboards of settled days never change, the patterns only match responses
+        # fetched more than settle_days after their date
+        (r'/date/(?P<date>\d{8})', None),
+        (r'[?&]dates=(?:\d{8}-)?(?P<date>\d{8})', None),
+        (r'/teams($|\?)', 7 * 24 * 3600),
+        (r'/roster|/squad/', 24 * 3600),
+        (r'/news($|\?)', 15 * 60),
+    ]
+    default_ttl = 600
+    settle_days = 1
+
+    __connection = None
+    __lock = threading.RLock()
+
+    @staticmethod
+    def configure(directory=None, max_bytes=None, ttls=None, default_ttl=None):
+        """
+        Changes the cache settings.
+
+        :param str directory: Specify the directory holding the cached responses
+        :param int max_bytes: Specify the total size of the cached bodies above which old ones are evicted
+        :param list[tuple] ttls: Specify the (url pattern, seconds) pairs giving each url its time to live
+        :param int default_ttl: Specify the time to live, in seconds, of urls matching none of the patterns
+        """
+
+        with CacheHandler.__lock:
+            if directory is not None:
+                CacheHandler.directory = directory
+                if CacheHandler.__connection is not None:
+                    CacheHandler.__connection.close()
+                CacheHandler.__connection = None
+            if max_bytes is not None:
+                CacheHandler.max_bytes = max_bytes
+            if ttls is not None:
+                CacheHandler.ttls = list(ttls)
+            if default_ttl is not None:
+                CacheHandler.default_ttl = default_ttl
+
+    @staticmethod
+    def __get_connection():
+        """
+        Retrieves the connection to the index, creates it on first use.
+
+        :return: An sqlite connection
+        """
+
+        if CacheHandler.__connection is None:
+            os.makedirs(CacheHandler.directory, exist_ok=True)
+            connection = sqlite3.connect(os.path.join(CacheHandler.directory, 'index.sqlite'),
+                                         check_same_thread=False)
+            connection.execute('CREATE TABLE IF NOT EXISTS responses ('
+                               'key TEXT PRIMARY KEY, url TEXT, status INTEGER, headers TEXT, etag TEXT, '
+                               'last_modified TEXT, fetched_at REAL, accessed_at REAL, size INTEGER)')
+            connection.execute('CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)')
+            CacheHandler.__connection = connection
+
+        return CacheHandler.__connection
+
+    @staticmethod
+    def __get_key(url):
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def __get_path(key):
+        return os.path.join(CacheHandler.directory, key[:2], key)
+
+    @staticmethod
+    def get_ttl(url, fetched_at=None):
+        """
+        Retrieves the time to live of an url's response.
+
+        A pattern capturing a date only matches responses fetched more than settle_days after it, a page fetched on
+        the day of its games (or the day after, before every score is final) keeps the time to live of the next
+        matching pattern, default_ttl for dated pages, until it is fetched again.
+
+        :param str url: Specify the url
+        :param float fetched_at: Specify the time the response was fetched at, as a timestamp, defaults to now
+        :return: The time to live in seconds, None if the response never expires
+        """
+
+        fetched_date = datetime.date.today() if fetched_at is None else datetime.date.fromtimestamp(fetched_at)
+
+        for pattern, ttl in CacheHandler.ttls:
+            match = re.search(pattern, url)
+            if match is None:
+                continue
+            date = match.groupdict().get('date')
+            if date is not None and fetched_date <= datetime.datetime.strptime(date, '%Y%m%d').date() + \
+                    datetime.timedelta(days=CacheHandler.settle_days):
+                continue
+            return ttl
+
+        return CacheHandler.default_ttl
+
+    @staticmethod
+    def lookup(url):
+        """
+        Retrieves a cached response and whether it is still fresh.
+
+        :param str url: Specify the url
+        :return: The cached response (None if missing) and True if it has not expired
+        """
+
+        key = CacheHandler.__get_key(url)
+
+        with CacheHandler.__lock:
+            row = CacheHandler.__get_connection().execute(
+                'SELECT status, headers, fetched_at FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None, False
+            try:
+                with open(CacheHandler.__get_path(key), 'rb') as f:
+                    content = f.read()
+            except FileNotFoundError:
+                CacheHandler.__get_connection().execute('DELETE FROM responses WHERE key = ?', (key,))
+                CacheHandler.__get_connection().commit()
+                return None, False
+
+            CacheHandler.__get_connection().execute('UPDATE responses SET accessed_at = ? WHERE key = ?',
+                                                    (time.time(), key))
+            CacheHandler.__get_connection().commit()
+
+        status, headers, fetched_at = row
+
+        response = requests.Response()
+        response.status_code = status
+        response.url = url
+        response.headers = CaseInsensitiveDict(dict(x.split(': ', 1) for x in headers.split('\n') if x))
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response._content = content
+
+        ttl = CacheHandler.get_ttl(url, fetched_at)
+        return response, ttl is None or time.time() - fetched_at < ttl
+
+    @staticmethod
+    def get_conditional_headers(response):
+        """
+        Builds the headers revalidating a cached response.
+
+        :param requests.Response response: Specify the cached response
+        :return: A dict of headers, empty if the response carries no validator
+        """
+
+        headers = {}
+        if response.headers.get('ETag'):
+            headers['If-None-Match'] = response.headers['ETag']
+        if response.headers.get('Last-Modified'):
+            headers['If-Modified-Since'] = response.headers['Last-Modified']
+
+        return headers
+
+    @staticmethod
+    def store(url, response):
+        """
+        Stores a response, then evicts the least recently used ones while the cache is above max_bytes.
+
+        Only successful responses are stored.
+
+        :param str url: Specify the url
+        :param requests.Response response: Specify the response
+        """
+
+        if response.status_code != 200:
+            return
+
+        key = CacheHandler.__get_key(url)
+        path = CacheHandler.__get_path(key)
+        content = response.content
+        headers = '\n'.join(f'{k}: {v}' for k, v in response.headers.items()
+                            if k.lower() not in ('content-encoding', 'transfer-encoding', 'content-length'))
+        now = time.time()
+
+        with CacheHandler.__lock:
+            connection = CacheHandler.__get_connection()
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path + '.tmp', 'wb') as f:
+                f.write(content)
+            os.replace(path + '.tmp', path)
+
+            connection.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                               (key, url, response.status_code, headers, response.headers.get('ETag'),
+                                response.headers.get('Last-Modified'), now, now, len(content)))
+            CacheHandler.__evict(connection)
+            connection.commit()
+
+    @staticmethod
+    def touch(url):
+        """
+        Marks a cached response as revalidated, its time to live starts again.
+
+        :param str url: Specify the url
+        """
+
+        now = time.time()
+
+        with CacheHandler.__lock:
+            connection = CacheHandler.__get_connection()
+            connection.execute('UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE key = ?',
+                               (now, now, CacheHandler.__get_key(url)))
+            connection.commit()
+
+    @staticmethod
+    def __evict(connection):
+        """
+        Removes the least recently used responses until the cache fits in max_bytes.
+
+        :param sqlite3.Connection connection: Specify the connection to the index
+        """
+
+        total = connection.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= CacheHandler.max_bytes:
+            return
+
+        for key, size in connection.execute('SELECT key, size FROM responses ORDER BY accessed_at').fetchall():
+            if total <= CacheHandler.max_bytes:
+                break
+            connection.execute('DELETE FROM responses WHERE key = ?', (key,))
+            try:
+                os.remove(CacheHandler.__get_path(key))
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    @staticmethod
+    def clear():
+        """
+        Removes every cached response.
+        """
+
+        with CacheHandler.__lock:
+            connection = CacheHandler.__get_connection()
+            for (key,) in connection.execute('SELECT key FROM responses').fetchall():
+                try:
+                    os.remove(CacheHandler.__get_path(key))
+                except FileNotFoundError:
+                    pass
+            connection.execute('DELETE FROM responses')
+            connection.commit()
@@ -0,0 +1,161 @@
+import asyncio
+import collections
+import concurrent.futures
+import contextvars
+
+
+class ConcurrencyHandler:
+    """
+    Set of static methods that run blocking scraping work concurrently.
+
+    Attributes
+    ----------
+
+    Methods
+    -------
+        bind_context(func):
+            Wraps a function so that it runs in the calling thread's context.
+        gather(func, items, concurrency=8):
+            Calls func on every item from an asyncio loop, with at most concurrency calls in flight.
+        map_threaded(func, items, max_workers=8):
+            Calls func on every item from a thread pool, handling results as they complete.
+        imap_threaded(func, items, max_workers=8):
+            Calls func on every item from a thread pool, yielding results in order as soon as they are available.
+        interleave(items, key):
+            Reorders items round-robin over their keys.
+    """
+
+    @staticmethod
+    def bind_context(func):
+        """
+        Wraps a function so that it runs in a copy of the calling thread's context whatever the thread calling it,
+        worker threads then share e.g. the request budget of HttpHandler.limiting.
+
+        :param callable func: Specify the function
+        :return: The wrapped function
+        """
+
+        context = contextvars.copy_context()
+
+        def call(*args, **kwargs):
+            # A context cannot be entered by two threads at once, each call runs in a copy of its own
+            return context.copy().run(func, *args, **kwargs)
+
+        return call
+
+    @staticmethod
+    def gather(func, items, concurrency=8):
+        """
+        Calls func on every item from an asyncio loop, with at most concurrency calls in flight.
+
+        func is blocking (it goes through HttpHandler), each call is handed to a worker thread.
+
+        :param callable func: Specify the function called on each item
+        :param list items: Specify the items
+        :param int concurrency: Specify the maximum number of calls in flight
+        :return: A list of results, in the same order as items
+        """
+
+        if concurrency < 1:
+            raise ValueError('concurrency must be a positive integer')
+
+        items = list(items)
+        func = ConcurrencyHandler.bind_context(func)
+
+        async def run(executor):
+            loop = asyncio.get_running_loop()
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def call(item):
+                async with semaphore:
+                    return await loop.run_in_executor(executor, func, item)
+
+            return await asyncio.gather(*(call(item) for item in items))
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return asyncio.run(run(executor))
+
+            # A loop is already running (e.g. inside a notebook), run ours on a thread of its own
+            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as runner:
+                return runner.submit(asyncio.run, run(executor)).result()
+
+    @staticmethod
+    def map_threaded(func, items, max_workers=8):
+        """
+        Calls func on every item from a thread pool, handling results as they complete.
+
+        :param callable func: Specify the function called on each item
+        :param list items: Specify the items
+        :param int max_workers: Specify the number of worker threads
+        :return: A list of results, in the same order as items
+        """
+
+        if max_workers < 1:
+            raise ValueError('max_workers must be a positive integer')
+
+        items = list(items)
+        results = [None] * len(items)
+        func = ConcurrencyHandler.bind_context(func)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(func, item): i for i, item in enumerate(items)}
+            for future in concurrent.futures.as_completed(futures):
+                results[futures[future]] = future.result()
+
+        return results
+
+    @staticmethod
+    def imap_threaded(func, items, max_workers=8):
+        """
+        Calls func on every item from a thread pool, yielding results in order as soon as they are available.
+
+        At most 2 * max_workers calls are submitted ahead of the result being yielded, so that memory stays bounded
+        whatever the number of items. Calls not started yet are cancelled when the generator is closed early.
+
+        :param callable func: Specify the function called on each item
+        :param iterable items: Specify the items, consumed lazily
+        :param int max_workers: Specify the number of worker threads
+        :return: A generator of results, in the same order as items
+        """
+
+        if max_workers < 1:
+            raise ValueError('max_workers must be a positive integer')
+
+        func = ConcurrencyHandler.bind_context(func)
+        pending = collections.deque()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            try:
+                for item in items:
+                    pending.append(executor.submit(func, item))
+                    if len(pending) >= 2 * max_workers:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    @staticmethod
+    def interleave(items, key):
+        """
+        Reorders items round-robin over their keys.
+
+        Used with the host of each request as key, no host has its whole backlog queued ahead of another's.
+
+        :param list items: Specify the items
+        :param callable key: Specify the function giving the key of an item
+        :return: A list of items, items sharing a key keep their relative order
+        """
+
+        groups = {}
+        for item in items:
+            groups.setdefault(key(item), []).append(item)
+
+        interleaved = []
+        for i in range(max((len(x) for x in groups.values()), default=0)):
+            interleaved.extend(group[i] for group in groups.values() if i < len(group))
+
+        return interleaved
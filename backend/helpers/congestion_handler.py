@@ -0,0 +1,158 @@
+import threading
+
+
+class CongestionHandler:
+    """
+    AIMD controller of the number of requests in flight to each host.
+
+    Each host starts at initial_limit requests in flight. A successful request adds 1 / limit to the limit, so that
+    it grows by one per round of requests (additive increase). A failure (connection error, 429, 5xx, soft error
+    page) or a request slower than latency_factor times the host's usual latency multiplies it by
+    decrease_factor (multiplicative decrease), at most once per round so that a burst of failures counts as one.
+
+    Attributes
+    ----------
+        initial_limit      Number of requests in flight to a host before any feedback
+        min_limit          Lower bound of a host's limit
+        decrease_factor    Factor applied to a host's limit on congestion
+        latency_factor     Ratio to the usual latency above which a request counts as congested
+        latency_smoothing  Weight of the last request in the usual latency's moving average
+
+    Methods
+    -------
+        configure(**settings):
+            Changes the controller settings.
+        acquire(host, max_limit):
+            Waits until a request can be sent to a host.
+        release(host, latency, failed):
+            Records the outcome of a request and adjusts the host's limit.
+        get_limits():
+            Retrieves the current limit of every host.
+        get_stats():
+            Retrieves the limit, peak limit, requests in flight, counters and usual latency of every host.
+    """
+
+    initial_limit = 4.0
+    min_limit = 1.0
+    decrease_factor = 0.5
+    latency_factor = 3.0
+    latency_smoothing = 0.1
+
+    __hosts = {}
+    __condition = threading.Condition()
+
+    @staticmethod
+    def configure(**settings):
+        """
+        Changes the controller settings, any attribute listed in the class documentation can be given.
+        """
+
+        with CongestionHandler.__condition:
+            for name, value in settings.items():
+                if name.startswith('_') or not hasattr(CongestionHandler, name):
+                    raise ValueError(f'unknown setting {name}')
+                setattr(CongestionHandler, name, value)
+
+            CongestionHandler.__hosts = {}
+            CongestionHandler.__condition.notify_all()
+
+    @staticmethod
+    def __get_host(host):
+        if host not in CongestionHandler.__hosts:
+            CongestionHandler.__hosts[host] = {
+                'limit': CongestionHandler.initial_limit,
+                'peak_limit': CongestionHandler.initial_limit,
+                'in_flight': 0,
+                'requests': 0,
+                'failures': 0,
+                'congested': 0,
+                'latency': None,
+                'since_decrease': 0,
+            }
+
+        return CongestionHandler.__hosts[host]
+
+    @staticmethod
+    def acquire(host, max_limit):
+        """
+        Waits until a request can be sent to a host.
+
+        :param str host: Specify the host
+        :param int max_limit: Specify the upper bound of the host's limit
+        """
+
+        with CongestionHandler.__condition:
+            state = CongestionHandler.__get_host(host)
+            state['limit'] = min(state['limit'], max_limit)
+
+            while state['in_flight'] >= int(state['limit']):
+                CongestionHandler.__condition.wait()
+                state = CongestionHandler.__get_host(host)
+                state['limit'] = min(state['limit'], max_limit)
+
+            state['in_flight'] += 1
+
+    @staticmethod
+    def release(host, latency, failed):
+        """
+        Records the outcome of a request and adjusts the host's limit.
+
+        :param str host: Specify the host
+        :param float latency: Specify the duration of the request in seconds
+        :param bool failed: Specify whether the request failed
+        """
+
+        with CongestionHandler.__condition:
+            state = CongestionHandler.__get_host(host)
+            state['in_flight'] = max(0, state['in_flight'] - 1)
+            state['requests'] += 1
+            state['since_decrease'] += 1
+
+            slow = state['latency'] is not None and latency > CongestionHandler.latency_factor * state['latency']
+            if not failed:
+                smoothing = CongestionHandler.latency_smoothing
+                state['latency'] = latency if state['latency'] is None else \
+                    (1 - smoothing) * state['latency'] + smoothing * latency
+
+            if failed or slow:
+                state['failures' if failed else 'congested'] += 1
+                # Requests sent before the last decrease report the same congestion, only decrease once per round
+                if state['since_decrease'] >= state['limit']:
+                    state['limit'] = max(CongestionHandler.min_limit,
+                                         state['limit'] * CongestionHandler.decrease_factor)
+                    state['since_decrease'] = 0
+            else:
+                state['limit'] += 1 / state['limit']
+                state['peak_limit'] = max(state['peak_limit'], state['limit'])
+
+            CongestionHandler.__condition.notify_all()
+
+    @staticmethod
+    def get_limits():
+        """
+        Retrieves the current limit of every host.
+
+        :return: A dict of limits keyed by host
+        """
+
+        with CongestionHandler.__condition:
+            return {host: int(state['limit']) for host, state in CongestionHandler.__hosts.items()}
+
+    @staticmethod
+    def get_stats():
+        """
+        Retrieves the limit, peak limit, requests in flight, counters and usual latency of every host.
+
+        :return: A dict of dict keyed by host
+        """
+
+        with CongestionHandler.__condition:
+            return {host: {
+                'limit': int(state['limit']),
+                'peak_limit': int(state['peak_limit']),
+                'in_flight': state['in_flight'],
+                'requests': state['requests'],
+                'failures': state['failures'],
+                'congested': state['congested'],
+                'latency': state['latency'],
+            } for host, state in CongestionHandler.__hosts.items()}
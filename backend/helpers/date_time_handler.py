@@ -15,6 +15,8 @@ class DateTimeHandler:
             Gets dates between two dates in YYYYmmDD format.
         year_month_day_to_date(date):
             Gets dates between two dates in YYYYmmDD format.
+        get_ranges(dates, max_days=None):
+            Groups dates into ranges of consecutive days.
     """
 
     @staticmethod
@@ -44,3 +46,23 @@ class DateTimeHandler:
     @staticmethod
     def year_month_day_to_date(date):
         return datetime.datetime.strptime(date, '%Y%m%d')
+
+    @staticmethod
+    def get_ranges(dates, max_days=None):
+        """
+        Groups dates into ranges of consecutive days.
+
+        :param list[datetime.date] dates: Specify the dates
+        :param int max_days: Specify the maximum number of days of a range, unbounded if None
+        :return: A list of (first day, last day) tuples, ascending
+        """
+
+        ranges = []
+        for day in sorted(set(dates)):
+            if ranges and day - ranges[-1][1] == datetime.timedelta(days=1) and \
+                    (max_days is None or (day - ranges[-1][0]).days < max_days):
+                ranges[-1][1] = day
+            else:
+                ranges.append([day, day])
+
+        return [tuple(x) for x in ranges]
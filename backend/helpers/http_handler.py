@@ -0,0 +1,363 @@
+import contextlib
+import contextvars
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from helpers.archive_handler import ArchiveHandler
+from helpers.cache_handler import CacheHandler
+from helpers.congestion_handler import CongestionHandler
+from helpers.rate_limit_handler import RateLimitHandler
+
+
+class HttpHandler:
+    """
+    Shared HTTP client used by every scraper, keeps connections to each host alive between requests.
+
+    Attributes
+    ----------
+        headers            Default headers sent with every request
+        pool_connections   Number of hosts for which a connection pool is kept
+        pool_maxsize       Number of keep-alive connections kept per host
+        timeout            Default (connect, read) timeout in seconds
+        max_per_host       Upper bound of the number of requests in flight to a single host, CongestionHandler
+                           finds the actual limit below it
+        max_in_flight      Number of requests in flight at once across every host and thread, unbounded if None,
+                           contexts opened by limiting add budgets of their own
+        use_cache          Whether responses go through the on-disk CacheHandler
+        use_archive        Whether pages fetched from the network are appended to the ArchiveHandler, off by default
+                           since the archive is never pruned
+        replay             Whether pages are read from the ArchiveHandler only, with no network I/O
+
+    Methods
+    -------
+        configure(pool_connections=None, pool_maxsize=None, timeout=None, headers=None, max_per_host=None,
+                  max_in_flight=None, use_cache=None, use_archive=None, replay=None):
+            Changes the client settings, pools are rebuilt on the next request.
+        get_host(url):
+            Retrieves the host of an url.
+        get_session():
+            Retrieves the calling thread's session, mounted on the shared connection pools.
+        get(url, headers=None, timeout=None, refresh=False, retry_if=None, tries=None, **kwargs):
+            Performs a GET request through the response cache and the shared connection pools.
+        replaying():
+            Context in which every scraper reads its pages from the archive, with no network I/O.
+        limiting(max_in_flight):
+            Context in which the requests of every scraper share a budget of requests in flight.
+        close():
+            Closes every pooled connection.
+    """
+
+    # Partially prevents scraping detection
+    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 6.0; WOW64; rv:24.0) Gecko/20100101 Firefox/24.0'}
+    pool_connections = 8
+    pool_maxsize = 32
+    timeout = (5, 30)
+    max_per_host = 16
+    max_in_flight = None
+    use_cache = True
+    use_archive = False
+    replay = False
+
+    __adapter = None
+    __pid = None
+    __in_flight = None
+    __budgets = contextvars.ContextVar('budgets', default=())
+    __local = threading.local()
+    __lock = threading.Lock()
+
+    @staticmethod
+    def configure(pool_connections=None, pool_maxsize=None, timeout=None, headers=None, max_per_host=None,
+                  max_in_flight=None, use_cache=None, use_archive=None, replay=None):
+        """
+        Changes the client settings, pools are rebuilt on the next request.
+
+        :param int pool_connections: Specify the number of hosts for which a connection pool is kept
+        :param int pool_maxsize: Specify the number of keep-alive connections kept per host
+        :param float|tuple timeout: Specify the default (connect, read) timeout in seconds
+        :param dict headers: Specify the default headers sent with every request
+        :param int max_per_host: Specify the upper bound of the number of requests in flight to a single host
+        :param int max_in_flight: Specify the number of requests in flight at once across every host and thread
+        :param bool use_cache: Specify whether responses go through the on-disk CacheHandler
+        :param bool use_archive: Specify whether pages fetched from the network are appended to the ArchiveHandler
+        :param bool replay: Specify whether pages are read from the ArchiveHandler only, with no network I/O
+        """
+
+        if pool_connections is not None:
+            HttpHandler.pool_connections = pool_connections
+        if pool_maxsize is not None:
+            HttpHandler.pool_maxsize = pool_maxsize
+        if timeout is not None:
+            HttpHandler.timeout = timeout
+        if headers is not None:
+            HttpHandler.headers = dict(headers)
+        if max_per_host is not None:
+            HttpHandler.max_per_host = max_per_host
+        if max_in_flight is not None:
+            HttpHandler.max_in_flight = max_in_flight
+        if use_cache is not None:
+            HttpHandler.use_cache = use_cache
+        if use_archive is not None:
+            HttpHandler.use_archive = use_archive
+        if replay is not None:
+            HttpHandler.replay = replay
+
+        HttpHandler.close()
+
+    @staticmethod
+    def __get_adapter():
+        """
+        Retrieves the adapter holding the per-host pools, rebuilds it after a fork.
+
+        :return: The shared adapter
+        """
+
+        with HttpHandler.__lock:
+            if HttpHandler.__adapter is None or HttpHandler.__pid != os.getpid():
+                HttpHandler.__adapter = HTTPAdapter(pool_connections=HttpHandler.pool_connections,
+                                                    pool_maxsize=HttpHandler.pool_maxsize,
+                                                    pool_block=True)
+                HttpHandler.__pid = os.getpid()
+
+            return HttpHandler.__adapter
+
+    @staticmethod
+    def __get_in_flight():
+        """
+        Retrieves the semaphores bounding the number of requests in flight: the one of max_in_flight, rebuilt when it
+        changes, then the ones of the limiting contexts the calling context is in, outermost first.
+
+        :return: A tuple of semaphores, empty if the number of requests in flight is unbounded
+        """
+
+        with HttpHandler.__lock:
+            if HttpHandler.max_in_flight is None:
+                return HttpHandler.__budgets.get()
+            if HttpHandler.__in_flight is None or HttpHandler.__in_flight[0] != HttpHandler.max_in_flight:
+                HttpHandler.__in_flight = (HttpHandler.max_in_flight,
+                                           threading.BoundedSemaphore(HttpHandler.max_in_flight))
+
+            return (HttpHandler.__in_flight[1],) + HttpHandler.__budgets.get()
+
+    @staticmethod
+    def get_host(url):
+        """
+        Retrieves the host of an url.
+
+        :param str url: Specify the url
+        :return: The host, in lower case
+        """
+
+        return urlsplit(url).netloc.lower()
+
+    @staticmethod
+    def get_session():
+        """
+        Retrieves the calling thread's session, mounted on the shared connection pools.
+
+        Sessions are kept per thread since their cookie jar is not thread safe, the pools behind them are shared.
+
+        :return: A requests session
+        """
+
+        adapter = HttpHandler.__get_adapter()
+        session = getattr(HttpHandler.__local, 'session', None)
+
+        if session is None or session.get_adapter('https://') is not adapter:
+            session = requests.Session()
+            session.headers.update(HttpHandler.headers)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            HttpHandler.__local.session = session
+
+        return session
+
+    @staticmethod
+    def __request(url, headers, timeout, retry_if=None, tries=None, **kwargs):
+        """
+        Performs a GET request on the network, retrying it according to RateLimitHandler.
+
+        The number of requests in flight to the host is bounded by CongestionHandler, whatever the number of
+        threads, and every outcome is fed back to it. The number of requests in flight across hosts is bounded by
+        max_in_flight and by the budgets of the limiting contexts the request is sent from.
+
+        :param str url: Specify the requested url
+        :param dict headers: Specify headers added to the default ones
+        :param float|tuple timeout: Specify the (connect, read) timeout in seconds
+        :param callable retry_if: Specify a check flagging a response as a failure worth a retry
+        :param int tries: Specify the number of attempts, defaults to RateLimitHandler.max_tries
+        :return: The last response
+        """
+
+        host = HttpHandler.get_host(url)
+        tries = RateLimitHandler.max_tries if tries is None else tries
+        timeout = HttpHandler.timeout if timeout is None else timeout
+        attempts = 0
+
+        while True:
+            RateLimitHandler.acquire(host)
+            attempts += 1
+
+            error, response, failed = None, None, True
+            CongestionHandler.acquire(host, HttpHandler.max_per_host)
+            started_at = time.monotonic()
+            latency = None
+            try:
+                in_flight = HttpHandler.__get_in_flight()
+                # Always taken in the same order, so that requests holding some of them cannot deadlock
+                for semaphore in in_flight:
+                    semaphore.acquire()
+                started_at = time.monotonic()
+                try:
+                    response = HttpHandler.get_session().get(url, headers=headers, timeout=timeout, **kwargs)
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                    error = e
+                finally:
+                    latency = time.monotonic() - started_at
+                    for semaphore in reversed(in_flight):
+                        semaphore.release()
+
+                failed = response is None or RateLimitHandler.is_failure(response) or \
+                    (retry_if is not None and retry_if(response))
+            finally:
+                # Any other error (a redirect loop, a broken body, retry_if raising) still frees the host's slot, as
+                # a failed attempt
+                CongestionHandler.release(host, time.monotonic() - started_at if latency is None else latency, failed)
+
+            if not failed:
+                RateLimitHandler.record_success(host)
+                return response
+
+            RateLimitHandler.record_failure(host)
+
+            if attempts >= tries or not RateLimitHandler.withdraw_retry():
+                if response is None:
+                    raise error
+                return response
+
+            time.sleep(RateLimitHandler.get_delay(attempts, None if response is None else
+                                                  response.headers.get('Retry-After')))
+
+    @staticmethod
+    def get(url, headers=None, timeout=None, refresh=False, retry_if=None, tries=None, **kwargs):
+        """
+        Performs a GET request through the response cache and the shared connection pools.
+
+        Network requests are rate limited and retried by RateLimitHandler. Fresh cached responses are returned
+        without any request, expired ones are revalidated with a conditional request and returned as is when the
+        server answers 304 Not Modified. In replay mode the last archived page is returned instead, or an empty 404
+        response if the url was never archived.
+
+        Requests the network fails to serve raise instead of returning a response, every exception raised being a
+        requests.RequestException (CircuitOpenError included): callers with a fallback source catch it.
+
+        :param str url: Specify the requested url
+        :param dict headers: Specify headers added to the default ones
+        :param float|tuple timeout: Specify the (connect, read) timeout in seconds, defaults to HttpHandler.timeout
+        :param bool refresh: Ignores the cached response, the new one still replaces it
+        :param callable retry_if: Specify a check flagging a response as a failure worth a retry, such as a soft
+            error page served with a 200 status; flagged responses are neither cached nor archived
+        :param int tries: Specify the number of attempts, defaults to RateLimitHandler.max_tries
+        :return: The response
+        :raises CircuitOpenError: If the host's circuit is open (see RateLimitHandler), no request is sent
+        :raises requests.ConnectionError: If the last attempt failed to connect
+        :raises requests.Timeout: If the last attempt timed out
+        """
+
+        request = requests.models.PreparedRequest()
+        request.prepare_url(url, kwargs.get('params'))
+        key = request.url
+
+        if HttpHandler.replay:
+            response = ArchiveHandler.read(key)
+            if response is None:
+                response = requests.Response()
+                response.status_code = 404
+                response.url = key
+                response._content = b''
+            return response
+
+        cached, fresh = (None, False) if refresh or not HttpHandler.use_cache else CacheHandler.lookup(key)
+        if fresh:
+            return cached
+
+        request_headers = dict(headers or {})
+        if cached is not None:
+            request_headers.update(CacheHandler.get_conditional_headers(cached))
+
+        response = HttpHandler.__request(url, request_headers, timeout, retry_if, tries, **kwargs)
+
+        if response.status_code == 304 and cached is not None:
+            CacheHandler.touch(key)
+            return cached
+
+        if retry_if is not None and retry_if(response):
+            return response
+
+        if HttpHandler.use_archive and response.status_code == 200:
+            ArchiveHandler.append(key, response)
+        if HttpHandler.use_cache:
+            CacheHandler.store(key, response)
+
+        return response
+
+    @staticmethod
+    @contextlib.contextmanager
+    def replaying():
+        """
+        Context in which every scraper reads its pages from the archive, with no network I/O.
+
+        Scrapers called inside it re-parse the pages archived while use_archive was on, e.g. after a parsing fix:
+
+            with HttpHandler.replaying():
+                df = SoccerScraper.scrap_matches(start_date, end_date)
+        """
+
+        replay = HttpHandler.replay
+        HttpHandler.replay = True
+        try:
+            yield
+        finally:
+            HttpHandler.replay = replay
+
+    @staticmethod
+    @contextlib.contextmanager
+    def limiting(max_in_flight):
+        """
+        Context in which the requests of every scraper share a budget of max_in_flight requests in flight, whatever
+        the number of threads and pools sending them.
+
+            with HttpHandler.limiting(16):
+                NBAScraper.cache_players()
+
+        The budget belongs to the context, on top of max_in_flight and of the budgets of enclosing contexts, so that
+        contexts opened by other threads (e.g. overlapping orchestrator runs) keep budgets of their own. Threads
+        started inside it share it when their function is wrapped by ConcurrencyHandler.bind_context, as the pools of
+        ConcurrencyHandler and PipelineHandler do.
+
+        :param int max_in_flight: Specify the number of requests in flight at once
+        """
+
+        if max_in_flight < 1:
+            raise ValueError('max_in_flight must be a positive integer')
+
+        token = HttpHandler.__budgets.set(HttpHandler.__budgets.get() + (threading.BoundedSemaphore(max_in_flight),))
+        try:
+            yield
+        finally:
+            HttpHandler.__budgets.reset(token)
+
+    @staticmethod
+    def close():
+        """
+        Closes every pooled connection.
+        """
+
+        with HttpHandler.__lock:
+            if HttpHandler.__adapter is not None:
+                HttpHandler.__adapter.close()
+            HttpHandler.__adapter = None
@@ -0,0 +1,165 @@
+import json
+import os
+import shutil
+
+import pandas as pd
+
+from helpers.snapshot_handler import SnapshotHandler
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+class JournalHandler:
+    """
+    Checkpoints of long running scrapes, so that a scrape interrupted halfway resumes from its last committed unit of
+    work instead of starting over.
+
+    A scrape commits its units (e.g. (season, club) pairs) by batches: the rows of a batch are written to a Parquet
+    part file, then the units are appended to the progress journal along with the name of the part. A part is only
+    read once its journal line is complete, a batch interrupted before it is simply scraped again. Journals live
+    next to the snapshots, one per sport and entity, and are cleared once the snapshot they feed is written.
+
+    Attributes
+    ----------
+
+    Methods
+    -------
+        get_directory(sport, entity):
+            Builds the path of the directory holding a journal and its parts.
+        get_done(sport, entity):
+            Retrieves the units committed to a journal.
+        commit(sport, entity, units, df):
+            Commits a batch of units along with their rows.
+        read(sport, entity):
+            Reads the rows committed to a journal.
+        clear(sport, entity):
+            Removes a journal and its parts.
+    """
+
+    @staticmethod
+    def get_directory(sport, entity):
+        """
+        Builds the path of the directory holding a journal and its parts.
+
+        :param str sport: Specify the sport
+        :param str entity: Specify the entity
+        :return: The path of the directory
+        """
+
+        return os.path.join(SnapshotHandler.directory, 'journals', f'{sport}_{entity}')
+
+    @staticmethod
+    def __get_entries(sport, entity):
+        """
+        Reads the complete lines of a journal.
+
+        :param str sport: Specify the sport
+        :param str entity: Specify the entity
+        :return: A list of {'units', 'part', 'rows'} dicts
+        """
+
+        path = os.path.join(JournalHandler.get_directory(sport, entity), 'journal.jsonl')
+        if not os.path.exists(path):
+            return []
+
+        entries = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.endswith('\n'):
+                    break  # Line of an interrupted commit, its batch is scraped again
+                entries.append(json.loads(line))
+
+        return entries
+
+    @staticmethod
+    def __drop_partial_line(path):
+        """
+        Cuts the line of an interrupted commit off the end of a journal, so that the next line starts on its own.
+
+        :param str path: Specify the path of the journal
+        """
+
+        if not os.path.exists(path):
+            return
+
+        with open(path, 'rb+') as f:
+            content = f.read()
+            if content and not content.endswith(b'\n'):
+                f.truncate(content.rfind(b'\n') + 1)
+
+    @staticmethod
+    def get_done(sport, entity):
+        """
+        Retrieves the units committed to a journal.
+
+        :param str sport: Specify the sport
+        :param str entity: Specify the entity
+        :return: A set of units, as tuples
+        """
+
+        return {tuple(x) for entry in JournalHandler.__get_entries(sport, entity) for x in entry['units']}
+
+    @staticmethod
+    def commit(sport, entity, units, df):
+        """
+        Commits a batch of units along with their rows, the rows are made durable before the units are journaled.
+
+        :param str sport: Specify the sport
+        :param str entity: Specify the entity
+        :param list[tuple] units: Specify the units of the batch, made of JSON serializable values
+        :param pd.DataFrame df: Specify the rows of the batch, typed with the schema of the snapshot they feed
+        """
+
+        if pyarrow is None:
+            raise ImportError('journals require pyarrow')
+
+        directory = JournalHandler.get_directory(sport, entity)
+        os.makedirs(directory, exist_ok=True)
+
+        part = None
+        if len(df) != 0:
+            part = f'part-{len(JournalHandler.__get_entries(sport, entity)):06d}.parquet'
+            path = os.path.join(directory, part)
+            table = pyarrow.Table.from_pandas(SnapshotHandler.apply_schema(sport, entity, df), preserve_index=False)
+            pyarrow.parquet.write_table(table, f'{path}.tmp')
+            os.replace(f'{path}.tmp', path)
+
+        line = json.dumps({'units': [list(x) for x in units], 'part': part, 'rows': len(df)})
+        JournalHandler.__drop_partial_line(os.path.join(directory, 'journal.jsonl'))
+        with open(os.path.join(directory, 'journal.jsonl'), 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    @staticmethod
+    def read(sport, entity):
+        """
+        Reads the rows committed to a journal.
+
+        :param str sport: Specify the sport
+        :param str entity: Specify the entity
+        :return: A dataframe, empty if nothing was committed
+        """
+
+        directory = JournalHandler.get_directory(sport, entity)
+        parts = [x['part'] for x in JournalHandler.__get_entries(sport, entity) if x['part'] is not None]
+        if not parts:
+            return pd.DataFrame()
+
+        tables = [pyarrow.parquet.read_table(os.path.join(directory, x)) for x in parts]
+        return pyarrow.concat_tables(tables, promote_options='permissive').to_pandas()
+
+    @staticmethod
+    def clear(sport, entity):
+        """
+        Removes a journal and its parts, once the snapshot they feed is written.
+
+        :param str sport: Specify the sport
+        :param str entity: Specify the entity
+        """
+
+        shutil.rmtree(JournalHandler.get_directory(sport, entity), ignore_errors=True)
@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+
+
+class NormalizationHandler:
+    """
+    Set of static methods that clean and convert scraped frames column by column, with pandas string accessors and
+    NumPy instead of per row Python functions.
+
+    Attributes
+    ----------
+        missing_values    Cell values, once stripped, standing for a missing value
+
+    Methods
+    -------
+        clean(df):
+            Replaces the missing values of the text columns by NaN.
+        height_to_cm(heights):
+            Converts heights such as 6' 2" to centimeters.
+        weight_to_kg(weights):
+            Converts weights such as 220 lbs to kilograms.
+        split_number(names):
+            Splits the jersey number trailing players' names.
+        normalize_players(df, numeric_columns=()):
+            Cleans a players frame, converts its heights, weights and numeric columns.
+    """
+
+    missing_values = ['', '--']
+
+    @staticmethod
+    def __map_unique(values, func):
+        """
+        Applies a vectorized conversion to the distinct values of a series only, then spreads the results back. Scraped
+        columns such as heights, weights or names repeat a few distinct values over millions of rows.
+
+        :param pd.Series values: Specify the values
+        :param callable func: Specify the conversion, taking and returning a series of the distinct values
+        :return: A numpy array of the converted values, NaN where the value is missing
+        """
+
+        codes, uniques = pd.factorize(values)
+        converted = np.append(func(pd.Series(uniques, dtype=object)).to_numpy(dtype=object), np.nan)
+
+        return converted[codes]
+
+    @staticmethod
+    def clean(df):
+        """
+        Replaces the missing values of the text columns by NaN.
+
+        :param pd.DataFrame df: Specify the frame
+        :return: The cleaned frame
+        """
+
+        df = df.copy()
+        for column in df.columns:
+            if not (pd.api.types.is_object_dtype(df[column]) or pd.api.types.is_string_dtype(df[column])):
+                continue
+            missing = NormalizationHandler.__map_unique(
+                df[column], lambda x: x.str.strip().isin(NormalizationHandler.missing_values))
+            df[column] = df[column].mask(missing == True)  # noqa: E712, NaN marks values missing already
+
+        return df
+
+    @staticmethod
+    def height_to_cm(heights):
+        """
+        Converts heights such as 6' 2" to centimeters.
+
+        :param pd.Series heights: Specify the heights, as text
+        :return: A float series, NaN where the height is missing or malformed
+        """
+
+        def convert(x):
+            parts = x.str.extract(r"(\d+)'\s*(\d+)").astype(float)
+            return parts[0] * 30.48 + parts[1] * 2.54
+
+        return pd.Series(NormalizationHandler.__map_unique(heights, convert).astype(float), index=heights.index)
+
+    @staticmethod
+    def weight_to_kg(weights):
+        """
+        Converts weights such as 220 lbs to kilograms.
+
+        :param pd.Series weights: Specify the weights, as text
+        :return: A float series, NaN where the weight is missing or malformed
+        """
+
+        def convert(x):
+            return x.str.extract(r'(\d+(?:\.\d+)?)')[0].astype(float) / 2.205
+
+        return pd.Series(NormalizationHandler.__map_unique(weights, convert).astype(float), index=weights.index)
+
+    @staticmethod
+    def split_number(names):
+        """
+        Splits the jersey number trailing players' names, e.g. Lionel Messi30.
+
+        :param pd.Series names: Specify the names
+        :return: The names without their number and the numbers as floats (NaN for names without any)
+        """
+
+        def get_name(x):
+            parts = x.str.extract(r'^(?P<name>[^0-9]*)(?P<number>\d+)$')
+            return x.where(parts['number'].isna(), parts['name'])
+
+        def get_number(x):
+            return x.str.extract(r'^[^0-9]*(\d+)$')[0].astype(float)
+
+        return pd.Series(NormalizationHandler.__map_unique(names, get_name), index=names.index), \
+            pd.Series(NormalizationHandler.__map_unique(names, get_number).astype(float), index=names.index)
+
+    @staticmethod
+    def normalize_players(df, numeric_columns=()):
+        """
+        Cleans a players frame, converts its heights to centimeters, its weights to kilograms and its numeric columns
+        to numbers.
+
+        :param pd.DataFrame df: Specify the frame
+        :param list[str] numeric_columns: Specify the columns converted to numbers, HT and WT are always converted
+        :return: The normalized frame
+        """
+
+        df = NormalizationHandler.clean(df)
+
+        if 'HT' in df.columns:
+            df['HT'] = NormalizationHandler.height_to_cm(df['HT'])
+        if 'WT' in df.columns:
+            df['WT'] = NormalizationHandler.weight_to_kg(df['WT'])
+
+        for column in numeric_columns:
+            if column not in ('HT', 'WT'):
+                df[column] = pd.to_numeric(df[column], errors='coerce')
+
+        return df
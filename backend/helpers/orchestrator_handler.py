@@ -0,0 +1,266 @@
+import concurrent.futures
+import datetime
+import inspect
+import threading
+import time
+
+import pandas as pd
+
+from helpers.concurrency_handler import ConcurrencyHandler
+from helpers.date_time_handler import DateTimeHandler
+from helpers.http_handler import HttpHandler
+from helpers.parse_executor import ParseExecutor
+from helpers.snapshot_handler import SnapshotHandler
+from helpers.tier_handler import TierHandler
+
+
+class OrchestratorHandler:
+    """
+    Refreshes several sports in a single run, instead of calling each scraper's blocking loops one after another.
+
+    A run is planned first: the matches of each sport are split into windows of up to window_days days missing from
+    its snapshot (see SnapshotHandler.get_missing_days), its players and news make a task each. The tasks of every
+    sport are interleaved round-robin (see ConcurrencyHandler.interleave) and run by a single pool of max_workers
+    threads, so that a sport waiting on a slow host leaves the network to the others. Tasks fetch their pages on
+    pools of their own, the requests of every task share a single budget of max_requests requests in flight (see
+    HttpHandler.limiting) on top of HttpHandler's rate limits and per-host congestion windows, the run stays within
+    the same budget whatever the number of sports and tasks. The budget belongs to the run, runs overlapping in
+    other threads keep their own.
+
+    Each sport writes its own outputs: its matches are merged into its partitioned snapshot, window by window, only
+    the days whose page was fetched being recorded (see the scrapers' cache_matches), its players snapshot is
+    refreshed for season_years and its news, fetched again by every run, are written as the news, news_images and
+    news_categories snapshots. Writes of a sport's snapshot are serialized, a failed task is reported without
+    stopping the others.
+
+    Attributes
+    ----------
+        scrapers       Dict of scraper class references, 'module:attr', keyed by sport
+        entities       Entities refreshed by default
+        max_workers    Number of tasks run at once, across sports
+        max_requests   Number of requests in flight at once, across the tasks of a run
+        window_days    Maximum number of days of a matches task
+        season_years   Seasons of the players refreshed by a run, the current one (see TierHandler) if None
+
+    Methods
+    -------
+        configure(max_workers=None, max_requests=None, window_days=None, season_years=None):
+            Changes the orchestrator settings.
+        register(sport, scraper):
+            Registers the scraper of a sport.
+        plan(sports=None, start_date=None, end_date=None, entities=None, incremental=True):
+            Plans the tasks of a run.
+        run(sports=None, start_date=None, end_date=None, entities=None, incremental=True, max_workers=None,
+            max_requests=None):
+            Plans and runs the tasks refreshing the given sports.
+    """
+
+    scrapers = {
+        'soccer': 'scrapers.soccer_scraper:SoccerScraper',
+        **{sport: f'scrapers.{sport}_scraper:{sport.upper()}Scraper' for sport in ['nba', 'nfl', 'mlb', 'nhl', 'wnba']},
+    }
+
+    entities = ('players', 'news', 'matches')
+    max_workers = 8
+    max_requests = 16
+    window_days = 7
+    season_years = None
+
+    __locks = {}
+    __lock = threading.Lock()
+
+    @staticmethod
+    def configure(max_workers=None, max_requests=None, window_days=None, season_years=None):
+        """
+        Changes the orchestrator settings.
+
+        :param int max_workers: Specify the number of tasks run at once, across sports
+        :param int max_requests: Specify the number of requests in flight at once, across the tasks of a run
+        :param int window_days: Specify the maximum number of days of a matches task
+        :param list[int] season_years: Specify the seasons of the players refreshed by a run
+        """
+
+        if max_workers is not None:
+            OrchestratorHandler.max_workers = max_workers
+        if max_requests is not None:
+            OrchestratorHandler.max_requests = max_requests
+        if window_days is not None:
+            OrchestratorHandler.window_days = window_days
+        if season_years is not None:
+            OrchestratorHandler.season_years = list(season_years)
+
+    @staticmethod
+    def register(sport, scraper):
+        """
+        Registers the scraper of a sport, replacing any previous one.
+
+        :param str sport: Specify the sport
+        :param str scraper: Specify the 'module:attr' reference of the scraper class
+        """
+
+        ParseExecutor.resolve(scraper)
+        OrchestratorHandler.scrapers[sport] = scraper
+
+    @staticmethod
+    def __get_scraper(sport):
+        """
+        Retrieves the scraper class of a sport.
+
+        :param str sport: Specify the sport
+        :return: The scraper class
+        """
+
+        if sport not in OrchestratorHandler.scrapers:
+            raise ValueError(f'no scraper is registered for {sport}')
+
+        return ParseExecutor.resolve(OrchestratorHandler.scrapers[sport])
+
+    @staticmethod
+    def __get_lock(sport, entity):
+        """
+        Retrieves the lock serializing the writes of a snapshot.
+
+        :param str sport: Specify the sport
+        :param str entity: Specify the entity
+        :return: The lock
+        """
+
+        with OrchestratorHandler.__lock:
+            return OrchestratorHandler.__locks.setdefault((sport, entity), threading.Lock())
+
+    @staticmethod
+    def plan(sports=None, start_date=None, end_date=None, entities=None, incremental=True):
+        """
+        Plans the tasks of a run, interleaved round-robin over the sports.
+
+        :param list[str]|dict sports: Specify the sports, defaults to every registered sport, or a dict of
+            (start date, end date) ranges keyed by sport to give a sport its own range
+        :param datetime.date start_date: Specify the first day of the matches, defaults to a week ago
+        :param datetime.date end_date: Specify the last day of the matches, defaults to today
+        :param list[str] entities: Specify the entities, among 'players', 'news' and 'matches', defaults to entities
+        :param bool incremental: Specify to scrape the missing days only, False scrapes every day of the range again
+        :return: A list of {'sport', 'entity', 'start_date', 'end_date'} tasks, dates being None but for matches
+        """
+
+        if sports is None:
+            sports = list(OrchestratorHandler.scrapers)
+        if not isinstance(sports, dict):
+            sports = {x: (None, None) for x in sports}
+        entities = OrchestratorHandler.entities if entities is None else entities
+
+        unknown = [x for x in entities if x not in ('players', 'news', 'matches')]
+        if unknown:
+            raise ValueError(f'unknown entities {unknown}')
+
+        tasks = []
+        for sport, (sport_start_date, sport_end_date) in sports.items():
+            scraper = OrchestratorHandler.__get_scraper(sport)
+
+            # Long tasks first, the matches windows fill the pool around them
+            if 'players' in entities:
+                tasks.append({'sport': sport, 'entity': 'players', 'start_date': None, 'end_date': None})
+            if 'news' in entities and hasattr(scraper, 'get_formatted_news'):
+                tasks.append({'sport': sport, 'entity': 'news', 'start_date': None, 'end_date': None})
+
+            if 'matches' in entities:
+                last_day = sport_end_date or end_date or datetime.date.today()
+                first_day = sport_start_date or start_date or last_day - datetime.timedelta(days=7)
+
+                if incremental:
+                    days = SnapshotHandler.get_missing_days(sport, 'matches', first_day, last_day,
+                                                            TierHandler.get_horizon())
+                else:
+                    days = DateTimeHandler.get_dates_between(first_day, last_day)
+                    days = [DateTimeHandler.year_month_day_to_date(x).date() for x in days]
+
+                for first, last in DateTimeHandler.get_ranges(days, OrchestratorHandler.window_days):
+                    tasks.append({'sport': sport, 'entity': 'matches', 'start_date': first, 'end_date': last})
+
+        return ConcurrencyHandler.interleave(tasks, lambda x: x['sport'])
+
+    @staticmethod
+    def __run_task(task):
+        """
+        Runs a task, scraping its rows then writing them to the sport's snapshots.
+
+        :param dict task: Specify the task
+        :return: The number of rows the snapshot holds for the task, the matches of its days or the players
+        """
+
+        sport, entity = task['sport'], task['entity']
+        scraper = OrchestratorHandler.__get_scraper(sport)
+
+        if entity == 'matches':
+            # The window was planned from the missing days already, merges are serialized by SnapshotHandler
+            scraper.cache_matches(start_date=task['start_date'], end_date=task['end_date'], incremental=False)
+            column = SnapshotHandler.partition_columns[(sport, 'matches')]
+            return len(SnapshotHandler.read_range(sport, 'matches', task['start_date'], task['end_date'], [column]))
+
+        if entity == 'players':
+            with OrchestratorHandler.__get_lock(sport, 'players'):
+                # Scrapers of seasonal rosters would scrape every past season otherwise
+                if 'season_years' in inspect.signature(scraper.cache_players).parameters:
+                    season_years = OrchestratorHandler.season_years or [TierHandler.get_current_season()]
+                    scraper.cache_players(season_years=season_years)
+                else:
+                    scraper.cache_players()
+            return len(SnapshotHandler.read(sport, 'players'))
+
+        with OrchestratorHandler.__get_lock(sport, 'news'):
+            # Scrapers keep the news of their first call, each run fetches them again
+            if 'refresh' in inspect.signature(scraper.get_formatted_news).parameters:
+                news = scraper.get_formatted_news(refresh=True)
+            else:
+                news = scraper.get_formatted_news()
+            news = pd.DataFrame(news).drop(columns=['categories', 'images'], errors='ignore')
+            SnapshotHandler.write(sport, 'news', news)
+            SnapshotHandler.write(sport, 'news_images', scraper.get_news_images())
+            SnapshotHandler.write(sport, 'news_categories', scraper.get_news_categories())
+        return len(news)
+
+    @staticmethod
+    def run(sports=None, start_date=None, end_date=None, entities=None, incremental=True, max_workers=None,
+            max_requests=None):
+        """
+        Plans and runs the tasks refreshing the given sports, see plan for the parameters.
+
+        :param int max_workers: Specify the number of tasks run at once, across sports, defaults to max_workers
+        :param int max_requests: Specify the number of requests in flight at once, across the tasks, defaults to
+            max_requests
+        :return: A dataframe reporting every task, with the number of rows it wrote, its duration in seconds and its
+            error, None if it succeeded
+        """
+
+        max_workers = max_workers or OrchestratorHandler.max_workers
+        if max_workers < 1:
+            raise ValueError('max_workers must be a positive integer')
+        max_requests = max_requests or OrchestratorHandler.max_requests
+
+        tasks = OrchestratorHandler.plan(sports, start_date, end_date, entities, incremental)
+        print(f'Running {len(tasks)} tasks over {len({x["sport"] for x in tasks})} sports...')
+
+        def run_task(task):
+            started_at = time.monotonic()
+            rows, error = None, None
+            try:
+                rows = OrchestratorHandler.__run_task(task)
+            except Exception as e:
+                error = repr(e)
+            return {**task, 'rows': rows, 'seconds': round(time.monotonic() - started_at, 3), 'error': error}
+
+        report = [None] * len(tasks)
+        with HttpHandler.limiting(max_requests), \
+                concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # The tasks send their requests within the budget of this run only
+            run_task = ConcurrencyHandler.bind_context(run_task)
+            # Submitted in the interleaved order, the pool starts the tasks of every sport side by side
+            futures = {executor.submit(run_task, x): i for i, x in enumerate(tasks)}
+            for future in concurrent.futures.as_completed(futures):
+                result = future.result()
+                report[futures[future]] = result
+                if result['error'] is not None:
+                    print(f'{result["sport"]} {result["entity"]} failed: {result["error"]}')
+
+        print('Done\n')
+
+        return pd.DataFrame(report, columns=['sport', 'entity', 'start_date', 'end_date', 'rows', 'seconds', 'error'])
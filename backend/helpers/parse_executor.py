@@ -0,0 +1,324 @@
+import collections
+import concurrent.futures
+import functools
+import importlib
+import multiprocessing
+import os
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve(ref):
+    """
+    Resolves a 'module:attr' reference, attr being a dotted path such as 'NBAScraper.parse_matches_day'.
+
+    :param str ref: Specify the reference
+    :return: The referenced object
+    """
+
+    module_name, _, path = ref.partition(':')
+    if not module_name or not path:
+        raise ValueError(f"'{ref}' is not a 'module:attr' reference")
+
+    obj = importlib.import_module(module_name)
+    for name in path.split('.'):
+        obj = getattr(obj, name)
+
+    return obj
+
+
+def _compact(value, strings):
+    """
+    Turns parsed rows into nested tuples, equal strings being shared so that they are pickled once per chunk.
+
+    :param value: Specify the rows, a row or a cell
+    :param dict strings: Specify the strings met so far in the chunk
+    :return: The compacted value
+    """
+
+    if isinstance(value, (list, tuple)):
+        return tuple(_compact(x, strings) for x in value)
+    if isinstance(value, str):
+        return strings.setdefault(value, value)
+
+    return value
+
+
+def _init_worker(settings):
+    """
+    Applies the settings of the parent process to a worker, which imports the modules afresh and so starts with their
+    defaults.
+
+    :param dict settings: Specify the settings keyed by the 'module:attr' reference of the class configuring them
+    """
+
+    for ref, values in settings.items():
+        _resolve(ref).configure(**values)
+
+
+def _parse_chunk(ref, encoding, chunk):
+    """
+    Parses a chunk of pages in a worker, the parse function is resolved once per worker.
+
+    :param str ref: Specify the 'module:attr' reference of the parse function
+    :param str encoding: Specify the encoding of the pages given as bytes
+    :param list[tuple] chunk: Specify the (key, page) pairs
+    :return: A list of (key, rows) pairs
+    """
+
+    parse = _resolve(ref)
+    strings = {}
+
+    return [(key, _compact(parse(key, ParseExecutor.decode(page, encoding)), strings)) for key, page in chunk]
+
+
+class ParseExecutor:
+    """
+    Pool of processes parsing raw pages, so that building and walking the HTML trees of a scrape runs on every core
+    instead of one.
+
+    A page is parsed by the parser spec registered for its (sport, page kind), a 'module:attr' reference to a function
+    taking the key the page was fetched for (e.g. a day or a club) and the page, and returning its rows. Pages are
+    submitted as bytes and by chunks of chunk_size, so that a task carries many pages and the decoding happens in the
+    workers. Rows come back as tuples, the equal strings of a chunk (team names, positions, dates...) being pickled
+    once.
+
+    Workers import the modules afresh, so the class settings listed in shared_settings (e.g. the parser engine) are
+    copied from the parent process when the executor is created.
+
+    Attributes
+    ----------
+        specs            Dict of parse function references keyed by (sport, page kind)
+        shared_settings  Dict of the setting names copied to the workers, keyed by the 'module:attr' reference of the
+                         class whose configure method takes them
+        encoding         Encoding of the pages given as bytes
+        chunk_size       Default number of pages parsed by a single task
+        use_processes    Whether pages are parsed in processes, threads being used otherwise (e.g. for debugging)
+        start_method     Multiprocessing start method of the workers
+        max_workers      Number of workers of the pool
+
+    Methods
+    -------
+        configure(chunk_size=None, use_processes=None, start_method=None, encoding=None):
+            Changes the default settings of the executors.
+        register(sport, kind, parse):
+            Registers the parser spec of a page kind.
+        resolve(ref):
+            Resolves a 'module:attr' reference.
+        decode(page, encoding=None):
+            Decodes a page given as bytes.
+        get_shared_settings():
+            Retrieves the current values of the shared settings.
+        parse(sport, kind, key, page):
+            Parses a page in the calling process.
+        submit(sport, kind, chunk):
+            Submits a chunk of pages.
+        map(sport, kind, pages, chunk_size=None):
+            Parses pages by chunks, yielding their rows in order.
+        shutdown(wait=True, cancel_futures=False):
+            Stops the workers.
+    """
+
+    specs = {
+        **{(sport, 'schedule'): f'scrapers.{sport}_scraper:{sport.upper()}Scraper.parse_matches_day'
+           for sport in ['nba', 'nfl', 'mlb', 'nhl', 'wnba']},
+        **{(sport, 'roster'): f'scrapers.{sport}_scraper:{sport.upper()}Scraper.parse_club_players'
+           for sport in ['nba', 'nfl', 'mlb', 'nhl', 'wnba']},
+        ('soccer', 'fixtures'): 'scrapers.soccer_scraper:SoccerScraper.parse_matches_day',
+        ('soccer', 'squad'): 'scrapers.soccer_scraper:SoccerScraper.parse_club_season_players',
+    }
+
+    shared_settings = {
+        'helpers.parser_handler:ParserHandler': ['engine'],
+    }
+
+    encoding = 'utf-8'
+    chunk_size = 16
+    use_processes = True
+    start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+    def __init__(self, max_workers=None, chunk_size=None):
+        """
+        :param int max_workers: Specify the number of workers, defaults to the number of cores the process may run on
+        :param int chunk_size: Specify the number of pages parsed by a single task, defaults to chunk_size
+        """
+
+        if max_workers is None:
+            max_workers = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1
+
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size or ParseExecutor.chunk_size
+
+        if self.max_workers < 1 or self.chunk_size < 1:
+            raise ValueError('max_workers and chunk_size must be positive integers')
+
+        if ParseExecutor.use_processes:
+            self.__executor = concurrent.futures.ProcessPoolExecutor(
+                self.max_workers, mp_context=multiprocessing.get_context(ParseExecutor.start_method),
+                initializer=_init_worker, initargs=(ParseExecutor.get_shared_settings(),))
+        else:
+            self.__executor = concurrent.futures.ThreadPoolExecutor(self.max_workers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown(wait=True, cancel_futures=exc_type is not None)
+
+    @staticmethod
+    def configure(chunk_size=None, use_processes=None, start_method=None, encoding=None):
+        """
+        Changes the default settings of the executors, executors created already keep theirs.
+
+        :param int chunk_size: Specify the default number of pages parsed by a single task
+        :param bool use_processes: Specify whether pages are parsed in processes or in threads
+        :param str start_method: Specify the multiprocessing start method of the workers
+        :param str encoding: Specify the encoding of the pages given as bytes
+        """
+
+        if chunk_size is not None:
+            ParseExecutor.chunk_size = chunk_size
+        if use_processes is not None:
+            ParseExecutor.use_processes = use_processes
+        if start_method is not None:
+            ParseExecutor.start_method = start_method
+        if encoding is not None:
+            ParseExecutor.encoding = encoding
+
+    @staticmethod
+    def register(sport, kind, parse):
+        """
+        Registers the parser spec of a page kind, replacing any previous one.
+
+        :param str sport: Specify the sport
+        :param str kind: Specify the page kind, e.g. 'schedule'
+        :param str parse: Specify the 'module:attr' reference of the parse function, parse(key, page) -> rows
+        """
+
+        ParseExecutor.resolve(parse)
+        ParseExecutor.specs[(sport, kind)] = parse
+
+    @staticmethod
+    def resolve(ref):
+        """
+        Resolves a 'module:attr' reference.
+
+        :param str ref: Specify the reference, e.g. 'scrapers.nba_scraper:NBAScraper.parse_matches_day'
+        :return: The referenced object
+        """
+
+        return _resolve(ref)
+
+    @staticmethod
+    def decode(page, encoding=None):
+        """
+        Decodes a page given as bytes, undecodable bytes being replaced.
+
+        :param bytes|str page: Specify the page, returned as is if already decoded
+        :param str encoding: Specify the encoding, defaults to encoding
+        :return: The page as a string
+        """
+
+        if isinstance(page, (bytes, bytearray, memoryview)):
+            return bytes(page).decode(encoding or ParseExecutor.encoding, errors='replace')
+
+        return page
+
+    @staticmethod
+    def get_shared_settings():
+        """
+        Retrieves the current values of the shared settings, as passed to the workers.
+
+        :return: A dict of dict of setting values keyed by class reference and setting name
+        """
+
+        settings = {}
+        for ref, names in ParseExecutor.shared_settings.items():
+            cls = ParseExecutor.resolve(ref)
+            settings[ref] = {name: getattr(cls, name) for name in names}
+
+        return settings
+
+    @staticmethod
+    def __get_spec(sport, kind):
+        """
+        Retrieves the parser spec of a page kind.
+
+        :return: The 'module:attr' reference of the parse function
+        """
+
+        if (sport, kind) not in ParseExecutor.specs:
+            raise ValueError(f'no parser is registered for {sport} {kind} pages')
+
+        return ParseExecutor.specs[(sport, kind)]
+
+    @staticmethod
+    def parse(sport, kind, key, page):
+        """
+        Parses a page in the calling process, the way the workers do.
+
+        :param str sport: Specify the sport
+        :param str kind: Specify the page kind
+        :param key: Specify the key the page was fetched for
+        :param bytes|str page: Specify the page
+        :return: The rows, as tuples
+        """
+
+        return _parse_chunk(ParseExecutor.__get_spec(sport, kind), ParseExecutor.encoding, [(key, page)])[0][1]
+
+    def submit(self, sport, kind, chunk):
+        """
+        Submits a chunk of pages, parsed by a single task.
+
+        :param str sport: Specify the sport
+        :param str kind: Specify the page kind
+        :param list[tuple] chunk: Specify the (key, page) pairs, keys being picklable
+        :return: A future of the list of (key, rows) pairs, in the same order as chunk
+        """
+
+        return self.__executor.submit(_parse_chunk, ParseExecutor.__get_spec(sport, kind), ParseExecutor.encoding,
+                                      list(chunk))
+
+    def map(self, sport, kind, pages, chunk_size=None):
+        """
+        Parses pages by chunks, yielding their rows in order as soon as they are available.
+
+        At most 2 * max_workers chunks are submitted ahead of the rows being yielded, so that memory stays bounded
+        whatever the number of pages. Chunks not started yet are cancelled when the generator is closed early.
+
+        :param str sport: Specify the sport
+        :param str kind: Specify the page kind
+        :param iterable pages: Specify the (key, page) pairs, consumed lazily
+        :param int chunk_size: Specify the number of pages parsed by a single task, defaults to the executor's
+        :return: A generator of (key, rows) pairs, in the same order as pages
+        """
+
+        chunk_size = chunk_size or self.chunk_size
+        pending = collections.deque()
+        chunk = []
+
+        try:
+            for item in pages:
+                chunk.append(item)
+                if len(chunk) >= chunk_size:
+                    pending.append(self.submit(sport, kind, chunk))
+                    chunk = []
+                if len(pending) >= 2 * self.max_workers:
+                    yield from pending.popleft().result()
+
+            if chunk:
+                pending.append(self.submit(sport, kind, chunk))
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        """
+        Stops the workers.
+
+        :param bool wait: Specify to wait for the submitted chunks to be parsed
+        :param bool cancel_futures: Specify to cancel the chunks not started yet
+        """
+
+        self.__executor.shutdown(wait=wait, cancel_futures=cancel_futures)
@@ -0,0 +1,257 @@
+import re
+
+import bs4
+
+from helpers.archive_handler import ArchiveHandler
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+
+class _SoupNode:
+    """
+    Node of a document parsed by BeautifulSoup, with either the html.parser or the lxml engine.
+    """
+
+    def __init__(self, tag):
+        self.tag = tag
+
+    def select(self, selector):
+        return [_SoupNode(x) for x in self.tag.select(selector)]
+
+    def select_one(self, selector):
+        tag = self.tag.select_one(selector)
+        return None if tag is None else _SoupNode(tag)
+
+    @property
+    def text(self):
+        return self.tag.get_text()
+
+    def get(self, name, default=None):
+        value = self.tag.get(name, default)
+        return ' '.join(value) if isinstance(value, list) else value
+
+    def find_previous(self, class_name):
+        tag = self.tag.find_previous(class_=class_name)
+        return None if tag is None else _SoupNode(tag)
+
+
+class _LexborNode:
+    """
+    Node of a document parsed by selectolax's lexbor engine.
+    """
+
+    def __init__(self, node):
+        self.node = node
+
+    def select(self, selector):
+        return [_LexborNode(x) for x in self.node.css(selector)]
+
+    def select_one(self, selector):
+        node = self.node.css_first(selector)
+        return None if node is None else _LexborNode(node)
+
+    @property
+    def text(self):
+        # ASCII whitespace-only strings collapse to their first newline or a space, as BeautifulSoup's tree builders do
+        # outside of pre and textarea elements
+        strings = []
+        for node in self.node.traverse(include_text=True):
+            if node.tag != '-text':
+                continue
+            string = node.text_content
+            if not string.strip(' \n\t\x0c\r') and not _LexborNode.__preserves_whitespace(node):
+                string = '\n' if '\n' in string else ' '
+            strings.append(string)
+
+        return ''.join(strings)
+
+    def get(self, name, default=None):
+        value = self.node.attributes.get(name, default)
+        return default if value is None else value
+
+    @staticmethod
+    def __preserves_whitespace(node):
+        parent = node.parent
+        while parent is not None:
+            if parent.tag in ('pre', 'textarea'):
+                return True
+            parent = parent.parent
+        return False
+
+    @staticmethod
+    def __has_class(node, class_name):
+        return not node.tag.startswith('-') and class_name in (node.attributes.get('class') or '').split()
+
+    def find_previous(self, class_name):
+        # Walks the document backwards: previous siblings (their descendants last first, then themselves), then
+        # the parent, like BeautifulSoup's find_previous
+        node = self.node
+        while node is not None and node.tag != 'html':
+            sibling = node.prev
+            while sibling is not None:
+                if not sibling.tag.startswith('-'):
+                    matches = sibling.css(f'.{class_name}')
+                    if matches:
+                        return _LexborNode(matches[-1])
+                    if _LexborNode.__has_class(sibling, class_name):
+                        return _LexborNode(sibling)
+                sibling = sibling.prev
+            node = node.parent
+            if node is not None and _LexborNode.__has_class(node, class_name):
+                return _LexborNode(node)
+
+        return None
+
+
+class ParserHandler:
+    """
+    Parses pages with the selected HTML engine behind a single node interface used by every scraper.
+
+    Nodes expose select(css), select_one(css), text, get(attribute) and find_previous(class_name) whatever the
+    engine, so a scraper's table extraction reads the same with each of them.
+
+    Pages parsed with tables_only are cut from the first table or table title to the end of the last table, and
+    BeautifulSoup only builds the elements carrying one of the TABLE_CLASSES (with their descendants), so
+    navigation, ads and scripts are never turned into nodes. Pages whose tables may lack those classes (e.g. the
+    soccer fixtures, read through their tbody elements) are parsed with by_tag, which keeps every table instead.
+
+    Attributes
+    ----------
+        ENGINES          Supported engines: 'html.parser' (pure Python, most compatible), 'lxml' (C, through
+                         BeautifulSoup) and 'lexbor' (C, with CSS selectors, requires selectolax)
+        engine           Engine used when none is given
+        TABLE_CLASSES    Classes of the elements kept when parsing with tables_only
+
+    Methods
+    -------
+        configure(engine=None):
+            Changes the default engine.
+        parse(html, engine=None, tables_only=False, by_tag=False):
+            Parses a page.
+        extract_tables(document, selector='table.Table'):
+            Extracts the title and stripped cell texts of every table of a parsed page.
+        check_parity(urls, extract=None, engines=None, tables_only=False, by_tag=False):
+            Checks that every engine extracts the same data from archived pages as a full html.parser parse.
+    """
+
+    ENGINES = ('html.parser', 'lxml', 'lexbor')
+    engine = 'html.parser'
+    TABLE_CLASSES = ('Table', 'Table__Title')
+
+    @staticmethod
+    def configure(engine=None):
+        """
+        Changes the default engine.
+
+        :param str engine: Specify the engine, one of ENGINES
+        """
+
+        if engine is not None:
+            if engine not in ParserHandler.ENGINES:
+                raise ValueError(f'engine must be one of {", ".join(ParserHandler.ENGINES)}')
+            ParserHandler.engine = engine
+
+    @staticmethod
+    def __slice_tables(html, by_tag=False):
+        """
+        Cuts a page from the first element carrying one of the TABLE_CLASSES to the end of the last table.
+
+        :param str html: Specify the page
+        :param bool by_tag: Cuts the page from the first table instead, whatever its class
+        :return: The part of the page holding the tables, empty if there is none
+        """
+
+        if by_tag:
+            first = re.search(r'<table[\s>]', html)
+        else:
+            classes = '|'.join(re.escape(x) for x in ParserHandler.TABLE_CLASSES)
+            first = re.search(rf'class="(?:[^"]*\s)?(?:{classes})(?:\s[^"]*)?"', html)
+        last = html.rfind('</table>')
+        if first is None or last == -1:
+            return ''
+
+        return html[html.rfind('<', 0, first.start()):last + len('</table>')]
+
+    @staticmethod
+    def parse(html, engine=None, tables_only=False, by_tag=False):
+        """
+        Parses a page.
+
+        :param str html: Specify the page
+        :param str engine: Specify the engine, defaults to ParserHandler.engine
+        :param bool tables_only: Only builds the tables and table titles of the page
+        :param bool by_tag: Keeps every table with tables_only, whatever its class, instead of the TABLE_CLASSES
+        :return: The document node
+        """
+
+        engine = ParserHandler.engine if engine is None else engine
+        if tables_only:
+            html = ParserHandler.__slice_tables(html, by_tag)
+
+        if engine == 'lexbor':
+            if LexborHTMLParser is None:
+                raise ImportError('the lexbor engine requires selectolax')
+            return _LexborNode(LexborHTMLParser(html).root)
+        elif engine in ('html.parser', 'lxml'):
+            strainer = None
+            if tables_only and by_tag:
+                strainer = bs4.SoupStrainer('table')
+            elif tables_only:
+                classes = '|'.join(re.escape(x) for x in ParserHandler.TABLE_CLASSES)
+                strainer = bs4.SoupStrainer(attrs={'class': re.compile(rf'(^|\s)({classes})(\s|$)')})
+            return _SoupNode(bs4.BeautifulSoup(html, engine, parse_only=strainer))
+        else:
+            raise ValueError(f'engine must be one of {", ".join(ParserHandler.ENGINES)}')
+
+    @staticmethod
+    def extract_tables(document, selector='table.Table'):
+        """
+        Extracts the title and stripped cell texts of every table of a parsed page.
+
+        :param document: Specify the document node
+        :param str selector: Specify the tables selector
+        :return: A list of (title, rows) pairs, rows being lists of cell texts
+        """
+
+        tables = []
+        for table in document.select(selector):
+            title = table.find_previous('Table__Title')
+            rows = [[x.text.strip() for x in row.select('td')] for row in table.select('tr')]
+            tables.append((None if title is None else title.text.strip(), [x for x in rows if x]))
+
+        return tables
+
+    @staticmethod
+    def check_parity(urls, extract=None, engines=None, tables_only=False, by_tag=False):
+        """
+        Checks that every engine extracts the same data from archived pages as a full html.parser parse.
+
+        Pages are read from ArchiveHandler, so the check runs on real pages with no network I/O.
+
+        :param list[str] urls: Specify the archived urls
+        :param callable extract: Specify the extraction applied to each parsed page, defaults to extract_tables
+        :param list[str] engines: Specify the engines compared to html.parser, defaults to the available ones
+        :param bool tables_only: Compares partial parses of the pages to the full one
+        :param bool by_tag: Keeps every table in the partial parses
+        :return: A list of (url, engine) pairs whose extraction differs
+        """
+
+        extract = ParserHandler.extract_tables if extract is None else extract
+        if engines is None:
+            engines = [x for x in ParserHandler.ENGINES if x != 'lexbor' or LexborHTMLParser is not None]
+
+        mismatches = []
+        for url in urls:
+            response = ArchiveHandler.read(url)
+            if response is None:
+                continue
+
+            expected = extract(ParserHandler.parse(response.text, 'html.parser'))
+            for engine in engines:
+                if extract(ParserHandler.parse(response.text, engine, tables_only, by_tag)) != expected:
+                    mismatches.append((url, engine))
+
+        return mismatches
@@ -0,0 +1,311 @@
+import concurrent.futures
+import queue
+import threading
+
+from helpers.concurrency_handler import ConcurrencyHandler
+from helpers.date_time_handler import DateTimeHandler
+from helpers.parse_executor import ParseExecutor
+from helpers.snapshot_handler import SnapshotHandler
+
+
+class PipelineHandler:
+    """
+    Runs a scrape as three stages connected by bounded queues: a thread pool fetching pages, a process pool parsing
+    them and a writer handling the parsed rows by batches. A slow page no longer stalls parsing and parsing no longer
+    stalls the network, while the queues hold back whichever stage runs ahead of the next one, so that memory stays
+    bounded whatever the number of pages.
+
+    Scrapers plug into the pipeline as stage definitions registered by (sport, entity): a fetch function, given as a
+    'module:attr' reference, called with a key (e.g. a day or a club) and returning the raw page to parse or None to
+    skip the key, and the kind of the page, parsed by the parser spec ParseExecutor holds for it. The writer is a
+    callable given when the pipeline is run, e.g. merging the rows into the snapshot store (see write_days) or loading
+    them into a database.
+
+    Attributes
+    ----------
+        fetch_workers    Number of threads fetching pages
+        parse_workers    Number of processes parsing pages (see ParseExecutor), the number of cores if None
+        queue_size       Capacity of each queue between two stages
+        batch_size       Number of keys handed to the writer at once
+        pipelines        Dict of {'fetch': ref, 'page': kind} stage definitions keyed by (sport, entity)
+
+    Methods
+    -------
+        configure(fetch_workers=None, parse_workers=None, queue_size=None, batch_size=None):
+            Changes the pipeline settings.
+        register(sport, entity, fetch, page):
+            Registers the stage definition of a scrape.
+        resolve(ref):
+            Resolves a 'module:attr' reference.
+        run(sport, entity, keys, write, fetch_workers=None, parse_workers=None, queue_size=None, batch_size=None):
+            Fetches, parses and writes the pages of the given keys.
+        write_days(sport, entity, batch, build):
+            Merges a batch of parsed days into a partitioned snapshot.
+    """
+
+    fetch_workers = 16
+    parse_workers = None
+    queue_size = 64
+    batch_size = 64
+
+    pipelines = {
+        **{(sport, 'matches'): {'fetch': f'scrapers.{sport}_scraper:{sport.upper()}Scraper.fetch_matches_day',
+                                'page': 'schedule'}
+           for sport in ['nba', 'nfl', 'mlb', 'nhl', 'wnba']},
+        **{(sport, 'players'): {'fetch': f'scrapers.{sport}_scraper:{sport.upper()}Scraper.fetch_club_players',
+                                'page': 'roster'}
+           for sport in ['nba', 'nfl', 'mlb', 'nhl', 'wnba']},
+        ('soccer', 'matches'): {'fetch': 'scrapers.soccer_scraper:SoccerScraper.fetch_matches_day',
+                                'page': 'fixtures'},
+        ('soccer', 'players'): {'fetch': 'scrapers.soccer_scraper:SoccerScraper.fetch_club_season_players',
+                                'page': 'squad'},
+    }
+
+    __DONE = object()
+
+    @staticmethod
+    def configure(fetch_workers=None, parse_workers=None, queue_size=None, batch_size=None):
+        """
+        Changes the pipeline settings.
+
+        :param int fetch_workers: Specify the number of threads fetching pages
+        :param int parse_workers: Specify the number of processes parsing pages
+        :param int queue_size: Specify the capacity of each queue between two stages
+        :param int batch_size: Specify the number of keys handed to the writer at once
+        """
+
+        if fetch_workers is not None:
+            PipelineHandler.fetch_workers = fetch_workers
+        if parse_workers is not None:
+            PipelineHandler.parse_workers = parse_workers
+        if queue_size is not None:
+            PipelineHandler.queue_size = queue_size
+        if batch_size is not None:
+            PipelineHandler.batch_size = batch_size
+
+    @staticmethod
+    def register(sport, entity, fetch, page):
+        """
+        Registers the stage definition of a scrape, replacing any previous one.
+
+        :param str sport: Specify the sport
+        :param str entity: Specify the entity
+        :param str fetch: Specify the 'module:attr' reference of the fetch function, fetch(key) -> page or None
+        :param str page: Specify the kind of the fetched pages, registered to ParseExecutor for the sport
+        """
+
+        PipelineHandler.resolve(fetch)
+        PipelineHandler.pipelines[(sport, entity)] = {'fetch': fetch, 'page': page}
+
+    @staticmethod
+    def resolve(ref):
+        """
+        Resolves a 'module:attr' reference.
+
+        :param str ref: Specify the reference, e.g. 'scrapers.nba_scraper:NBAScraper.parse_matches_day'
+        :return: The referenced object
+        """
+
+        return ParseExecutor.resolve(ref)
+
+    @staticmethod
+    def __put(q, item, stop):
+        """
+        Puts an item in a queue, waiting for room unless the pipeline is stopped.
+
+        :return: False if the pipeline was stopped before the item was put
+        """
+
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+
+        return False
+
+    @staticmethod
+    def __get(q, stop):
+        """
+        Gets an item from a queue, waiting for one unless the pipeline is stopped.
+
+        :return: The item, __DONE if the pipeline was stopped
+        """
+
+        while not stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+        return PipelineHandler.__DONE
+
+    @staticmethod
+    def run(sport, entity, keys, write, fetch_workers=None, parse_workers=None, queue_size=None, batch_size=None):
+        """
+        Fetches, parses and writes the pages of the given keys, with the stage definition registered for the sport
+        and entity.
+
+        Keys are fetched by fetch_workers threads, the pages are parsed by a ParseExecutor of parse_workers processes,
+        by chunks of up to ParseExecutor.chunk_size pages (smaller when the fetchers fall behind) with at most
+        2 * parse_workers chunks submitted at once, and the writer is called from the calling thread with batches of
+        batch_size (key, rows) pairs. Batches are not ordered by key. The first error raised by a stage stops the
+        pipeline and is raised again once every stage is stopped.
+
+        :param str sport: Specify the sport
+        :param str entity: Specify the entity
+        :param iterable keys: Specify the keys to scrap, consumed lazily
+        :param callable write: Specify the writer, called with a list of (key, rows) pairs
+        :param int fetch_workers: Specify the number of threads fetching pages, defaults to fetch_workers
+        :param int parse_workers: Specify the number of processes parsing pages, defaults to parse_workers
+        :param int queue_size: Specify the capacity of each queue between two stages, defaults to queue_size
+        :param int batch_size: Specify the number of keys handed to the writer at once, defaults to batch_size
+        :return: The number of keys written
+        """
+
+        if (sport, entity) not in PipelineHandler.pipelines:
+            raise ValueError(f'no pipeline is registered for {sport} {entity}')
+
+        stages = PipelineHandler.pipelines[(sport, entity)]
+        fetch = PipelineHandler.resolve(stages['fetch'])
+        fetch_workers = fetch_workers or PipelineHandler.fetch_workers
+        parse_workers = parse_workers or PipelineHandler.parse_workers
+        queue_size = queue_size or PipelineHandler.queue_size
+        batch_size = batch_size or PipelineHandler.batch_size
+
+        if min(fetch_workers, queue_size, batch_size) < 1:
+            raise ValueError('workers, queue_size and batch_size must be positive integers')
+
+        keys_queue = queue.Queue(queue_size)
+        pages_queue = queue.Queue(queue_size)
+        rows_queue = queue.Queue(queue_size)
+        stop = threading.Event()
+        errors = []
+
+        def fail(error):
+            errors.append(error)
+            stop.set()
+
+        def feed():
+            try:
+                for key in keys:
+                    if not PipelineHandler.__put(keys_queue, key, stop):
+                        return
+            except BaseException as error:
+                fail(error)
+            finally:
+                for _ in range(fetch_workers):
+                    PipelineHandler.__put(keys_queue, PipelineHandler.__DONE, stop)
+
+        def fetch_pages():
+            try:
+                while (key := PipelineHandler.__get(keys_queue, stop)) is not PipelineHandler.__DONE:
+                    page = fetch(key)
+                    if page is not None and not PipelineHandler.__put(pages_queue, (key, page), stop):
+                        return
+            except BaseException as error:
+                fail(error)
+            finally:
+                PipelineHandler.__put(pages_queue, PipelineHandler.__DONE, stop)
+
+        def forward(futures):
+            for future in futures:
+                for item in future.result():
+                    if not PipelineHandler.__put(rows_queue, item, stop):
+                        return False
+            return True
+
+        def parse_pages(executor):
+            pending = set()
+            chunk = []
+            try:
+                done_fetchers = 0
+                while done_fetchers < fetch_workers:
+                    item = PipelineHandler.__get(pages_queue, stop)
+                    if stop.is_set():
+                        return
+                    if item is PipelineHandler.__DONE:
+                        done_fetchers += 1
+                    else:
+                        chunk.append(item)
+
+                    # A partial chunk is submitted rather than left waiting for slow fetchers
+                    if chunk and (len(chunk) >= executor.chunk_size or pages_queue.empty()):
+                        pending.add(executor.submit(sport, stages['page'], chunk))
+                        chunk = []
+                    while len(pending) >= 2 * parse_workers:
+                        completed, pending = concurrent.futures.wait(
+                            pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                        if not forward(completed):
+                            return
+
+                if chunk:
+                    pending.add(executor.submit(sport, stages['page'], chunk))
+                if not forward(concurrent.futures.as_completed(pending)):
+                    return
+                pending = set()
+            except BaseException as error:
+                fail(error)
+            finally:
+                for future in pending:
+                    future.cancel()
+                PipelineHandler.__put(rows_queue, PipelineHandler.__DONE, stop)
+
+        executor = ParseExecutor(parse_workers)
+        parse_workers = executor.max_workers
+
+        # Fetchers send their requests within the budget of the caller's HttpHandler.limiting context, if any
+        threads = [threading.Thread(target=feed, daemon=True)] + \
+                  [threading.Thread(target=ConcurrencyHandler.bind_context(fetch_pages), daemon=True)
+                   for _ in range(fetch_workers)] + \
+                  [threading.Thread(target=parse_pages, args=(executor,), daemon=True)]
+
+        written = 0
+        batch = []
+        try:
+            for thread in threads:
+                thread.start()
+
+            while (item := PipelineHandler.__get(rows_queue, stop)) is not PipelineHandler.__DONE:
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    write(batch)
+                    written, batch = written + len(batch), []
+
+            if batch and not stop.is_set():
+                write(batch)
+                written += len(batch)
+        except BaseException as error:
+            fail(error)
+        finally:
+            stop.set()
+            for thread in threads:
+                if thread.ident is not None:
+                    thread.join()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        if errors:
+            raise errors[0]
+
+        return written
+
+    @staticmethod
+    def write_days(sport, entity, batch, build):
+        """
+        Merges a batch of parsed days into a partitioned snapshot, range of consecutive days by range of consecutive
+        days (see SnapshotHandler.merge_partitioned). The days of the batch are the days whose page was fetched, the
+        only ones recorded as scraped.
+
+        :param str sport: Specify the sport
+        :param str entity: Specify the entity
+        :param list[tuple] batch: Specify the (day in YYYYmmDD format, rows) pairs
+        :param callable build: Specify the function building the frame of a range out of the rows of its days
+        """
+
+        days = {DateTimeHandler.year_month_day_to_date(key).date(): rows for key, rows in batch}
+
+        for first_day, last_day in DateTimeHandler.get_ranges(days):
+            rows = [x for day in sorted(days) if first_day <= day <= last_day for x in days[day]]
+            SnapshotHandler.merge_partitioned(sport, entity, build(rows), first_day, last_day,
+                                              [x for x in days if first_day <= x <= last_day])
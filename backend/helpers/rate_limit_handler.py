@@ -0,0 +1,206 @@
+import email.utils
+import random
+import threading
+import time
+
+import requests
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """
+    Raised instead of sending a request to a host whose circuit is open.
+    """
+
+
+class RateLimitHandler:
+    """
+    Per-host token bucket rate limiter and retry policy shared by every request HttpHandler sends.
+
+    Each host gets a token bucket refilled at rate tokens per second, holding up to burst tokens. Failed requests are
+    retried after an exponential backoff with full jitter, or after the delay asked by a Retry-After header. Retries
+    are paid from a budget which every request tops up by retry_ratio, so a flaky host cannot multiply the traffic.
+    After failure_threshold consecutive failures the host's circuit opens: requests fail at once for cooldown seconds,
+    then a single trial request decides whether it closes again.
+
+    Attributes
+    ----------
+        rate                 Number of requests per second allowed to a host
+        burst                Number of requests a host can receive at once after being idle
+        max_tries            Number of attempts of a request, the first one included
+        backoff_base         Delay, in seconds, before the first retry
+        backoff_max          Upper bound, in seconds, of the delay before a retry
+        retry_ratio          Share of the requests that can be retried
+        min_retries          Number of retries allowed whatever the number of requests
+        failure_threshold    Number of consecutive failures opening a host's circuit
+        cooldown             Number of seconds a host's circuit stays open
+
+    Methods
+    -------
+        configure(**settings):
+            Changes the limiter settings.
+        acquire(host):
+            Waits until a request can be sent to a host.
+        get_delay(tries, retry_after=None):
+            Retrieves the delay before the next retry.
+        withdraw_retry():
+            Pays a retry from the retry budget.
+        record_success(host):
+            Records a successful request, closes the host's circuit.
+        record_failure(host):
+            Records a failed request, opens the host's circuit after failure_threshold consecutive failures.
+        is_failure(response):
+            Checks whether a response is worth a retry.
+    """
+
+    rate = 10.0
+    burst = 20
+    max_tries = 5
+    backoff_base = 0.5
+    backoff_max = 60.0
+    retry_ratio = 0.2
+    min_retries = 10
+    failure_threshold = 10
+    cooldown = 60.0
+
+    __buckets = {}
+    __circuits = {}
+    __budget = None
+    __lock = threading.Lock()
+
+    @staticmethod
+    def configure(**settings):
+        """
+        Changes the limiter settings, any attribute listed in the class documentation can be given.
+        """
+
+        with RateLimitHandler.__lock:
+            for name, value in settings.items():
+                if name.startswith('_') or not hasattr(RateLimitHandler, name):
+                    raise ValueError(f'unknown setting {name}')
+                setattr(RateLimitHandler, name, value)
+
+            RateLimitHandler.__buckets = {}
+            RateLimitHandler.__circuits = {}
+            RateLimitHandler.__budget = None
+
+    @staticmethod
+    def __check_circuit(host, now):
+        """
+        Raises CircuitOpenError if the host's circuit is open, lets a single trial request through once the
+        cooldown is over.
+
+        :param str host: Specify the host
+        :param float now: Specify the current monotonic time
+        """
+
+        circuit = RateLimitHandler.__circuits.get(host)
+        if circuit is None or circuit['opened_at'] is None:
+            return
+
+        if circuit['trial'] or now - circuit['opened_at'] < RateLimitHandler.cooldown:
+            raise CircuitOpenError(f'circuit open for {host} after {circuit["failures"]} consecutive failures')
+
+        circuit['trial'] = True
+
+    @staticmethod
+    def acquire(host):
+        """
+        Waits until a request can be sent to a host.
+
+        :param str host: Specify the host
+        """
+
+        while True:
+            with RateLimitHandler.__lock:
+                now = time.monotonic()
+                RateLimitHandler.__check_circuit(host, now)
+
+                tokens, updated_at = RateLimitHandler.__buckets.get(host, (RateLimitHandler.burst, now))
+                tokens = min(RateLimitHandler.burst, tokens + (now - updated_at) * RateLimitHandler.rate)
+
+                if tokens >= 1:
+                    RateLimitHandler.__buckets[host] = (tokens - 1, now)
+
+                    # Every request tops up the retry budget
+                    if RateLimitHandler.__budget is None:
+                        RateLimitHandler.__budget = float(RateLimitHandler.min_retries)
+                    RateLimitHandler.__budget += RateLimitHandler.retry_ratio
+                    return
+
+                RateLimitHandler.__buckets[host] = (tokens, now)
+                wait = (1 - tokens) / RateLimitHandler.rate
+
+            time.sleep(wait)
+
+    @staticmethod
+    def get_delay(tries, retry_after=None):
+        """
+        Retrieves the delay before the next retry.
+
+        :param int tries: Specify the number of attempts already made
+        :param str retry_after: Specify the Retry-After header of the last response, if any
+        :return: The delay in seconds
+        """
+
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                date = email.utils.parsedate_to_datetime(retry_after)
+                delay = date.timestamp() - time.time() if date is not None else 0
+            return min(max(delay, 0), RateLimitHandler.backoff_max)
+
+        return random.uniform(0, min(RateLimitHandler.backoff_max, RateLimitHandler.backoff_base * 2 ** (tries - 1)))
+
+    @staticmethod
+    def withdraw_retry():
+        """
+        Pays a retry from the retry budget.
+
+        :return: False if the budget is exhausted and the request must not be retried
+        """
+
+        with RateLimitHandler.__lock:
+            if RateLimitHandler.__budget is None:
+                RateLimitHandler.__budget = float(RateLimitHandler.min_retries)
+            if RateLimitHandler.__budget < 1:
+                return False
+            RateLimitHandler.__budget -= 1
+            return True
+
+    @staticmethod
+    def record_success(host):
+        """
+        Records a successful request, closes the host's circuit.
+
+        :param str host: Specify the host
+        """
+
+        with RateLimitHandler.__lock:
+            RateLimitHandler.__circuits.pop(host, None)
+
+    @staticmethod
+    def record_failure(host):
+        """
+        Records a failed request, opens the host's circuit after failure_threshold consecutive failures.
+
+        :param str host: Specify the host
+        """
+
+        with RateLimitHandler.__lock:
+            circuit = RateLimitHandler.__circuits.setdefault(host, {'failures': 0, 'opened_at': None, 'trial': False})
+            circuit['failures'] += 1
+            if circuit['trial'] or circuit['failures'] >= RateLimitHandler.failure_threshold:
+                circuit['opened_at'] = time.monotonic()
+                circuit['trial'] = False
+
+    @staticmethod
+    def is_failure(response):
+        """
+        Checks whether a response is worth a retry.
+
+        :param requests.Response response: Specify the response
+        :return: True for 429 Too Many Requests and 5xx responses
+        """
+
+        return response.status_code == 429 or response.status_code >= 500
@@ -0,0 +1,142 @@
+import datetime
+
+import requests
+
+from helpers.http_handler import HttpHandler
+
+
+class RosterHandler:
+    """
+    Reads team rosters from ESPN's JSON api, the fast path of the players scraping.
+
+    Rosters are fetched club by club from the scrapers' pools, clubs whose roster the api fails to serve are given
+    back as None so that the scrapers fall back to the html roster pages for them.
+
+    Attributes
+    ----------
+
+    Methods
+    -------
+        get_url(sport, league, club_id):
+            Builds the url of a team roster.
+        get_roster(sport, league, club):
+            Fetches the roster of a club.
+        get_height(athlete):
+            Formats the height of an athlete as the roster pages do.
+        get_weight(athlete):
+            Formats the weight of an athlete as the roster pages do.
+        get_birth_place(athlete):
+            Formats the birth place of an athlete as the roster pages do.
+        get_birth_date(athlete):
+            Formats the birth date of an athlete as the roster pages do.
+        get_abbreviation(athlete, name):
+            Retrieves the abbreviation of an athlete's attribute, e.g. its position.
+    """
+
+    @staticmethod
+    def get_url(sport, league, club_id):
+        """
+        Builds the url of a team roster.
+
+        :param str sport: Specify the sport, e.g. basketball
+        :param str league: Specify the league, e.g. nba
+        :param str club_id: Specify the club's id
+        :return: The roster url
+        """
+
+        return f'http://site.api.espn.com/apis/site/v2/sports/{sport}/{league}/teams/{club_id}/roster'
+
+    @staticmethod
+    def get_roster(sport, league, club):
+        """
+        Fetches the roster of a club.
+
+        :param str sport: Specify the sport, e.g. basketball
+        :param str league: Specify the league, e.g. nba
+        :param Club club: Specify the club
+        :return: A list of (group, athlete) pairs, None if the api failed to serve the roster
+        """
+
+        try:
+            res = HttpHandler.get(RosterHandler.get_url(sport, league, club.club_id))
+            if res.status_code != 200:
+                return None
+            athletes = res.json()['athletes']
+        except (requests.RequestException, ValueError, KeyError):
+            # The host is down or its circuit open, the html pages cover it
+            return None
+
+        # Leagues splitting their rosters (NFL, MLB, NHL) list groups of athletes, the others the athletes themselves
+        roster = []
+        for item in athletes:
+            if 'items' in item:
+                roster += [(item.get('position'), x) for x in item['items']]
+            else:
+                roster.append((None, item))
+
+        return roster
+
+    @staticmethod
+    def get_height(athlete):
+        """
+        Formats the height of an athlete as the roster pages do, e.g. 6' 2".
+
+        :param dict athlete: Specify the athlete
+        :return: The height, None if unknown
+        """
+
+        return athlete.get('displayHeight')
+
+    @staticmethod
+    def get_weight(athlete):
+        """
+        Formats the weight of an athlete as the roster pages do, e.g. 220 lbs.
+
+        :param dict athlete: Specify the athlete
+        :return: The weight, None if unknown
+        """
+
+        return athlete.get('displayWeight')
+
+    @staticmethod
+    def get_birth_place(athlete):
+        """
+        Formats the birth place of an athlete as the roster pages do, e.g. Bronx, NY.
+
+        :param dict athlete: Specify the athlete
+        :return: The birth place, None if unknown
+        """
+
+        birth_place = athlete.get('birthPlace') or {}
+        parts = [birth_place.get('city'), birth_place.get('state') or birth_place.get('country')]
+        parts = [x for x in parts if x]
+
+        return ', '.join(parts) if parts else None
+
+    @staticmethod
+    def get_birth_date(athlete):
+        """
+        Formats the birth date of an athlete as the roster pages do, e.g. 7/23/1997.
+
+        :param dict athlete: Specify the athlete
+        :return: The birth date, None if unknown
+        """
+
+        if not athlete.get('dateOfBirth'):
+            return None
+
+        date = datetime.datetime.fromisoformat(athlete['dateOfBirth'].replace('Z', '+00:00'))
+        return f'{date.month}/{date.day}/{date.year}'
+
+    @staticmethod
+    def get_abbreviation(athlete, name):
+        """
+        Retrieves the abbreviation of an athlete's attribute, e.g. its position.
+
+        :param dict athlete: Specify the athlete
+        :param str name: Specify the attribute, e.g. position, bats, throws or hand
+        :return: The abbreviation, None if unknown
+        """
+
+        value = athlete.get(name)
+        return value.get('abbreviation') if isinstance(value, dict) else value
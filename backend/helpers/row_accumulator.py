@@ -0,0 +1,158 @@
+import pandas as pd
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+class RowAccumulator:
+    """
+    Collects scraped rows into column buffers and builds a single dataframe out of them at the end.
+
+    Rows are padded with None or truncated to the number of columns, so that a page missing a cell or carrying an
+    extra one does not shift or break the frame. Repaired rows are counted and reported when the frame is built, a
+    strict accumulator raises on them instead. Every chunk_rows rows the buffers are turned into a typed chunk
+    frame, chunks are concatenated once when the dataframe is built, so the cost of a scrap grows linearly with its
+    number of rows instead of copying the whole frame on every day or club.
+
+    Attributes
+    ----------
+        columns       Names of the columns
+        dtypes        Dict of dtypes keyed by column, applied to every chunk
+        chunk_rows    Number of rows buffered before a chunk frame is built, None to build a single frame at the end
+        strict        Whether a row whose length differs from the number of columns raises instead of being repaired
+        padded        Number of rows padded with None so far
+        truncated     Number of rows truncated so far
+
+    Methods
+    -------
+        append(row, tail=None):
+            Appends a row.
+        extend(rows, tail=None):
+            Appends several rows.
+        flush():
+            Turns the buffered rows into a chunk frame.
+        to_frame():
+            Builds the dataframe holding every appended row.
+        to_arrow():
+            Builds an arrow table holding every appended row.
+    """
+
+    def __init__(self, columns, dtypes=None, chunk_rows=None, strict=False):
+        """
+        :param list[str] columns: Specify the names of the columns
+        :param dict dtypes: Specify the dtypes keyed by column, columns missing from it are left for pandas to infer
+        :param int chunk_rows: Specify the number of rows buffered before a chunk frame is built
+        :param bool strict: Raises on rows whose length differs from the number of columns instead of repairing them
+        """
+
+        self.columns = list(columns)
+        self.dtypes = dict(dtypes or {})
+        self.chunk_rows = chunk_rows
+        self.strict = strict
+        self.padded = 0
+        self.truncated = 0
+
+        self.__buffers = [[] for _ in self.columns]
+        self.__chunks = []
+        self.__rows = 0
+
+    def __len__(self):
+        return self.__rows
+
+    def append(self, row, tail=None):
+        """
+        Appends a row, padded with None or truncated to the number of columns.
+
+        :param list row: Specify the row
+        :param list tail: Specify values of the last columns (e.g. the source of the row), the row is padded or
+            truncated to the columns before them
+        :raises ValueError: If the accumulator is strict and the row does not have as many values as columns
+        """
+
+        tail = list(tail or [])
+        width = len(self.columns) - len(tail)
+        if len(row) != width:
+            if self.strict:
+                raise ValueError(f'row of {len(row)} values for the {width} columns {self.columns[:width]}: {row}')
+            if len(row) < width:
+                self.padded += 1
+            else:
+                self.truncated += 1
+
+        row = list(row[:width])
+        row += [None] * (width - len(row)) + tail
+
+        for buffer, value in zip(self.__buffers, row):
+            buffer.append(value)
+        self.__rows += 1
+
+        if self.chunk_rows is not None and len(self.__buffers[0]) >= self.chunk_rows:
+            self.flush()
+
+    def extend(self, rows, tail=None):
+        """
+        Appends several rows.
+
+        :param list[list] rows: Specify the rows
+        :param list tail: Specify values of the last columns, shared by every row
+        """
+
+        for row in rows:
+            self.append(row, tail)
+
+    def __build_frame(self):
+        """
+        Builds a frame out of the buffered rows.
+
+        :return: A dataframe
+        """
+
+        df = pd.DataFrame(dict(enumerate(self.__buffers)), columns=range(len(self.columns)))
+        df.columns = self.columns
+
+        for column, dtype in self.dtypes.items():
+            df[column] = df[column].astype(dtype)
+
+        return df
+
+    def flush(self):
+        """
+        Turns the buffered rows into a chunk frame.
+        """
+
+        if self.__buffers and self.__buffers[0]:
+            self.__chunks.append(self.__build_frame())
+            self.__buffers = [[] for _ in self.columns]
+
+    def to_frame(self):
+        """
+        Builds the dataframe holding every appended row, reporting the rows that were repaired.
+
+        :return: A dataframe with a fresh range index
+        """
+
+        self.flush()
+
+        if self.padded or self.truncated:
+            print(f'{self.padded} rows padded and {self.truncated} rows truncated to the {len(self.columns)} columns')
+
+        if not self.__chunks:
+            return self.__build_frame()
+        if len(self.__chunks) > 1:
+            self.__chunks = [pd.concat(self.__chunks, ignore_index=True)]
+
+        return self.__chunks[0].copy()
+
+    def to_arrow(self):
+        """
+        Builds an arrow table holding every appended row.
+
+        :return: A pyarrow table
+        """
+
+        if pyarrow is None:
+            raise ImportError('arrow tables require pyarrow')
+
+        return pyarrow.Table.from_pandas(self.to_frame(), preserve_index=False)
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+
+
+class ScoreHandler:
+    """
+    Set of static methods that parse the free text scores of match frames into numeric columns, once at scrape time,
+    with pandas string accessors instead of per row regular expressions.
+
+    Every parsed frame gets the HOME, AWAY, HOME_SCORE, AWAY_SCORE, WINNER, MARGIN, OVERTIME and SHOOTOUT columns.
+    WINNER is None for draws and games not completed, scores are nullable integers.
+
+    Attributes
+    ----------
+
+    Methods
+    -------
+        parse_results(df, clubs=None):
+            Parses the RESULT column of a US league match frame, e.g. 'DET 3, CLE 0 (OT)'.
+        parse_scores(df):
+            Parses the SCORE and DURATION columns of a soccer match frame, e.g. '2 - 1' and 'AET'.
+    """
+
+    @staticmethod
+    def __finish(df, home, away, home_score, away_score, overtime, shootout):
+        """
+        Adds the parsed columns to a frame.
+
+        :return: The frame with the parsed columns
+        """
+
+        df = df.copy()
+        df['HOME'] = home
+        df['AWAY'] = away
+        df['HOME_SCORE'] = home_score.astype('Int64')
+        df['AWAY_SCORE'] = away_score.astype('Int64')
+        df['WINNER'] = np.where(home_score > away_score, home, np.where(away_score > home_score, away, None))
+        df['MARGIN'] = (home_score - away_score).abs().astype('Int64')
+        df['OVERTIME'] = overtime.fillna(False).astype(bool)
+        df['SHOOTOUT'] = shootout.fillna(False).astype(bool)
+
+        return df
+
+    @staticmethod
+    def parse_results(df, clubs=None):
+        """
+        Parses the RESULT column of a US league match frame, e.g. 'DET 3, CLE 0 (OT)', either team being listed first.
+
+        RESULT only holds team codes while TEAM1 and TEAM2 hold the away and home teams' locations, the clubs tell
+        which code is the home team's. Without them, or when both teams share a location, HOME and AWAY are left
+        missing along with their scores, WINNER and MARGIN are still filled.
+
+        :param pd.DataFrame df: Specify the frame, with the TEAM1, TEAM2 and RESULT columns
+        :param list[Club] clubs: Specify the clubs of the league
+        :return: The frame with the parsed columns
+        """
+
+        parts = df['RESULT'].astype('string').str.extract(
+            r'^(?P<code1>[A-Z0-9]+) (?P<score1>\d+), (?P<code2>[A-Z0-9]+) (?P<score2>\d+)(?: \((?P<extra>[^)]*)\))?$')
+        score1 = parts['score1'].astype(float)
+        score2 = parts['score2'].astype(float)
+
+        locations = {club.abbreviation: club.location for club in clubs or []}
+        location1 = parts['code1'].map(locations)
+        location2 = parts['code2'].map(locations)
+        away_location = df['TEAM1'].astype('string').str.strip()
+        home_location = df['TEAM2'].astype('string').str.replace(r'^@\s*', '', regex=True).str.strip()
+
+        first_home = ((location1 == home_location) | (location2 == away_location)).fillna(False)
+        first_away = ((location1 == away_location) | (location2 == home_location)).fillna(False)
+        resolved = (first_home ^ first_away).to_numpy()
+        first_home = first_home.to_numpy()
+
+        home = np.where(resolved, np.where(first_home, parts['code1'], parts['code2']), None)
+        away = np.where(resolved, np.where(first_home, parts['code2'], parts['code1']), None)
+        home_score = pd.Series(np.where(resolved, np.where(first_home, score1, score2), np.nan), index=df.index)
+        away_score = pd.Series(np.where(resolved, np.where(first_home, score2, score1), np.nan), index=df.index)
+
+        extra = parts['extra'].str.upper()
+        df = ScoreHandler.__finish(df, home, away, home_score, away_score,
+                                   extra.notna() & (extra != 'SO'), extra == 'SO')
+
+        # The scores give the winner and the margin even when home is unknown
+        df['WINNER'] = np.where(score1 > score2, parts['code1'], np.where(score2 > score1, parts['code2'], None))
+        df['MARGIN'] = (score1 - score2).abs().astype('Int64')
+
+        return df
+
+    @staticmethod
+    def parse_scores(df):
+        """
+        Parses the SCORE and DURATION columns of a soccer match frame, e.g. '2 - 1' and 'AET', club1 being the home
+        team.
+
+        :param pd.DataFrame df: Specify the frame, with the club1, club2, SCORE and DURATION columns
+        :return: The frame with the parsed columns
+        """
+
+        parts = df['SCORE'].astype('string').str.extract(r'^\s*(?P<home>\d+)\s*-\s*(?P<away>\d+)')
+        duration = df['DURATION'].astype('string').str.upper()
+
+        return ScoreHandler.__finish(df, df['club1'].to_numpy(), df['club2'].to_numpy(),
+                                     parts['home'].astype(float), parts['away'].astype(float),
+                                     duration.str.contains('ET', regex=False),
+                                     duration.str.contains('PEN', regex=False))
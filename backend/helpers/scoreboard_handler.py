@@ -0,0 +1,264 @@
+import datetime
+import zoneinfo
+
+import requests
+
+from helpers.concurrency_handler import ConcurrencyHandler
+from helpers.http_handler import HttpHandler
+
+
+class ScoreboardHandler:
+    """
+    Reads games from ESPN's JSON scoreboard api, the fast path of the schedule scraping.
+
+    A request covers up to days_per_request consecutive days, the scraped days are split into such ranges which are
+    fetched concurrently. Ranges the api fails to serve are given back so that the scrapers fall back to the html
+    schedule pages for their days.
+
+    Attributes
+    ----------
+        days_per_request    Number of days covered by a single scoreboard request
+        max_workers         Number of scoreboard requests sent at once
+        limit               Maximum number of games a single scoreboard request returns
+        timezone            Timezone of the schedule pages, games are dated in it
+
+    Methods
+    -------
+        configure(days_per_request=None, max_workers=None, limit=None):
+            Changes the scoreboard settings.
+        get_url(sport, league, first_day, last_day):
+            Builds the url of a scoreboard request.
+        get_events(sport, league, days):
+            Fetches the games played on the given days.
+        get_competitors(event):
+            Retrieves the away and home competitors of a game.
+        get_winner(event):
+            Retrieves the winner and the loser of a game.
+        get_result(event):
+            Formats the result of a game as the schedule pages do.
+        get_leader(competitor_or_event, name):
+            Formats a game or team leader as the schedule pages do.
+        get_featured_athlete(event, name):
+            Retrieves the name of a featured athlete of a game, e.g. its winning pitcher.
+        get_note(event):
+            Retrieves the note of a game, e.g. its playoff round.
+        get_local_date(event):
+            Retrieves the date of a game in the schedule pages' timezone.
+    """
+
+    days_per_request = 31
+    max_workers = 4
+    limit = 1000
+    timezone = zoneinfo.ZoneInfo('America/New_York')
+
+    @staticmethod
+    def configure(days_per_request=None, max_workers=None, limit=None):
+        """
+        Changes the scoreboard settings.
+
+        :param int days_per_request: Specify the number of days covered by a single scoreboard request
+        :param int max_workers: Specify the number of scoreboard requests sent at once
+        :param int limit: Specify the maximum number of games a single scoreboard request returns
+        """
+
+        if days_per_request is not None:
+            ScoreboardHandler.days_per_request = days_per_request
+        if max_workers is not None:
+            ScoreboardHandler.max_workers = max_workers
+        if limit is not None:
+            ScoreboardHandler.limit = limit
+
+    @staticmethod
+    def get_url(sport, league, first_day, last_day):
+        """
+        Builds the url of a scoreboard request.
+
+        :param str sport: Specify the sport, e.g. basketball
+        :param str league: Specify the league, e.g. nba
+        :param str first_day: Specify the first day in YYYYmmDD format
+        :param str last_day: Specify the last day in YYYYmmDD format
+        :return: The scoreboard url
+        """
+
+        dates = first_day if first_day == last_day else f'{first_day}-{last_day}'
+        return f'http://site.api.espn.com/apis/site/v2/sports/{sport}/{league}/scoreboard' \
+               f'?dates={dates}&limit={ScoreboardHandler.limit}'
+
+    @staticmethod
+    def __fetch_range(unit):
+        """
+        Fetches the games of a range of days.
+
+        :param tuple unit: Specify the sport, the league and the list of days
+        :return: A list of events, None if the api failed to serve the range
+        """
+
+        sport, league, days = unit
+
+        try:
+            res = HttpHandler.get(ScoreboardHandler.get_url(sport, league, days[0], days[-1]))
+            if res.status_code != 200:
+                return None
+            events = res.json()['events']
+        except (requests.RequestException, ValueError, KeyError):
+            # The host is down or its circuit open, the html pages cover it
+            return None
+
+        # A range holding more games than limit is truncated, let the html pages cover it
+        if len(events) >= ScoreboardHandler.limit:
+            return None
+
+        return events
+
+    @staticmethod
+    def get_events(sport, league, days):
+        """
+        Fetches the games played on the given days.
+
+        :param str sport: Specify the sport, e.g. basketball
+        :param str league: Specify the league, e.g. nba
+        :param list[str] days: Specify the days in YYYYmmDD format, ascending
+        :return: The list of events (each game once) and the list of days the api failed to serve
+        """
+
+        ranges = []
+        for day in days:
+            if ranges and len(ranges[-1]) < ScoreboardHandler.days_per_request and \
+                    datetime.datetime.strptime(day, '%Y%m%d') - \
+                    datetime.datetime.strptime(ranges[-1][-1], '%Y%m%d') == datetime.timedelta(days=1):
+                ranges[-1].append(day)
+            else:
+                ranges.append([day])
+
+        results = ConcurrencyHandler.map_threaded(ScoreboardHandler.__fetch_range,
+                                                  [(sport, league, x) for x in ranges],
+                                                  ScoreboardHandler.max_workers)
+
+        events = {}
+        missing_days = []
+        for days_range, range_events in zip(ranges, results):
+            if range_events is None:
+                missing_days += days_range
+                continue
+            for event in range_events:
+                events.setdefault(event['id'], event)
+
+        return sorted(events.values(), key=lambda x: x['date']), missing_days
+
+    @staticmethod
+    def get_competitors(event):
+        """
+        Retrieves the away and home competitors of a game.
+
+        :param dict event: Specify the event
+        :return: The away competitor and the home competitor
+        """
+
+        competitors = event['competitions'][0]['competitors']
+        away = next((x for x in competitors if x.get('homeAway') == 'away'), competitors[0])
+        home = next((x for x in competitors if x.get('homeAway') == 'home'), competitors[-1])
+
+        return away, home
+
+    @staticmethod
+    def get_winner(event):
+        """
+        Retrieves the winner and the loser of a game.
+
+        :param dict event: Specify the event
+        :return: The winning competitor and the losing one, both None if the game has no winner (yet)
+        """
+
+        away, home = ScoreboardHandler.get_competitors(event)
+        if home.get('winner'):
+            return home, away
+        if away.get('winner'):
+            return away, home
+
+        return None, None
+
+    @staticmethod
+    def get_result(event):
+        """
+        Formats the result of a game as the schedule pages do, e.g. 'DET 3, CLE 0' with the winner first and
+        ' (OT)' appended to games decided in overtime. Games not completed get their status instead.
+
+        :param dict event: Specify the event
+        :return: The result
+        """
+
+        status = event['competitions'][0].get('status', event.get('status', {}))['type']
+        if not status.get('completed'):
+            return status.get('shortDetail')
+
+        away, home = ScoreboardHandler.get_competitors(event)
+        first, second = (home, away) if home.get('winner') else (away, home)
+        result = f'{first["team"]["abbreviation"]} {first["score"]}, {second["team"]["abbreviation"]} {second["score"]}'
+
+        detail = status.get('shortDetail', '')
+        if '/' in detail:
+            result += f' ({detail.split("/", 1)[1]})'
+
+        return result
+
+    @staticmethod
+    def get_leader(competitor_or_event, name):
+        """
+        Formats a game or team leader as the schedule pages do, e.g. 'Jalen Brunson 32'.
+
+        :param dict competitor_or_event: Specify a competitor for team leaders, an event for game leaders
+        :param str name: Specify the leader category, e.g. points or passingYards
+        :return: The leader, None if the category is missing
+        """
+
+        leaders = competitor_or_event.get('leaders')
+        if leaders is None and 'competitions' in competitor_or_event:
+            leaders = competitor_or_event['competitions'][0].get('leaders')
+
+        for category in leaders or []:
+            if category.get('name') == name and category.get('leaders'):
+                leader = category['leaders'][0]
+                return f'{leader["athlete"]["displayName"]} {leader["displayValue"]}'
+
+        return None
+
+    @staticmethod
+    def get_featured_athlete(event, name):
+        """
+        Retrieves the name of a featured athlete of a game, e.g. its winning pitcher.
+
+        :param dict event: Specify the event
+        :param str name: Specify the feature, e.g. winningPitcher or winningGoalie
+        :return: The athlete's name, None if the game does not feature one
+        """
+
+        status = event['competitions'][0].get('status', {})
+        for athlete in status.get('featuredAthletes', []):
+            if athlete.get('name') == name:
+                return athlete['athlete']['displayName']
+
+        return None
+
+    @staticmethod
+    def get_note(event):
+        """
+        Retrieves the note of a game, e.g. its playoff round.
+
+        :param dict event: Specify the event
+        :return: The note, an empty string if the game has none
+        """
+
+        notes = event['competitions'][0].get('notes', [])
+        return notes[0].get('headline', '') if notes else ''
+
+    @staticmethod
+    def get_local_date(event):
+        """
+        Retrieves the date of a game in the schedule pages' timezone.
+
+        :param dict event: Specify the event
+        :return: The date
+        """
+
+        date = datetime.datetime.fromisoformat(event['date'].replace('Z', '+00:00'))
+        return date.astimezone(ScoreboardHandler.timezone).date()
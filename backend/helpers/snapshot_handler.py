@@ -0,0 +1,724 @@
+import datetime
+import json
+import os
+import threading
+
+import pandas as pd
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+_CLUBS = {
+    'club_id': 'string',
+    'club_name': 'string',
+    'club_slug': 'string',
+    'club_abbreviation': 'category',
+    'club_display_name': 'string',
+    'club_short_display_name': 'string',
+    'club_location': 'category',
+    'league': 'category',
+    'league_url': 'category',
+    'league_name': 'category',
+    'players_url': 'string',
+}
+
+_SCORES = {
+    'HOME': 'category',
+    'AWAY': 'category',
+    'HOME_SCORE': 'Int64',
+    'AWAY_SCORE': 'Int64',
+    'WINNER': 'category',
+    'MARGIN': 'Int64',
+    'OVERTIME': 'bool',
+    'SHOOTOUT': 'bool',
+}
+
+_US_MATCHES = {
+    'TEAM1': 'category',
+    'TEAM2': 'category',
+    'RESULT': 'string',
+    'NOTE': 'category',
+    'ATT': 'Int64',
+    'DATE': 'date',
+    'SOURCE': 'category',
+    **_SCORES,
+}
+
+_US_PLAYERS = {
+    'NAME': 'string',
+    'POS': 'category',
+    'POSITION': 'category',
+    'AGE': 'Int64',
+    'HT': 'float64',
+    'WT': 'float64',
+    'EXP': 'category',
+    'COLLEGE': 'category',
+    'SALARY': 'string',
+    'BAT': 'category',
+    'THW': 'category',
+    'SHOT': 'category',
+    'BIRTH_PLACE': 'category',
+    'BIRTHDATE': 'date',
+    'ATHLETE_ID': 'string',
+    'SOURCE': 'category',
+}
+
+_SOCCER_PLAYERS = {
+    'LEAGUE': 'category',
+    'CLUB': 'category',
+    'YEAR': 'Int64',
+    'NAME': 'string',
+    'NUM': 'Int64',
+    'POS': 'category',
+    'AGE': 'Int64',
+    'HT': 'float64',
+    'WT': 'float64',
+    'NAT': 'category',
+    **{column: 'Int64' for column in ['APP', 'SUB', 'SV', 'GA', 'A', 'FC', 'FA', 'YC', 'RC', 'G', 'SH', 'ST']},
+}
+
+_SOCCER_MATCHES = {
+    'date': 'date',
+    'club1': 'category',
+    'SCORE': 'string',
+    'club2': 'category',
+    'DURATION': 'category',
+    'LOCATION': 'category',
+    'ATTENDANCE': 'Int64',
+    **_SCORES,
+}
+
+
+class SnapshotHandler:
+    """
+    Typed columnar snapshots of the scraped clubs, players and matches, read by the fast_fetch paths of the scrapers.
+
+    Snapshots are Parquet files written with a schema per sport and entity: repeated strings are stored as
+    categoricals (dictionary encoded), counts as nullable integers, measures as floats and dates as dates. Values are
+    parsed once, when the snapshot is written, so that loading a snapshot is a plain columnar read. A snapshot not
+    written yet is read from the legacy CSV cache it replaces, parsed with the same schema.
+
+    Match snapshots are partitioned by month of their date column, a manifest records the date range and number of
+    rows of every partition. A date range query only opens the partitions overlapping it, and filters their rows
+    while reading them, so that its cost depends on the size of the range rather than on the size of the history.
+    A match history kept in an unpartitioned snapshot or a legacy CSV cache is migrated into partitions the first time
+    the partitioned snapshot is used, its days being recorded as scraped when the history was written. Merges into a
+    partitioned snapshot are serialized, threads may merge the ranges they scraped side by side.
+
+    Attributes
+    ----------
+        directory      Directory holding the snapshots
+        compression    Parquet compression codec
+        schemas        Dict of {column: dtype} schemas keyed by (sport, entity), dtype being a pandas dtype or 'date'
+        partition_columns    Dict of the date columns partitioned snapshots are split on, keyed by (sport, entity)
+        natural_keys         Dict of the columns identifying a row of a partitioned snapshot, keyed by (sport, entity)
+        legacy_csvs          Dict of the legacy CSV caches of the partitioned snapshots, keyed by (sport, entity)
+        settle_days          Number of days after which the games of a day are considered settled
+
+    Methods
+    -------
+        configure(directory=None, compression=None):
+            Changes the snapshot settings.
+        get_path(sport, entity):
+            Builds the path of a snapshot.
+        apply_schema(sport, entity, df):
+            Converts the columns of a frame to the dtypes of its schema.
+        write(sport, entity, df):
+            Writes a snapshot.
+        read(sport, entity, columns=None, legacy_csv=None):
+            Reads a snapshot, or its legacy CSV cache if it was not written yet.
+        get_partition_directory(sport, entity):
+            Builds the path of the directory holding a partitioned snapshot.
+        get_manifest(sport, entity):
+            Retrieves the manifest of a partitioned snapshot.
+        write_partitioned(sport, entity, df, scraped_on=None):
+            Writes a snapshot partitioned by month.
+        migrate(sport, entity, legacy_csv=None):
+            Partitions the unpartitioned snapshot or the legacy CSV cache of a partitioned snapshot not written yet.
+        merge_partitioned(sport, entity, df, start_date, end_date, days=None):
+            Merges freshly scraped rows into a partitioned snapshot.
+        get_missing_days(sport, entity, start_date, end_date, frozen_before=None):
+            Retrieves the days of a range a partitioned snapshot is missing.
+        read_range(sport, entity, start_date=None, end_date=None, columns=None, legacy_csv=None):
+            Reads the rows of a partitioned snapshot dated within a range.
+        get_timestamp(sport, entity):
+            Retrieves the time a snapshot was written at.
+        to_records(df):
+            Converts a snapshot to a list of dicts, missing values being None.
+    """
+
+    directory = 'snapshots'
+    compression = 'zstd'
+
+    schemas = {
+        **{(sport, 'clubs'): _CLUBS for sport in ['soccer', 'nba', 'nfl', 'mlb', 'nhl', 'wnba']},
+        **{(sport, 'players'): _US_PLAYERS for sport in ['nba', 'nfl', 'mlb', 'nhl', 'wnba']},
+        **{(sport, 'matches'): _US_MATCHES for sport in ['nba', 'nfl', 'mlb', 'nhl', 'wnba']},
+        ('soccer', 'players'): _SOCCER_PLAYERS,
+        ('soccer', 'matches'): _SOCCER_MATCHES,
+    }
+
+    partition_columns = {
+        **{(sport, 'matches'): 'DATE' for sport in ['nba', 'nfl', 'mlb', 'nhl', 'wnba']},
+        ('soccer', 'matches'): 'date',
+    }
+
+    natural_keys = {
+        # Baseball doubleheaders oppose the same teams twice a day, their results tell them apart
+        **{(sport, 'matches'): ['DATE', 'TEAM1', 'TEAM2', 'RESULT'] for sport in ['nba', 'nfl', 'mlb', 'nhl', 'wnba']},
+        ('soccer', 'matches'): ['date', 'club1', 'club2'],
+    }
+
+    legacy_csvs = {
+        **{(sport, 'matches'): f'cached_matches_{sport}.csv' for sport in ['nba', 'nfl', 'mlb', 'nhl', 'wnba']},
+        ('soccer', 'matches'): 'cached_matches.csv',
+    }
+
+    settle_days = 1
+
+    __locks = {}
+    __lock = threading.Lock()
+
+    @staticmethod
+    def configure(directory=None, compression=None):
+        """
+        Changes the snapshot settings.
+
+        :param str directory: Specify the directory holding the snapshots
+        :param str compression: Specify the Parquet compression codec, e.g. zstd, snappy or None
+        """
+
+        if directory is not None:
+            SnapshotHandler.directory = directory
+        if compression is not None:
+            SnapshotHandler.compression = compression
+
+    @staticmethod
+    def get_path(sport, entity):
+        """
+        Builds the path of a snapshot.
+
+        :param str sport: Specify the sport, e.g. soccer or nba
+        :param str entity: Specify the entity, e.g. clubs, players or matches
+        :return: The path of the snapshot
+        """
+
+        return os.path.join(SnapshotHandler.directory, f'{sport}_{entity}.parquet')
+
+    @staticmethod
+    def __convert(values, dtype):
+        """
+        Converts a column to a dtype.
+
+        :param pd.Series values: Specify the column
+        :param str dtype: Specify the dtype, 'date' for dates
+        :return: The converted column
+        """
+
+        if dtype == 'date':
+            return pd.to_datetime(values, format='mixed', errors='coerce').dt.normalize()
+
+        if dtype in ('Int64', 'float64'):
+            if pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values):
+                values = values.astype('string').str.replace(',', '', regex=False)
+            values = pd.to_numeric(values, errors='coerce')
+            if dtype == 'Int64':
+                # Legacy caches hold counts as floats (e.g. 30.0), non integral values are left missing
+                values = values.where(values.isna() | (values == values.round()))
+            return values.astype(dtype)
+
+        if dtype == 'bool':
+            if pd.api.types.is_bool_dtype(values):
+                return values
+            return values.astype('string').str.lower().isin(['true', '1']).to_numpy()
+
+        if dtype == 'category':
+            return values.astype('string').astype('category')
+
+        return values.astype(dtype)
+
+    @staticmethod
+    def apply_schema(sport, entity, df):
+        """
+        Converts the columns of a frame to the dtypes of its schema, columns the schema does not list are kept as they
+        are.
+
+        :param str sport: Specify the sport
+        :param str entity: Specify the entity
+        :param pd.DataFrame df: Specify the frame
+        :return: The converted frame
+        """
+
+        df = df.copy()
+        for column, dtype in SnapshotHandler.schemas.get((sport, entity), {}).items():
+            if column in df.columns:
+                df[column] = SnapshotHandler.__convert(df[column], dtype)
+
+        return df
+
+    @staticmethod
+    def __write_table(df, path):
+        """
+        Writes a typed frame to a Parquet file, aside first then renamed so that an interrupted write leaves the
+        previous file in place.
+
+        :param pd.DataFrame df: Specify the frame, converted to its schema already
+        :param str path: Specify the path of the file
+        """
+
+        table = pyarrow.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            b'snapshot_timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat().encode(),
+        })
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        pyarrow.parquet.write_table(table, f'{path}.tmp', compression=SnapshotHandler.compression)
+        os.replace(f'{path}.tmp', path)
+
+    @staticmethod
+    def write(sport, entity, df):
+        """
+        Writes a snapshot, replacing the previous one. The frame's index is dropped, index levels to keep must be
+        reset to columns first.
+
+        :param str sport: Specify the sport
+        :param str entity: Specify the entity
+        :param pd.DataFrame df: Specify the frame
+        :return: The path of the snapshot
+        """
+
+        if pyarrow is None:
+            raise ImportError('snapshots require pyarrow')
+
+        path = SnapshotHandler.get_path(sport, entity)
+        SnapshotHandler.__write_table(SnapshotHandler.apply_schema(sport, entity, df), path)
+
+        return path
+
+    @staticmethod
+    def __read_legacy_csv(path):
+        """
+        Reads a legacy CSV cache, skipping its timestamp line if it has one.
+
+        :param str path: Specify the path of the CSV cache
+        :return: A dataframe
+        """
+
+        with open(path, 'r', encoding='utf-8') as f:
+            skiprows = 1 if f.readline().startswith('#') else 0
+
+        df = pd.read_csv(path, skiprows=skiprows, dtype=str, keep_default_na=False, na_values=[''])
+
+        # Caches written along with their range index carry it as an unnamed first column
+        return df.loc[:, ~df.columns.str.startswith('Unnamed:')]
+
+    @staticmethod
+    def read(sport, entity, columns=None, legacy_csv=None):
+        """
+        Reads a snapshot, or its legacy CSV cache if it was not written yet.
+
+        :param str sport: Specify the sport
+        :param str entity: Specify the entity
+        :param list[str] columns: Specify the columns to read, all of them if None
+        :param str legacy_csv: Specify the path of the CSV cache the snapshot replaces
+        :return: A dataframe typed with the schema of the snapshot
+        """
+
+        path = SnapshotHandler.get_path(sport, entity)
+
+        if os.path.exists(path):
+            if pyarrow is None:
+                raise ImportError('snapshots require pyarrow')
+            return pyarrow.parquet.read_table(path, columns=columns).to_pandas()
+
+        if legacy_csv is not None and os.path.exists(legacy_csv):
+            df = SnapshotHandler.apply_schema(sport, entity, SnapshotHandler.__read_legacy_csv(legacy_csv))
+            return df if columns is None else df[columns]
+
+        raise FileNotFoundError(f'No snapshot of the {sport} {entity}, cache them first')
+
+    @staticmethod
+    def get_partition_directory(sport, entity):
+        """
+        Builds the path of the directory holding a partitioned snapshot, its partitions and its manifest.
+
+        :param str sport: Specify the sport
+        :param str entity: Specify the entity
+        :return: The path of the directory
+        """
+
+        return os.path.join(SnapshotHandler.directory, f'{sport}_{entity}')
+
+    @staticmethod
+    def get_manifest(sport, entity):
+        """
+        Retrieves the manifest of a partitioned snapshot.
+
+        :param str sport: Specify the sport
+        :param str entity: Specify the entity
+        :return: A dict of {'min', 'max', 'rows', 'days'} dicts keyed by partition file name, min and max being ISO
+            dates (None for the partition of the rows without a date) and days the dates the days covered by the
+            partition were scraped on, keyed by day, None if the snapshot was not written yet
+        """
+
+        path = os.path.join(SnapshotHandler.get_partition_directory(sport, entity), 'manifest.json')
+        if not os.path.exists(path):
+            return None
+
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    @staticmethod
+    def __write_partition(directory, name, partition, column, days=None):
+        """
+        Writes a partition of a partitioned snapshot.
+
+        :param str directory: Specify the directory of the snapshot
+        :param str name: Specify the file name of the partition
+        :param pd.DataFrame partition: Specify the rows of the partition, converted to their schema already
+        :param str column: Specify the date column the snapshot is partitioned on
+        :param dict days: Specify the days the partition covers, the dates they were scraped on keyed by day
+        :return: The manifest entry of the partition
+        """
+
+        SnapshotHandler.__write_table(partition, os.path.join(directory, name))
+
+        dates = partition[column].dropna()
+        return {
+            'min': None if dates.empty else dates.min().date().isoformat(),
+            'max': None if dates.empty else dates.max().date().isoformat(),
+            'rows': len(partition),
+            'days': dict(sorted((days or {}).items())),
+        }
+
+    @staticmethod
+    def __write_manifest(directory, manifest):
+        """
+        Writes the manifest of a partitioned snapshot, aside first then renamed.
+
+        :param str directory: Specify the directory of the snapshot
+        :param dict manifest: Specify the manifest
+        """
+
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, 'manifest.json')
+        with open(f'{path}.tmp', 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        os.replace(f'{path}.tmp', path)
+
+    @staticmethod
+    def __get_months(df, column):
+        """
+        Retrieves the month partition of every row.
+
+        :param pd.DataFrame df: Specify the frame
+        :param str column: Specify the date column
+        :return: A numpy array of YYYY-mm months, 'unknown' for rows without a date
+        """
+
+        return df[column].dt.strftime('%Y-%m').fillna('unknown').to_numpy()
+
+    @staticmethod
+    def write_partitioned(sport, entity, df, scraped_on=None):
+        """
+        Writes a snapshot partitioned by month of its date column (see partition_columns), replacing the previous one.
+        The frame is taken to cover every day from its first date to its last one, these days are recorded as scraped
+        on scraped_on, see get_missing_days.
+
+        :param str sport: Specify the sport
+        :param str entity: Specify the entity
+        :param pd.DataFrame df: Specify the frame
+        :param datetime.date scraped_on: Specify the date the rows were scraped on, defaults to today
+        :return: The manifest of the snapshot
+        """
+
+        if pyarrow is None:
+            raise ImportError('snapshots require pyarrow')
+
+        column = SnapshotHandler.partition_columns[(sport, entity)]
+        directory = SnapshotHandler.get_partition_directory(sport, entity)
+        df = SnapshotHandler.apply_schema(sport, entity, df)
+        df_months = SnapshotHandler.__get_months(df, column)
+
+        dates = df[column].dropna()
+        days = pd.date_range(dates.min(), dates.max(), freq='D') if len(dates) else pd.DatetimeIndex([])
+        scraped_on = (scraped_on or datetime.date.today()).isoformat()
+
+        # Months of the range without a row get an empty partition, recording their days
+        manifest = {}
+        for month in sorted(set(days.strftime('%Y-%m')) | set(df_months)):
+            name = f'month={month}.parquet'
+            covered = days[days.strftime('%Y-%m') == month].strftime('%Y-%m-%d')
+            partition = df[df_months == month].sort_values(column, kind='stable')
+            manifest[name] = SnapshotHandler.__write_partition(directory, name, partition, column,
+                                                               {x: scraped_on for x in covered})
+
+        SnapshotHandler.__write_manifest(directory, manifest)
+
+        # Partitions of months the new snapshot does not cover anymore
+        for name in os.listdir(directory):
+            if name.endswith('.parquet') and name not in manifest:
+                os.remove(os.path.join(directory, name))
+
+        return manifest
+
+    @staticmethod
+    def __get_lock(sport, entity):
+        """
+        Retrieves the lock serializing the writes of a partitioned snapshot.
+
+        :param str sport: Specify the sport
+        :param str entity: Specify the entity
+        :return: The lock
+        """
+
+        with SnapshotHandler.__lock:
+            return SnapshotHandler.__locks.setdefault((sport, entity), threading.RLock())
+
+    @staticmethod
+    def __get_legacy_timestamp(sport, entity, legacy_csv):
+        """
+        Retrieves the date the unpartitioned snapshot or the legacy CSV cache of a partitioned snapshot was written on.
+
+        :param str sport: Specify the sport
+        :param str entity: Specify the entity
+        :param str legacy_csv: Specify the path of the CSV cache, None if the history is an unpartitioned snapshot
+        :return: The date
+        """
+
+        if legacy_csv is None:
+            timestamp = SnapshotHandler.get_timestamp(sport, entity)
+            if timestamp is not None:
+                return timestamp.date()
+            return datetime.date.fromtimestamp(os.path.getmtime(SnapshotHandler.get_path(sport, entity)))
+
+        with open(legacy_csv, 'r', encoding='utf-8') as f:
+            line = f.readline()
+        if line.startswith('# Timestamp:'):
+            try:
+                return datetime.datetime.fromisoformat(line[len('# Timestamp:'):].strip()).date()
+            except ValueError:
+                pass
+
+        return datetime.date.fromtimestamp(os.path.getmtime(legacy_csv))
+
+    @staticmethod
+    def migrate(sport, entity, legacy_csv=None):
+        """
+        Partitions the history of a partitioned snapshot not written yet (see write_partitioned), read from its
+        unpartitioned snapshot or else from its legacy CSV cache. Its days are recorded as scraped on the date the
+        history was written on, so that the days it covers are not scraped again.
+
+        :param str sport: Specify the sport
+        :param str entity: Specify the entity
+        :param str legacy_csv: Specify the path of the CSV cache, defaults to the one of legacy_csvs
+        :return: The manifest of the snapshot, None if it was not written yet and there is no history to migrate
+        """
+
+        legacy_csv = legacy_csv or SnapshotHandler.legacy_csvs.get((sport, entity))
+
+        with SnapshotHandler.__get_lock(sport, entity):
+            manifest = SnapshotHandler.get_manifest(sport, entity)
+            if manifest is not None:
+                return manifest
+
+            if os.path.exists(SnapshotHandler.get_path(sport, entity)):
+                source = None
+            elif legacy_csv is not None and os.path.exists(legacy_csv):
+                source = legacy_csv
+            else:
+                return None
+
+            df = SnapshotHandler.read(sport, entity, legacy_csv=source)
+            scraped_on = SnapshotHandler.__get_legacy_timestamp(sport, entity, source)
+
+            return SnapshotHandler.write_partitioned(sport, entity, df, scraped_on)
+
+    @staticmethod
+    def merge_partitioned(sport, entity, df, start_date, end_date, days=None):
+        """
+        Merges freshly scraped rows into a partitioned snapshot. The rows replace those of the snapshot dated within
+        the days they were scraped for, the months of these days only are rewritten, and rows sharing a natural key
+        (see natural_keys) are kept once, the fresh one winning. Merging the same rows twice leaves the snapshot
+        unchanged.
+
+        The days are recorded in the manifest along with the date they were scraped on, see get_missing_days. A
+        snapshot not written yet is first migrated from its history, see migrate.
+
+        :param str sport: Specify the sport
+        :param str entity: Specify the entity
+        :param pd.DataFrame df: Specify the scraped rows
+        :param datetime.date start_date: Specify the first day the rows were scraped for
+        :param datetime.date end_date: Specify the last day the rows were scraped for
+        :param list[datetime.date] days: Specify the days of the range actually scraped, defaults to every day of the
+            range; days whose page failed to be fetched are left out so that they are scraped again
+        :return: The manifest of the snapshot
+        """
+
+        if pyarrow is None:
+            raise ImportError('snapshots require pyarrow')
+
+        column = SnapshotHandler.partition_columns[(sport, entity)]
+        key = [x for x in SnapshotHandler.natural_keys[(sport, entity)] if x in df.columns]
+        directory = SnapshotHandler.get_partition_directory(sport, entity)
+
+        df = SnapshotHandler.apply_schema(sport, entity, df)
+        df_months = SnapshotHandler.__get_months(df, column)
+
+        if days is None:
+            days = pd.date_range(start_date, end_date, freq='D')
+        else:
+            days = pd.DatetimeIndex(sorted(pd.Timestamp(x) for x in days if start_date <= x <= end_date))
+        scraped_on = datetime.date.today().isoformat()
+        months = sorted(set(days.strftime('%Y-%m')) | set(df_months))
+
+        with SnapshotHandler.__get_lock(sport, entity):
+            manifest = SnapshotHandler.get_manifest(sport, entity) or SnapshotHandler.migrate(sport, entity) or {}
+
+            for month in months:
+                name = f'month={month}.parquet'
+                covered = days[days.strftime('%Y-%m') == month]
+                partition = df[df_months == month]
+
+                if name in manifest and os.path.exists(os.path.join(directory, name)):
+                    existing = pyarrow.parquet.read_table(os.path.join(directory, name)).to_pandas()
+                    existing = existing[~existing[column].isin(covered)]
+                    partition = SnapshotHandler.apply_schema(
+                        sport, entity, pd.concat([existing.astype(object), partition.astype(object)],
+                                                 ignore_index=True))
+
+                partition = partition.drop_duplicates(key, keep='last').sort_values(column, kind='stable')
+                scraped = dict(manifest.get(name, {}).get('days', {}))
+                scraped.update({x: scraped_on for x in covered.strftime('%Y-%m-%d')})
+                manifest[name] = SnapshotHandler.__write_partition(directory, name, partition, column, scraped)
+
+            SnapshotHandler.__write_manifest(directory, manifest)
+
+        return manifest
+
+    @staticmethod
+    def get_missing_days(sport, entity, start_date, end_date, frozen_before=None):
+        """
+        Retrieves the days of a range a partitioned snapshot is missing. Days never merged into the snapshot are
+        missing, and so are days scraped less than settle_days after them, whose games may not all have been played,
+        unless they are frozen. A snapshot not written yet is first migrated from its history, see migrate.
+
+        :param str sport: Specify the sport
+        :param str entity: Specify the entity
+        :param datetime.date start_date: Specify the first day of the range
+        :param datetime.date end_date: Specify the last day of the range
+        :param datetime.date frozen_before: Specify the first day not frozen (see TierHandler.get_horizon), days
+            before it are never scraped again once in the snapshot
+        :return: A list of dates, ascending
+        """
+
+        scraped = {}
+        manifest = SnapshotHandler.get_manifest(sport, entity) or SnapshotHandler.migrate(sport, entity) or {}
+        for stats in manifest.values():
+            scraped.update(stats.get('days', {}))
+
+        missing = []
+        for i in range((end_date - start_date).days + 1):
+            day = start_date + datetime.timedelta(days=i)
+            settled = day + datetime.timedelta(days=SnapshotHandler.settle_days)
+            scraped_on = scraped.get(day.isoformat())
+            if scraped_on is None:
+                missing.append(day)
+            elif (frozen_before is None or day >= frozen_before) and datetime.date.fromisoformat(scraped_on) < settled:
+                missing.append(day)
+
+        return missing
+
+    @staticmethod
+    def read_range(sport, entity, start_date=None, end_date=None, columns=None, legacy_csv=None):
+        """
+        Reads the rows of a partitioned snapshot dated within a range, opening the partitions overlapping it only.
+        A snapshot not written yet is first migrated from its history, see migrate.
+
+        :param str sport: Specify the sport
+        :param str entity: Specify the entity
+        :param datetime.date start_date: Specify the first date of the range, unbounded if None
+        :param datetime.date end_date: Specify the last date of the range, unbounded if None
+        :param list[str] columns: Specify the columns to read, all of them if None
+        :param str legacy_csv: Specify the path of the CSV cache the snapshot replaces, defaults to the one of
+            legacy_csvs
+        :return: A dataframe typed with the schema of the snapshot
+        """
+
+        if pyarrow is None:
+            raise ImportError('snapshots require pyarrow')
+
+        column = SnapshotHandler.partition_columns[(sport, entity)]
+        start = None if start_date is None else pd.Timestamp(start_date)
+        end = None if end_date is None else pd.Timestamp(end_date)
+
+        manifest = SnapshotHandler.get_manifest(sport, entity) or SnapshotHandler.migrate(sport, entity, legacy_csv)
+        if manifest is None:
+            raise FileNotFoundError(f'No snapshot of the {sport} {entity}, cache them first')
+
+        names = []
+        for name, stats in sorted(manifest.items()):
+            if not stats['rows']:
+                continue
+            if stats['min'] is None:
+                # Rows without a date only belong to unbounded queries
+                if start is None and end is None:
+                    names.append(name)
+            elif (start is None or pd.Timestamp(stats['max']) >= start) and \
+                    (end is None or pd.Timestamp(stats['min']) <= end):
+                names.append(name)
+
+        filters = []
+        if start is not None:
+            filters.append((column, '>=', start))
+        if end is not None:
+            filters.append((column, '<=', end))
+
+        directory = SnapshotHandler.get_partition_directory(sport, entity)
+        tables = [pyarrow.parquet.read_table(os.path.join(directory, x), columns=columns, filters=filters or None)
+                  for x in names]
+
+        if not tables:
+            if not manifest:
+                return pd.DataFrame(columns=columns)
+            schema = pyarrow.parquet.read_schema(os.path.join(directory, min(manifest)))
+            table = schema.empty_table()
+            return (table if columns is None else table.select(columns)).to_pandas()
+
+        return pyarrow.concat_tables(tables, promote_options='permissive').to_pandas()
+
+    @staticmethod
+    def get_timestamp(sport, entity):
+        """
+        Retrieves the time a snapshot was written at.
+
+        :param str sport: Specify the sport
+        :param str entity: Specify the entity
+        :return: A timezone aware datetime, None if the snapshot was not written yet
+        """
+
+        path = SnapshotHandler.get_path(sport, entity)
+        if pyarrow is None or not os.path.exists(path):
+            return None
+
+        metadata = pyarrow.parquet.read_schema(path).metadata or {}
+        if b'snapshot_timestamp' not in metadata:
+            return None
+
+        return datetime.datetime.fromisoformat(metadata[b'snapshot_timestamp'].decode())
+
+    @staticmethod
+    def to_records(df):
+        """
+        Converts a snapshot to a list of dicts, missing values being None, e.g. to rebuild model objects from it.
+
+        :param pd.DataFrame df: Specify the snapshot
+        :return: A list of dicts keyed by column
+        """
+
+        return df.astype(object).where(df.notna(), None).to_dict('records')
@@ -0,0 +1,115 @@
+import datetime
+
+
+class TierHandler:
+    """
+    Cache tiers of the scraped data: finished seasons and dates older than a horizon are frozen, they never change
+    anymore and are served from the snapshot store only, once they are in it. The current season and recent dates are
+    the only ones eligible for network refresh.
+
+    Attributes
+    ----------
+        horizon_days          Number of days after which a date is frozen
+        season_start_month    Month seasons start in, a season being named after the year it starts in
+
+    Methods
+    -------
+        configure(horizon_days=None, season_start_month=None):
+            Changes the tier settings.
+        get_horizon(today=None):
+            Retrieves the first date not frozen yet.
+        get_current_season(today=None):
+            Retrieves the season being played.
+        is_frozen_day(day, today=None):
+            Tells whether a date is frozen.
+        is_frozen_season(season_year, today=None):
+            Tells whether a season is frozen.
+        split_seasons(season_years, cached_season_years, today=None):
+            Splits seasons into those served from the snapshot store and those to scrap.
+    """
+
+    horizon_days = 14
+    season_start_month = 7
+
+    @staticmethod
+    def configure(horizon_days=None, season_start_month=None):
+        """
+        Changes the tier settings.
+
+        :param int horizon_days: Specify the number of days after which a date is frozen
+        :param int season_start_month: Specify the month seasons start in
+        """
+
+        if horizon_days is not None:
+            TierHandler.horizon_days = horizon_days
+        if season_start_month is not None:
+            TierHandler.season_start_month = season_start_month
+
+    @staticmethod
+    def get_horizon(today=None):
+        """
+        Retrieves the first date not frozen yet.
+
+        :param datetime.date today: Specify the current date, defaults to today
+        :return: The date
+        """
+
+        return (today or datetime.date.today()) - datetime.timedelta(days=TierHandler.horizon_days)
+
+    @staticmethod
+    def get_current_season(today=None):
+        """
+        Retrieves the season being played, e.g. 2024 for the 2024-25 season.
+
+        :param datetime.date today: Specify the current date, defaults to today
+        :return: The season's year
+        """
+
+        today = today or datetime.date.today()
+        return today.year if today.month >= TierHandler.season_start_month else today.year - 1
+
+    @staticmethod
+    def is_frozen_day(day, today=None):
+        """
+        Tells whether a date is frozen.
+
+        :param datetime.date day: Specify the date
+        :param datetime.date today: Specify the current date, defaults to today
+        :return: True if the date is older than the horizon
+        """
+
+        return day < TierHandler.get_horizon(today)
+
+    @staticmethod
+    def is_frozen_season(season_year, today=None):
+        """
+        Tells whether a season is frozen.
+
+        :param int season_year: Specify the season's year
+        :param datetime.date today: Specify the current date, defaults to today
+        :return: True if the season is finished
+        """
+
+        return season_year < TierHandler.get_current_season(today)
+
+    @staticmethod
+    def split_seasons(season_years, cached_season_years, today=None):
+        """
+        Splits seasons into those served from the snapshot store, frozen ones it holds already, and those to scrap.
+
+        :param list[int] season_years: Specify the seasons
+        :param list[int] cached_season_years: Specify the seasons the snapshot store holds
+        :param datetime.date today: Specify the current date, defaults to today
+        :return: The list of frozen seasons and the list of seasons to scrap
+        """
+
+        cached_season_years = set(int(x) for x in cached_season_years)
+
+        frozen, refresh = [], []
+        for season_year in season_years:
+            if TierHandler.is_frozen_season(season_year, today) and int(season_year) in cached_season_years:
+                frozen.append(season_year)
+            else:
+                refresh.append(season_year)
+
+        return frozen, refresh
@@ -2,10 +2,19 @@ import datetime
 
 import pandas as pd
 import numpy as np
-import bs4
-import re
 import requests
 from helpers.date_time_handler import DateTimeHandler
+from helpers.concurrency_handler import ConcurrencyHandler
+from helpers.http_handler import HttpHandler
+from helpers.journal_handler import JournalHandler
+from helpers.normalization_handler import NormalizationHandler
+from helpers.parse_executor import ParseExecutor
+from helpers.parser_handler import ParserHandler
+from helpers.pipeline_handler import PipelineHandler
+from helpers.row_accumulator import RowAccumulator
+from helpers.score_handler import ScoreHandler
+from helpers.snapshot_handler import SnapshotHandler
+from helpers.tier_handler import TierHandler
 from models.club import Club
 from models.league import League
 
@@ -37,20 +46,51 @@ class SoccerScraper:
 
         __get_cached_players():
             Retrieves the player's snapshot.
-        cache_players():
+        cache_players(season_years=None, incremental=True, checkpoint_units=200, max_workers=8, pipeline=False):
             Collects a snapshot of the players for faster fetch in the future.
-        scrap_players(season_years=None, leagues=None, clubs=None, fast_fetch_clubs=False, fast_fetch=False)
+        scrap_players(season_years=None, leagues=None, clubs=None, fast_fetch_clubs=False, fast_fetch=False,
+                      max_workers=8, shard_index=0, shard_count=1)
             Scraps data containing information about club's players.
-        __scrap_players(season_years=None, leagues=None, clubs=None, fast_fetch_clubs=False):
+        __get_squad_url(season_year, club):
+            Builds the url of a club's squad page for a season.
+        fetch_club_season_players(unit):
+            Fetches a club's squad page for a season.
+        parse_club_season_players(unit, page):
+            Parses a club's squad page for a season.
+        __scrap_club_season_players(unit):
+            Scraps a club's squad for a season.
+        __get_player_units(season_years=None, leagues=None, clubs=None, fast_fetch_clubs=False,
+                           shard_index=0, shard_count=1):
+            Lists the (season, club) squad pages to scrap.
+        __build_players_frame(units_players):
+            Builds the players frame out of scraped squads.
+        iter_players(season_years=None, leagues=None, clubs=None, fast_fetch_clubs=False, max_workers=8,
+                     shard_index=0, shard_count=1):
+            Scraps data containing information about club's players squad by squad.
+        __scrap_players(season_years=None, leagues=None, clubs=None, fast_fetch_clubs=False,
+                        max_workers=8, shard_index=0, shard_count=1):
             Scraps data containing information about club's players.
 
-        __get_cached_matches():
+        __get_cached_matches(start_date=None, end_date=None):
             Retrieves the match's snapshot.
-        cache_matches():
+        cache_matches(start_date=None, end_date=None, incremental=True, checkpoint_days=31, pipeline=False,
+                      concurrency=8):
             Collects a snapshot of the matches for faster fetch in the future.
-        scrap_matches(start_date=None, end_date=None, fast_fetch=False):
+        scrap_matches(start_date=None, end_date=None, fast_fetch=False, concurrency=None):
             Scraps data containing information about the results of the matches.
-        __scrap_matches(start_date=datetime.date.today() - datetime.timedelta(days=7), end_date=datetime.date.today()):
+        fetch_matches_day(singleDay, request_tries=8):
+            Fetches the fixtures page of a single day.
+        parse_matches_day(singleDay, page):
+            Parses the fixtures page of a single day.
+        __scrap_matches_day(singleDay, request_tries=8):
+            Scraps the matches played on a single day.
+        __build_matches_frame(days_data):
+            Builds a matches frame out of scraped days.
+        __iter_days_data(days_between, request_tries=8, concurrency=None):
+            Scraps the matches of the given days.
+        iter_matches(start_date=None, end_date=None, request_tries=8, concurrency=None):
+            Scraps data containing information about the results of the matches day by day.
+        __scrap_matches(start_date=None, end_date=None, request_tries=8, concurrency=None):
             Scraps data containing information about the results of the matches.
     """
 
@@ -67,18 +107,16 @@ class SoccerScraper:
 
         leagues = []
 
-        # Partially prevents scraping detection
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 6.0; WOW64; rv:24.0) Gecko/20100101 Firefox/24.0'}
-        res = requests.get('https://www.espn.com/soccer/teams', headers=headers)
-        soup = bs4.BeautifulSoup(res.text, 'html.parser')
-        ddl = soup.find('select', attrs={'class': 'dropdown__select'})
+        res = HttpHandler.get('https://www.espn.com/soccer/teams')
+        document = ParserHandler.parse(res.text)
+        ddl = document.select_one('select.dropdown__select')
 
         if not ddl:
             return leagues
 
-        options = ddl.find_all('option')
+        options = ddl.select('option')
         for option in options:
-            leagues.append(League(option['value'], option.text))
+            leagues.append(League(option.get('value'), option.text))
 
         return leagues
 
@@ -103,13 +141,12 @@ class SoccerScraper:
         Retrieves the club's snapshot.
         """
 
-        clubs = []
-        df = pd.read_csv('cached_clubs.csv', index_col='club_id', skiprows=1)
-
-        for index, row in df.iterrows():
-            clubs.append(Club(index, row['club_name'], League(row['league_url'], row['league_name'])))
+        df = SnapshotHandler.read('soccer', 'clubs', legacy_csv='cached_clubs.csv')
 
-        return clubs
+        return [Club(x['club_id'], x['club_name'], x.get('club_slug'), x.get('club_abbreviation'),
+                     x.get('club_display_name'), x.get('club_short_display_name'), x.get('club_location'),
+                     League(x['league_url'], x['league_name']), x.get('players_url'))
+                for x in SnapshotHandler.to_records(df)]
 
     @staticmethod
     def cache_clubs():
@@ -121,20 +158,17 @@ class SoccerScraper:
         data = {
             'club_id': [x.club_id for x in clubs],
             'club_name': [x.name for x in clubs],
+            'club_slug': [x.slug for x in clubs],
+            'club_abbreviation': [x.abbreviation for x in clubs],
+            'club_display_name': [x.display_name for x in clubs],
+            'club_short_display_name': [x.short_display_name for x in clubs],
+            'club_location': [x.location for x in clubs],
             'league_url': [x.league.url for x in clubs],
             'league_name': [x.league.name for x in clubs],
+            'players_url': [x.players_url for x in clubs],
         }
 
-        df = pd.DataFrame(data)
-
-        df.set_index('club_id', inplace=True)
-
-        f = open('cached_clubs.csv', "w+")
-        #f.write(f'# Timestamp: {datetime.datetime.utcnow()}\n')
-        f.close()
-
-        # noinspection PyTypeChecker
-        df.to_csv('cached_clubs.csv', mode='a')
+        SnapshotHandler.write('soccer', 'clubs', pd.DataFrame(data))
 
     @staticmethod
     def __get_clubs(tolerate_too_many_requests=False, fast_fetch=False):
@@ -156,10 +190,7 @@ class SoccerScraper:
         for league in scraped_leagues:
             #print(ProgressHandler.show_progress(processed, len(scraped_leagues)))
             # processed += 1
-            # Partially prevents scraping detection
-            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 6.0; WOW64; rv:24.0) Gecko/20100101 Firefox/24.0'}
-            response = requests.get(f'http://site.api.espn.com/apis/site/v2/sports/soccer/{league.url}/teams',
-                                    headers=headers)
+            response = HttpHandler.get(f'http://site.api.espn.com/apis/site/v2/sports/soccer/{league.url}/teams')
             try:
                 for club in response.json()['sports'][0]['leagues'][0]['teams']:
                     
@@ -197,26 +228,82 @@ class SoccerScraper:
         Retrieves the player's snapshot.
         """
 
-        players = pd.read_csv('cached_players.csv', skiprows=1)
+        players = SnapshotHandler.read('soccer', 'players', legacy_csv='cached_players.csv')
 
         return players
 
     @staticmethod
-    def cache_players():
+    def cache_players(season_years=None, incremental=True, checkpoint_units=200, max_workers=8, pipeline=False):
         """
         Collects a snapshot of the players for faster fetch in the future.
+
+        Finished seasons are frozen (see TierHandler), those the snapshot holds already are kept as they are and only
+        the other seasons, the current one at least, are scraped again.
+
+        Squad pages are scraped by batches of checkpoint_units (season, club) units, each batch is committed to a
+        progress journal (see JournalHandler). An interrupted run resumes from its last committed batch when run
+        again, the snapshot is written and the journal cleared once every unit is scraped.
+
+        :param list[int] season_years: Specify the seasons, defaults to every season since 2000
+        :param bool incremental: Specify to keep the frozen seasons of the snapshot, False scrapes every season again
+        :param int checkpoint_units: Specify the number of squad pages scraped between two checkpoints
+        :param int max_workers: Specify the number of squad pages fetched at once
+        :param bool pipeline: Specify to scrape the squad pages through PipelineHandler, fetching and parsing them
+            side by side, the checkpoints being batches of checkpoint_units units
         """
-        players = SoccerScraper.scrap_players(fast_fetch_clubs=True)
 
-        f = open('cached_clubs.csv', "w+")
-        f.write(f'# Timestamp: {datetime.datetime.utcnow()}\n')
-        f.close()
+        if season_years is None:
+            season_years = list(range(2000, TierHandler.get_current_season() + 1))
+
+        cached = None
+        if incremental:
+            try:
+                cached = SoccerScraper.__get_cached_players()
+            except FileNotFoundError:
+                cached = None
 
-        # noinspection PyTypeChecker
-        players.to_csv('cached_players.csv', mode='a')
+        cached_season_years = [] if cached is None else cached['YEAR'].dropna().unique()
+        frozen, refresh = TierHandler.split_seasons(season_years, cached_season_years)
+
+        players = pd.DataFrame()
+        if refresh:
+            def get_key(unit):
+                return int(unit[0]), unit[1].league.url, unit[1].club_id
+
+            units = SoccerScraper.__get_player_units(refresh, fast_fetch_clubs=True)
+            done = JournalHandler.get_done('soccer', 'players')
+            units = [x for x in units if get_key(x) not in done]
+
+            def commit(batch):
+                JournalHandler.commit('soccer', 'players', [get_key(x) for x, _ in batch],
+                                      SoccerScraper.__build_players_frame([x for _, x in batch]).reset_index())
+
+            if pipeline:
+                PipelineHandler.run('soccer', 'players', units, commit, fetch_workers=max_workers,
+                                    batch_size=checkpoint_units)
+                units = []
+
+            for i in range(0, len(units), checkpoint_units):
+                batch = units[i:i + checkpoint_units]
+                units_players = ConcurrencyHandler.map_threaded(SoccerScraper.__scrap_club_season_players, batch,
+                                                                max_workers)
+                commit(list(zip(batch, units_players)))
+
+            players = JournalHandler.read('soccer', 'players')
+            if len(players) != 0:
+                # Seasons committed by an earlier run of different seasons
+                players = players[players['YEAR'].isin(refresh)]
+
+        if cached is not None:
+            cached = cached[~cached['YEAR'].isin(refresh)]
+            players = pd.concat([cached.astype(object), players.astype(object)], ignore_index=True)
+
+        SnapshotHandler.write('soccer', 'players', players)
+        JournalHandler.clear('soccer', 'players')
 
     @staticmethod
-    def scrap_players(season_years=None, leagues=None, clubs=None, fast_fetch_clubs=False, fast_fetch=False):
+    def scrap_players(season_years=None, leagues=None, clubs=None, fast_fetch_clubs=False, fast_fetch=False,
+                      max_workers=8, shard_index=0, shard_count=1):
         """
         Scraps data containing information about club's players.
 
@@ -225,6 +312,9 @@ class SoccerScraper:
         :param list[str] clubs: Specify the desired club(s)
         :param bool fast_fetch_clubs: Retrieves clubs from a saved snapshot instantly
         :param bool fast_fetch: Retrieves players from a saved snapshot instantly
+        :param int max_workers: Specify the number of squad pages fetched at once
+        :param int shard_index: Specify which shard of the season x club matrix to scrap, from 0 to shard_count - 1
+        :param int shard_count: Specify the number of shards the season x club matrix is split into
         :return: A dataframe containing club players
         """
 
@@ -239,22 +329,98 @@ class SoccerScraper:
             return df
 
         else:
-            return SoccerScraper.__scrap_players(season_years, leagues, clubs, fast_fetch_clubs)
+            return SoccerScraper.__scrap_players(season_years, leagues, clubs, fast_fetch_clubs,
+                                                 max_workers, shard_index, shard_count)
 
     @staticmethod
-    def __scrap_players(season_years=None, leagues=None, clubs=None, fast_fetch_clubs=False):
+    def __get_squad_url(season_year, club):
         """
-        Scraps data containing information about club's players.
+        Builds the url of a club's squad page for a season.
+
+        :param int season_year: Specify the season
+        :param Club club: Specify the club
+        :return: The squad page url
+        """
+
+        return f'https://www.espn.com/soccer/team/squad/_/' \
+               f'id/{club.club_id}/' \
+               f'league/{club.league.url}/' \
+               f'season/{season_year}'
+
+    @staticmethod
+    def fetch_club_season_players(unit):
+        """
+        Fetches a club's squad page for a season, the fetch stage of the ('soccer', 'players') pipeline.
+
+        :param tuple unit: Specify the (season_year, club) pair
+        :return: The raw squad page
+        """
+
+        season_year, club = unit
+
+        return HttpHandler.get(SoccerScraper.__get_squad_url(season_year, club)).content
+
+    @staticmethod
+    def parse_club_season_players(unit, page):
+        """
+        Parses a club's squad page for a season, the parse stage of the ('soccer', 'players') pipeline.
+
+        :param tuple unit: Specify the (season_year, club) pair
+        :param str page: Specify the squad page
+        :return: A list of goalkeeper rows and a list of outfield player rows
+        """
+
+        season_year, club = unit
+        players = ([], [])
+
+        document = ParserHandler.parse(page, tables_only=True)
+        tables = document.select('table.Table')
+
+        if not tables or len(tables) != 2:
+            return players
+
+        for x in np.arange(0, 2):
+            rows = tables[x].select('tr')
+            for row in rows:
+                cols = row.select('td')
+                cols = [ele.text.strip() for ele in cols]  # Strips elements
+                if cols:  # If column is not empty
+                    buff = [club.league.name, club.name, str(season_year)] + \
+                           [ele for ele in cols if ele]  # If element is not empty
+                    buff.insert(4, np.nan)  # Player's number, split from the name once the frame is built
+                    players[x].append(buff)
+
+        return players
+
+    @staticmethod
+    def __scrap_club_season_players(unit):
+        """
+        Scraps a club's squad for a season.
+
+        :param tuple unit: Specify the (season_year, club) pair
+        :return: A list of goalkeeper rows and a list of outfield player rows
+        """
+
+        return SoccerScraper.parse_club_season_players(
+            unit, ParseExecutor.decode(SoccerScraper.fetch_club_season_players(unit)))
+
+    @staticmethod
+    def __get_player_units(season_years=None, leagues=None, clubs=None, fast_fetch_clubs=False,
+                           shard_index=0, shard_count=1):
+        """
+        Lists the (season, club) squad pages to scrap.
 
         :param list[int] season_years: Collect the data from the provided year(s)
         :param list[str] leagues: Specify the desired league(s)
         :param list[str] clubs: Specify the desired club(s)
         :param bool fast_fetch_clubs: Retrieves clubs from a saved snapshot instantly
-        :return: A dataframe containing club players
+        :param int shard_index: Specify which shard of the season x club matrix to scrap, from 0 to shard_count - 1
+        :param int shard_count: Specify the number of shards the season x club matrix is split into
+        :return: A list of (season_year, club) pairs
         """
 
         if (season_years is None) or (len(season_years) == 0):
-            season_years = np.arange(2000, 2022)
+            season_years = np.arange(2000, TierHandler.get_current_season() + 1)
 
         scraped_leagues = SoccerScraper.scrap_leagues()
         if (leagues is not None) and (len(leagues) != 0):
@@ -269,302 +435,368 @@ class SoccerScraper:
             scraped_clubs = list(
                 filter(lambda x: x.name in clubs and x.league.name in [x.name for x in scraped_leagues], scraped_clubs))
 
-        if not all(isinstance(x, np.int32) or isinstance(x, int) for x in season_years):
+        if not all(isinstance(x, np.integer) or isinstance(x, int) for x in season_years):
             raise ValueError('season_year must be a list of integer')
         if clubs is not None and not all(isinstance(x, str) for x in clubs):
             raise ValueError('clubs must be a list of string')
         if leagues is not None and not all(isinstance(x, str) for x in leagues):
             raise ValueError('leagues must be a list of string')
 
-        players_df_goalkeeper = pd.DataFrame()
+        if shard_count < 1 or not 0 <= shard_index < shard_count:
+            raise ValueError('shard_index must be between 0 and shard_count - 1')
 
-        players_df_player = pd.DataFrame()
-        # processed = 0
-        for season_year in season_years:
-            for club in scraped_clubs[50:100]:
-                # print(ProgressHandler.show_progress(processed,
-                #                                     len(season_years) * len(scraped_clubs)))
-                # processed += 1
-                # Partially prevents scraping detection
-                headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 6.0; WOW64; rv:24.0) Gecko/20100101 Firefox/24.0'}
-                res = requests.get(
-                    f'https://www.espn.com/soccer/team/squad/_/'
-                    f'id/{club.club_id}/'
-                    f'league/{club.league.url}/'
-                    f'season/{season_year}',
-                    headers=headers)
-
-                soup = bs4.BeautifulSoup(res.text, 'html.parser')
-                tables = soup.find_all('table', attrs={'class': 'Table'})
-
-                if not tables or len(tables) != 2:
-                    continue
-
-                for x in np.arange(0, 2):
-                    data = []
-                    rows = tables[x].find_all('tr')
-                    for row in rows:
-                        cols = row.find_all('td')
-                        cols = [ele.text.strip() for ele in cols]  # Strips elements
-                        if cols:  # If column is not empty
-                            buff = [club.league.name, club.name, str(season_year)] + \
-                                   [ele for ele in cols if ele]  # If element is not empty
-                            number_list = re.findall(r'\d+$', buff[3])
-                            if number_list:  # Checks if there is a number for the player
-                                buff.insert(4, number_list[0])  # Extract player's number
-                                buff[3] = re.findall(r'^([^0-9]*)', buff[3])[0]  # Remove player's name number
-                            else:
-                                buff.insert(4, np.nan)
-                            data.append([buff])
-                    data_df = pd.DataFrame(data[0])
-                    # print(data)
-                    if x == 0:
-                        players_df_goalkeeper = pd.concat([players_df_goalkeeper,data_df], ignore_index=True)
-                        
-                    else:
-                        players_df_player =  pd.concat([players_df_goalkeeper,data_df], ignore_index=True)
+        units = [(season_year, club) for season_year in season_years for club in scraped_clubs]
+        units = units[shard_index::shard_count]
 
-        if players_df_goalkeeper.empty:
-            players_df_goalkeeper = pd.DataFrame(np.empty((0, 19)))
+        return ConcurrencyHandler.interleave(units, lambda x: HttpHandler.get_host(SoccerScraper.__get_squad_url(*x)))
 
-        if players_df_player.empty:
-            players_df_player = pd.DataFrame(np.empty((0, 20)))
+    @staticmethod
+    def __build_players_frame(units_players):
+        """
+        Builds the players frame out of scraped squads.
 
-        players_df_goalkeeper.columns = ['LEAGUE', 'CLUB', 'YEAR', 'NAME', 'NUM', 'POS', 'AGE', 'HT', 'WT', 'NAT',
-                                            'APP', 'SUB',
-                                            'SV', 'GA', 'A',
-                                            'FC', 'FA', 'YC', 'RC']
-        players_df_player.columns = ['LEAGUE', 'CLUB', 'YEAR', 'NAME', 'NUM', 'POS', 'AGE', 'HT', 'WT', 'NAT', 'APP',
-                                        'SUB',
-                                        'G', 'A', 'SH', 'ST',
-                                        'FC', 'FA', 'YC', 'RC']
+        :param list[tuple] units_players: Specify the goalkeeper rows and outfield player rows of every squad
+        :return: A dataframe containing club players
+        """
 
-        df = pd.concat([players_df_goalkeeper,players_df_player])
-        df = df.replace(r'^\s*$', np.nan, regex=True) \
-            .replace('--', np.nan) \
-            .reset_index(drop=True)
+        goalkeepers = RowAccumulator(['LEAGUE', 'CLUB', 'YEAR', 'NAME', 'NUM', 'POS', 'AGE', 'HT', 'WT', 'NAT',
+                                      'APP', 'SUB',
+                                      'SV', 'GA', 'A',
+                                      'FC', 'FA', 'YC', 'RC'])
+        players = RowAccumulator(['LEAGUE', 'CLUB', 'YEAR', 'NAME', 'NUM', 'POS', 'AGE', 'HT', 'WT', 'NAT', 'APP',
+                                  'SUB',
+                                  'G', 'A', 'SH', 'ST',
+                                  'FC', 'FA', 'YC', 'RC'])
 
-        df['WT'] = df['WT'].apply(lambda x: x if (pd.isnull(x)) else int(x.split(" ")[0]) / 2.205)
-        df['HT'] = df['HT'].apply(
-            lambda x: x
-            if (pd.isnull(x)) else
-            int(x.split("'")[0]) * 30.48 +
-            int(x.split("'")[1].split("\"")[0]) * 2.54
-        )
+        for unit_goalkeepers, unit_players in units_players:
+            goalkeepers.extend(unit_goalkeepers)
+            players.extend(unit_players)
 
-        cols = df.columns.drop(['LEAGUE', 'CLUB', 'NAME', 'POS', 'NAT'])
-        df[cols] = df[cols].apply(pd.to_numeric)
+        df = pd.concat([goalkeepers.to_frame(), players.to_frame()], ignore_index=True)
+        df['NAME'], df['NUM'] = NormalizationHandler.split_number(df['NAME'])
+        df = NormalizationHandler.normalize_players(df, df.columns.drop(['LEAGUE', 'CLUB', 'NAME', 'POS', 'NAT']))
 
         df.set_index(['LEAGUE', 'CLUB', 'YEAR', 'NAME'], inplace=True)
 
-        # ProgressHandler.reset_progress()
         return df
 
     @staticmethod
-    def __get_cached_matches():
+    def iter_players(season_years=None, leagues=None, clubs=None, fast_fetch_clubs=False, max_workers=8,
+                     shard_index=0, shard_count=1):
         """
-        Retrieves the match's snapshot.
+        Scraps data containing information about club's players squad by squad, yielding each (season, club) squad
+        as soon as it is parsed. Up to max_workers squad pages are fetched at once and only a few more are held in
+        memory, whatever the size of the season x club matrix.
+
+        :param list[int] season_years: Collect the data from the provided year(s)
+        :param list[str] leagues: Specify the desired league(s)
+        :param list[str] clubs: Specify the desired club(s)
+        :param bool fast_fetch_clubs: Retrieves clubs from a saved snapshot instantly
+        :param int max_workers: Specify the number of squad pages fetched at once
+        :param int shard_index: Specify which shard of the season x club matrix to scrap, from 0 to shard_count - 1
+        :param int shard_count: Specify the number of shards the season x club matrix is split into
+        :return: A generator of dataframes, one per squad with players
+        """
+
+        units = SoccerScraper.__get_player_units(season_years, leagues, clubs, fast_fetch_clubs,
+                                                 shard_index, shard_count)
+
+        for unit_players in ConcurrencyHandler.imap_threaded(SoccerScraper.__scrap_club_season_players, units,
+                                                             max_workers):
+            if unit_players[0] or unit_players[1]:
+                yield SoccerScraper.__build_players_frame([unit_players])
+
+    @staticmethod
+    def __scrap_players(season_years=None, leagues=None, clubs=None, fast_fetch_clubs=False,
+                        max_workers=8, shard_index=0, shard_count=1):
+        """
+        Scraps data containing information about club's players, collects iter_players into a single frame.
+
+        Every (season, club) squad page is a unit of work, units are split into shard_count shards so that
+        different processes or machines can scrap the matrix side by side.
+
+        :param list[int] season_years: Collect the data from the provided year(s)
+        :param list[str] leagues: Specify the desired league(s)
+        :param list[str] clubs: Specify the desired club(s)
+        :param bool fast_fetch_clubs: Retrieves clubs from a saved snapshot instantly
+        :param int max_workers: Specify the number of squad pages fetched at once
+        :param int shard_index: Specify which shard of the season x club matrix to scrap, from 0 to shard_count - 1
+        :param int shard_count: Specify the number of shards the season x club matrix is split into
+        :return: A dataframe containing club players
         """
 
-        matches = pd.read_csv('cached_matches.csv', skiprows=1, dtype={'date': object,
-                                                                       'club1': str,
-                                                                       'SCORE': str,
-                                                                       'club2': str,
-                                                                       'DURATION': str,
-                                                                       'LOCATION': str,
-                                                                       'ATTENDANCE': str,
-                                                                       'TIME': str,
-                                                                       'TV': np.float})
+        frames = list(SoccerScraper.iter_players(season_years, leagues, clubs, fast_fetch_clubs, max_workers,
+                                                 shard_index, shard_count))
+        if not frames:
+            return SoccerScraper.__build_players_frame([])
 
-        matches['ATTENDANCE'] = pd.to_numeric(matches['ATTENDANCE'].str.replace(',', ''), downcast='integer')
-        matches['date'] = pd.to_datetime(matches['date']).dt.date
+        return pd.concat(frames)
+
+    @staticmethod
+    def __get_cached_matches(start_date=None, end_date=None):
+        """
+        Retrieves the match's snapshot, reading only its months overlapping the given dates.
+
+        :param datetime.date start_date: Specify the start date of the search
+        :param datetime.date end_date: Specify the end date of the search
+        """
+
+        matches = SnapshotHandler.read_range('soccer', 'matches', start_date, end_date, legacy_csv='cached_matches.csv')
+        matches['date'] = matches['date'].dt.date
 
         return matches
 
     @staticmethod
-    def cache_matches():
+    def cache_matches(start_date=None, end_date=None, incremental=True, checkpoint_days=31, pipeline=False,
+                      concurrency=8):
         """
         Collects a snapshot of the matches for faster fetch in the future.
+
+        Only the days the snapshot is missing, or whose games were not settled when they were scraped, are scraped
+        and merged into it (see SnapshotHandler.merge_partitioned), a daily refresh scrapes a day or two. Days older
+        than TierHandler's horizon are frozen, they are never scraped again once in the snapshot.
+
+        Days are scraped and merged by ranges of up to checkpoint_days days, the snapshot's manifest recording the
+        merged days acts as the progress journal: an interrupted run resumes from its last merged range when run
+        again. Days whose page failed to be fetched are not recorded, the next run scrapes them again.
+
+        :param datetime.date start_date: Specify the first day of the snapshot, defaults to 2002-10-01
+        :param datetime.date end_date: Specify the last day of the snapshot, defaults to today
+        :param bool incremental: Specify to scrape the missing days only, False scrapes every day again
+        :param int checkpoint_days: Specify the number of days scraped between two checkpoints
+        :param bool pipeline: Specify to scrape the days through PipelineHandler, fetching and parsing them side by
+            side, the checkpoints being batches of checkpoint_days days
+        :param int concurrency: Specify the number of days fetched at once, see iter_matches
         """
 
-        matches = SoccerScraper.scrap_matches(start_date=datetime.date(2002, 10, 1),
-                                              end_date=datetime.date(2022, 5, 29))
+        if start_date is None:
+            start_date = datetime.date(2002, 10, 1)
+        if end_date is None:
+            end_date = datetime.date.today()
 
-        f = open('cached_matches.csv', "w+")
-        f.write(f'# Timestamp: {datetime.datetime.utcnow()}\n')
-        f.close()
+        if incremental:
+            days = SnapshotHandler.get_missing_days('soccer', 'matches', start_date, end_date,
+                                                    TierHandler.get_horizon())
+        else:
+            days = [start_date + datetime.timedelta(days=x) for x in range((end_date - start_date).days + 1)]
 
-        # noinspection PyTypeChecker
-        matches.to_csv('cached_matches.csv', index=False, mode='a')
+        if pipeline:
+            PipelineHandler.run('soccer', 'matches', [x.strftime('%Y%m%d') for x in days],
+                                lambda x: PipelineHandler.write_days(
+                                    'soccer', 'matches', x, lambda rows: SoccerScraper.__build_matches_frame([rows])),
+                                batch_size=checkpoint_days)
+            return
+
+        for first_day, last_day in DateTimeHandler.get_ranges(days, checkpoint_days):
+            days_data = list(SoccerScraper.__iter_days_data(DateTimeHandler.get_dates_between(first_day, last_day),
+                                                            concurrency=concurrency))
+            scraped = [DateTimeHandler.year_month_day_to_date(x).date() for x, data in days_data if data is not None]
+
+            matches = SoccerScraper.__build_matches_frame([data for x, data in days_data if data])
+            SnapshotHandler.merge_partitioned('soccer', 'matches', matches, first_day, last_day, scraped)
 
     @staticmethod
-    def scrap_matches(start_date=None, end_date=None, fast_fetch=False):
+    def scrap_matches(start_date=None, end_date=None, fast_fetch=False, concurrency=None):
         """
         Scraps data containing information about the results of the matches.
 
         :param datetime.date start_date: Specify the start date of the search
         :param datetime.date end_date: Specify the end date of the search
         :param bool fast_fetch: Retrieves matches from a saved snapshot instantly
+        :param int concurrency: Fetches up to this many days at once, days are fetched one by one if None
         :return: An array of two dataframe containing match results (0: Elapsed, 1: Fixtures)
         """
 
         if fast_fetch:
-            df = SoccerScraper.__get_cached_matches()
-            if start_date is not None:
-                df = df[df.date >= start_date]
-            if end_date is not None:
-                df = df[df.date <= end_date]
-            return df
+            return SoccerScraper.__get_cached_matches(start_date, end_date)
 
         else:
-            return SoccerScraper.__scrap_matches(start_date, end_date)
+            return SoccerScraper.__scrap_matches(start_date, end_date, concurrency=concurrency)
 
     @staticmethod
-    def __scrap_matches(start_date=datetime.date.today() - datetime.timedelta(days=7),
-                        end_date=datetime.date.today(),
-                        request_tries=8):
+    def fetch_matches_day(singleDay, request_tries=8):
         """
-        Scraps data containing information about the results of the matches.
+        Fetches the fixtures page of a single day, the fetch stage of the ('soccer', 'matches') pipeline.
 
-        :param datetime.date start_date: Specify the start date of the search
-        :param datetime.date end_date: Specify the end date of the search
+        :param str singleDay: Specify the day in YYYYmmDD format
         :param int request_tries: Determine to number of tries for each webpage request whenever it fails
-        :return: An array of two dataframe containing match results (0: Elapsed, 1: Fixtures)
+        :return: The raw fixtures page, None if it failed to be fetched
         """
-        
-        if start_date > end_date:
-            raise ValueError('start_date cannot be less than end_date')
 
-        if end_date > datetime.date.today():
-            raise ValueError('start_date cannot be less than end_date')
-        
-        elapsed_matches_df = pd.DataFrame()
-        fixtures_list_df = pd.DataFrame()
+        try:
+            res = HttpHandler.get(
+                f'https://www.espn.in/football/fixtures/_/'
+                f'date/{singleDay}',
+                retry_if=lambda x: b'Error404__Title' in x.content,
+                tries=request_tries + 1)
+        except requests.RequestException:
+            return None
 
-        processed = 0
+        if res.status_code != 200 or b'Error404__Title' in res.content:
+            print('giving up...')
+            return None
 
-        days_between = DateTimeHandler.get_dates_between(start_date, end_date)
+        return res.content
 
-        for singleDay in days_between:
-            data = []
-            # print(ProgressHandler.show_progress(processed, len(days_between)))
-            processed += 1
-            # Partially prevents scraping detection
-            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 6.0; WOW64; rv:24.0) Gecko/20100101 Firefox/24.0'}
-            res = requests.get(
-                f'https://www.espn.in/football/fixtures/_/'
-                f'date/{singleDay}',
-                headers=headers)
-            soup = bs4.BeautifulSoup(res.text, 'html.parser')
-            tables = soup.find_all('tbody')
-
-            tries = 0
-            while soup.find('h1', {'class': 'Error404__Title'}) is not None and tries < request_tries:
-                print(f'try {tries + 1}')
-                tries += 1
-                headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 6.0; WOW64; rv:24.0) Gecko/20100101 Firefox/24.0'}
-                res = requests.get(
-                    f'https://www.espn.in/football/fixtures/_/'
-                    f'date/{singleDay}',
-                    headers=headers)
-                soup = bs4.BeautifulSoup(res.text, 'html.parser')
-                tables = soup.find_all('tbody')
-
-            if tries == request_tries:
-                print('giving up...')
-
-            if not tables:
-                continue
-            
-            
-            print(f'https://www.espn.in/football/fixtures/_/'
-                    f'date/{singleDay}')
-            
-            for table in tables:
-                rows = table.find_all('tr')
-                for row in rows:
-                    cols = row.find_all('td')
-                    if cols:  # If column is not empty
-                        arr = [DateTimeHandler.year_month_day_to_date(singleDay)]
-                        for col in np.arange(0, len(cols)):
-                            if cols[col].find('small'):
-                                continue
-                            if col == 0:
-                                club1 = cols[col].find('span').text
-                                
-                                
-                                arr.append(club1)
-                                
-                            elif col == 1:
-                                result = cols[col].find_all('a')[0].text
-                                arr.append(result)
-                                club2 = cols[col].find_all('span')[-1].text
-                                arr.append(club2)
-                            elif col == 2:
-                                if cols[col].get('data-date'):
-                                    date = datetime.datetime.strptime(cols[col].get('data-date'), '%Y-%m-%dT%H:%MZ')
-                                    arr.append('{:d}:{:02d}'.format(date.hour, date.minute))
-                                else:
-                                    arr.append(cols[col].find('a').text)
+    @staticmethod
+    def parse_matches_day(singleDay, page):
+        """
+        Parses the fixtures page of a single day, the parse stage of the ('soccer', 'matches') pipeline.
+
+        :param str singleDay: Specify the day in YYYYmmDD format
+        :param str page: Specify the fixtures page
+        :return: A list of match rows
+        """
+
+        data = []
+
+        if 'Error404__Title' in page:
+            print('giving up...')
+            return data
+
+        # The fixtures are read through their tbody elements, keep every table whatever its class
+        document = ParserHandler.parse(page, tables_only=True, by_tag=True)
+        tables = document.select('tbody')
+
+        if not tables:
+            return data
+
+        for table in tables:
+            rows = table.select('tr')
+            for row in rows:
+                cols = row.select('td')
+                if cols:  # If column is not empty
+                    arr = [DateTimeHandler.year_month_day_to_date(singleDay)]
+                    for col in np.arange(0, len(cols)):
+                        if cols[col].select_one('small'):
+                            continue
+                        if col == 0:
+                            club1 = cols[col].select_one('span').text
+                            arr.append(club1)
+                        elif col == 1:
+                            result = cols[col].select('a')[0].text
+                            arr.append(result)
+                            club2 = cols[col].select('span')[-1].text
+                            arr.append(club2)
+                        elif col == 2:
+                            if cols[col].get('data-date'):
+                                date = datetime.datetime.strptime(cols[col].get('data-date'), '%Y-%m-%dT%H:%MZ')
+                                arr.append('{:d}:{:02d}'.format(date.hour, date.minute))
                             else:
-                                arr.append(cols[col].text)
-                        data.append(arr)
-
-            data = list(filter(lambda x: len(x) != 1, data))
-            elapsed_matches_list = list(filter(lambda x: x[4] != 'LIVE' or ':' not in x[4], data))
-            fixtures_list =   list(filter(lambda x: x[4] == 'LIVE' or ':' in x[4], data))
-            elapsed_matches_list_df = pd.DataFrame(elapsed_matches_list)
-            # elapsed_matches_list_df = elapsed_matches_list_df.dropna(axis=1, how="all")
-            fixtures_df = pd.DataFrame(fixtures_list)
-            print(elapsed_matches_list_df)
-            #print(fixtures_df)
-            elapsed_matches_df = pd.concat([elapsed_matches_df, elapsed_matches_list_df], ignore_index=True)
-            fixtures_list_df = pd.concat([fixtures_list_df, fixtures_df], ignore_index=True)
-
-        if elapsed_matches_df.empty:
-            elapsed_matches_df = pd.DataFrame(np.empty((0, 7)))
-        if fixtures_list_df.empty:
-            fixtures_list_df = pd.DataFrame(np.empty((0, 6)))
-            
-        
-        #print(elapsed_matches_df)
-
-        if len(fixtures_list_df) != 0:
-            elapsed_matches_df = elapsed_matches_df.drop(elapsed_matches_df.columns[7], axis=1)
-        
-        
-        elapsed_matches_df.columns = ['date', 'club1', 'SCORE', 'club2', 'DURATION', 'LOCATION', 'ATTENDANCE']
-        
-        # if len(fixtures_list_df) != 0:
-        #     fixtures_list_df = fixtures_list_df.drop(fixtures_list_df.columns[4], axis=1)
-        #     fixtures_list_df.columns = ['date', 'club1', 'SCORE', 'club2', 'TIME', 'LOCATION', 'TV']
-
-        # df = pd.concat([elapsed_matches_df, fixtures_list_df])
-
-        # df = df.replace(r'^\s*$', np.nan, regex=True) \
-        #     .replace('--', np.nan) \
-        #     .fillna(value=np.nan) \
-        #     .dropna(thresh=3) \
-        #     .reset_index(drop=True)
-
-        # df = df.replace(r'^\s*$', np.nan, regex=True) \
-        #     .replace('--', np.nan) \
-        #     .fillna(value=np.nan) \
-        #     .dropna(thresh=3) \
-        #     .reset_index(drop=True)
-        
-        
-        elapsed_matches_df = elapsed_matches_df.replace(r'^\s*$', np.nan, regex=True) \
-            .replace('--', np.nan) \
-            .fillna(value=np.nan) \
-            .dropna(thresh=3) \
-            .reset_index(drop=True)
+                                arr.append(cols[col].select_one('a').text)
+                        else:
+                            arr.append(cols[col].text)
+                    data.append(arr)
+
+        return list(filter(lambda x: len(x) != 1, data))
+
+    @staticmethod
+    def __scrap_matches_day(singleDay, request_tries=8):
+        """
+        Scraps the matches played on a single day.
+
+        :param str singleDay: Specify the day in YYYYmmDD format
+        :param int request_tries: Determine to number of tries for each webpage request whenever it fails
+        :return: A list of match rows, None if the page failed to be fetched
+        """
+
+        page = SoccerScraper.fetch_matches_day(singleDay, request_tries)
+        if page is None:
+            return None
+
+        return SoccerScraper.parse_matches_day(singleDay, ParseExecutor.decode(page))
 
-        elapsed_matches_df = elapsed_matches_df.replace(r'^\s*$', np.nan, regex=True) \
+    @staticmethod
+    def __iter_days_data(days_between, request_tries=8, concurrency=None):
+        """
+        Scraps the matches of the given days on a single pool of concurrency threads (see
+        ConcurrencyHandler.imap_threaded).
+
+        :param list[str] days_between: Specify the days in YYYYmmDD format
+        :param int request_tries: Determine to number of tries for each webpage request whenever it fails
+        :param int concurrency: Fetches up to this many days at once, days are fetched one by one if None
+        :return: A generator of (day in YYYYmmDD format, match rows) tuples, in the order of the days, the rows being
+            None for the days that failed to be fetched
+        """
+
+        return zip(days_between, ConcurrencyHandler.imap_threaded(
+            lambda x: SoccerScraper.__scrap_matches_day(x, request_tries), days_between, concurrency or 1))
+
+    @staticmethod
+    def __build_matches_frame(days_data):
+        """
+        Builds a matches frame out of scraped days.
+
+        :param list[list] days_data: Specify the match rows of every day
+        :return: A dataframe containing the results of the elapsed matches, with their parsed scores
+            (see ScoreHandler.parse_scores)
+        """
+
+        # Rows of elapsed matches carry an extra cell when the day also has fixtures, it is truncated away
+        elapsed_matches = RowAccumulator(['date', 'club1', 'SCORE', 'club2', 'DURATION', 'LOCATION', 'ATTENDANCE'])
+
+        for data in days_data:
+            elapsed_matches.extend(filter(lambda x: x[4] != 'LIVE' or ':' not in x[4], data))
+
+        elapsed_matches_df = elapsed_matches.to_frame() \
+            .replace(r'^\s*$', np.nan, regex=True) \
             .replace('--', np.nan) \
             .fillna(value=np.nan) \
             .dropna(thresh=3) \
             .reset_index(drop=True)
 
-        #ProgressHandler.reset_progress()
-        return elapsed_matches_df
+        return ScoreHandler.parse_scores(elapsed_matches_df)
+
+    @staticmethod
+    def iter_matches(start_date=None, end_date=None, request_tries=8, concurrency=None):
+        """
+        Scraps data containing information about the results of the matches day by day, yielding each day's matches
+        as soon as they are parsed. Days are fetched by a single pool of concurrency threads (see
+        ConcurrencyHandler.imap_threaded), a slow day only holds back the days after it and only a few more days than
+        concurrency are held in memory.
+
+        :param datetime.date start_date: Specify the start date of the search, defaults to a week ago
+        :param datetime.date end_date: Specify the end date of the search, defaults to today
+        :param int request_tries: Determine to number of tries for each webpage request whenever it fails
+        :param int concurrency: Fetches up to this many days at once, days are fetched one by one if None
+        :return: A generator of dataframes, one per day with elapsed matches
+        """
+
+        if start_date is None:
+            start_date = datetime.date.today() - datetime.timedelta(days=7)
+        if end_date is None:
+            end_date = datetime.date.today()
+
+        if start_date > end_date:
+            raise ValueError('start_date cannot be less than end_date')
+
+        if end_date > datetime.date.today():
+            raise ValueError('start_date cannot be less than end_date')
+
+        days_between = DateTimeHandler.get_dates_between(start_date, end_date)
+
+        for day, data in SoccerScraper.__iter_days_data(days_between, request_tries, concurrency):
+            if not data:
+                continue
+            df = SoccerScraper.__build_matches_frame([data])
+            if len(df) != 0:
+                yield df
+
+    @staticmethod
+    def __scrap_matches(start_date=None, end_date=None, request_tries=8, concurrency=None):
+        """
+        Scraps data containing information about the results of the matches, collects iter_matches into a single
+        frame.
+
+        :param datetime.date start_date: Specify the start date of the search, defaults to a week ago
+        :param datetime.date end_date: Specify the end date of the search, defaults to today
+        :param int request_tries: Determine to number of tries for each webpage request whenever it fails
+        :param int concurrency: Fetches up to this many days at once, days are fetched one by one if None
+        :return: A dataframe containing the results of the elapsed matches
+        """
+
+        frames = list(SoccerScraper.iter_matches(start_date, end_date, request_tries, concurrency))
+        if not frames:
+            return SoccerScraper.__build_matches_frame([])
+
+        return pd.concat(frames, ignore_index=True)
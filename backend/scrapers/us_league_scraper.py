@@ -0,0 +1,838 @@
+import datetime
+
+import pandas as pd
+import requests
+from helpers.concurrency_handler import ConcurrencyHandler
+from helpers.date_time_handler import DateTimeHandler
+from helpers.http_handler import HttpHandler
+from helpers.normalization_handler import NormalizationHandler
+from helpers.parse_executor import ParseExecutor
+from helpers.parser_handler import ParserHandler
+from helpers.pipeline_handler import PipelineHandler
+from helpers.roster_handler import RosterHandler
+from helpers.row_accumulator import RowAccumulator
+from helpers.score_handler import ScoreHandler
+from helpers.scoreboard_handler import ScoreboardHandler
+from helpers.snapshot_handler import SnapshotHandler
+from helpers.tier_handler import TierHandler
+from models.club import Club
+
+
+def _get_salary(athlete):
+    salary = (athlete.get('contract') or {}).get('salary')
+    return f'${salary:,}' if salary else None
+
+
+def _get_experience(athlete):
+    experience = (athlete.get('experience') or {}).get('years')
+    return None if experience is None else 'R' if experience == 0 else str(experience)
+
+
+# Cells of a roster api player row, in the format of the roster pages
+_ROSTER_FIELDS = {
+    'name': lambda x: x.get('displayName'),
+    'position': lambda x: RosterHandler.get_abbreviation(x, 'position'),
+    'age': lambda x: x.get('age'),
+    'height': RosterHandler.get_height,
+    'weight': RosterHandler.get_weight,
+    'college': lambda x: (x.get('college') or {}).get('name'),
+    'salary': _get_salary,
+    'experience': _get_experience,
+    'bats': lambda x: RosterHandler.get_abbreviation(x, 'bats'),
+    'throws': lambda x: RosterHandler.get_abbreviation(x, 'throws'),
+    'hand': lambda x: RosterHandler.get_abbreviation(x, 'hand'),
+    'birth_place': RosterHandler.get_birth_place,
+    'birth_date': RosterHandler.get_birth_date,
+}
+
+
+def _get_winner_leader(event, name):
+    winner, _ = ScoreboardHandler.get_winner(event)
+    return None if winner is None else ScoreboardHandler.get_leader(winner, name)
+
+
+def _get_loser_leader(event, name):
+    _, loser = ScoreboardHandler.get_winner(event)
+    return None if loser is None else ScoreboardHandler.get_leader(loser, name)
+
+
+def _get_attendance(event, name):
+    attendance = event['competitions'][0].get('attendance')
+    return f'{attendance:,}' if attendance else ''
+
+
+# Cells of a scoreboard api match row following its result, in the format of the schedule pages
+_SCOREBOARD_FIELDS = {
+    'winner_leader': _get_winner_leader,
+    'loser_leader': _get_loser_leader,
+    'leader': ScoreboardHandler.get_leader,
+    'featured_athlete': ScoreboardHandler.get_featured_athlete,
+    'note': lambda event, name: ScoreboardHandler.get_note(event),
+    'attendance': _get_attendance,
+}
+
+
+class USLeagueScraper:
+    """
+    Scraping engine shared by the US leagues, driven by the declarative spec of each league. A league is a subclass
+    setting spec, every method runs on the subclass it is called from, e.g. NBAScraper.scrap_matches().
+
+    A spec is a dict with the keys:
+        sport                 ESPN sport of the league, e.g. 'basketball'
+        league                ESPN slug of the league, e.g. 'nba', also naming its snapshots (see SnapshotHandler)
+        schedule_url          Url of the schedule page of a day, formatted with day in YYYYmmDD format
+        legacy_csv            Dict of the legacy CSV caches keyed by entity ('clubs', 'players' and 'matches')
+        player_columns        Columns of a player row, a roster page row being the row minus its first cell
+        numeric_columns       Player columns converted to numbers, HT and WT are always converted
+        roster_fields         Cells of a roster api player row, keys of _ROSTER_FIELDS or 'group'
+        roster_groups         Dict of the roster api groups keyed by name, mapped to the 'group' cell
+        roster_tables         Groups of the tables of a roster page, in order, None for a league not appending any
+        match_columns         Columns of a match row
+        scoreboard_fields     (field, name) cells of a scoreboard api match row following its result, keys of
+                              _SCOREBOARD_FIELDS, e.g. ('winner_leader', 'points')
+        schedule_tables       Tables of a schedule page holding games, 'first' or 'all'
+        schedule_last_cell    Whether the last cell of a schedule page row (e.g. tickets) is kept
+        schedule_notes        Whether schedule page rows carry a game note, appended after their cells
+        date_format           Format of the DATE column, 'day' (YYYYmmDD) or 'title' (e.g. 'Thursday, October 10,
+                              2024', the title of the schedule page tables)
+
+    Attributes
+    ----------
+        spec         Declarative spec of the league
+        __clubs      Acts as a cache for storing club ids/names
+        __news       Acts as a cache for storing news
+
+    Methods
+    -------
+        __get_cached_clubs():
+            Retrieves the club's snapshot.
+        cache_clubs():
+            Collects a snapshot of the clubs for faster fetch in the future.
+        __get_clubs(fast_fetch=False):
+            Calls http://site.api.espn.com/apis/site/v2/sports/{sport}/{league}/teams to fetch all clubs ids.
+        get_clubs(fast_fetch=False):
+            Calls __get_clubs if __clubs is None, otherwise, it retrieves __clubs immediately.
+
+        __get_cached_players():
+            Retrieves the player's snapshot.
+        cache_players():
+            Collects a snapshot of the players for faster fetch in the future.
+        scrap_players(season_years=None, leagues=None, clubs=None, fast_fetch_clubs=False, fast_fetch=False,
+                      max_workers=8, source='json')
+            Scraps data containing information about club's players.
+        __get_roster_row(group, athlete):
+            Builds a player row from a roster api athlete.
+        fetch_club_players(club):
+            Fetches the roster page of a single club.
+        parse_club_players(club, page):
+            Parses the roster page of a single club.
+        __scrap_club_players(club):
+            Scraps the roster of a single club.
+        __scrap_club_rows(club, source='json'):
+            Scraps the roster of a single club, from the roster api or its roster page.
+        __build_players_frame(rows):
+            Builds a players frame out of scraped player rows.
+        iter_players(clubs=None, fast_fetch_clubs=False, max_workers=8, source='json'):
+            Scraps data containing information about club's players club by club.
+        __scrap_players(clubs=None, fast_fetch_clubs=False, max_workers=8, source='json'):
+            Scraps data containing information about club's players.
+
+        __get_cached_matches(start_date=None, end_date=None):
+            Retrieves the match's snapshot.
+        cache_matches(start_date=None, end_date=None, incremental=True, checkpoint_days=31, pipeline=False):
+            Collects a snapshot of the matches for faster fetch in the future.
+        scrap_matches(start_date=None, end_date=None, fast_fetch=False, source='json', request_tries=None):
+            Scraps data containing information about the results of the matches.
+        __format_date(date):
+            Formats a date as the DATE column of the league.
+        __get_scoreboard_row(event):
+            Builds a match row from a scoreboard api game.
+        fetch_matches_day(singleDay, request_tries=None):
+            Fetches the schedule page of a single day.
+        parse_matches_day(singleDay, page):
+            Parses the schedule page of a single day.
+        __scrap_matches_day(singleDay, request_tries=None):
+            Scraps the matches of a single day from its schedule page.
+        __build_matches_frame(rows, clubs):
+            Builds a matches frame out of scraped match rows.
+        __iter_days_rows(days_between, source='json', request_tries=None):
+            Scraps the matches of the given days.
+        iter_matches(start_date=None, end_date=None, source='json', request_tries=None):
+            Scraps data containing information about the results of the matches day by day.
+        __scrap_matches(start_date=None, end_date=None, request_tries=None, source='json'):
+            Scraps data containing information about the results of the matches.
+
+        get_formatted_news(fast_fetch=False, refresh=False):
+            Retrieves the league's news articles.
+        get_news_images(fast_fetch=False):
+            Retrieves the images of the league's news articles.
+        get_news_categories(fast_fetch=False):
+            Retrieves the categories of the league's news articles.
+    """
+
+    spec = None
+
+    __clubs = None
+    __news = None
+
+    @classmethod
+    def __get_cached_clubs(cls):
+        """
+        Retrieves the club's snapshot.
+        """
+
+        league = cls.spec['league']
+        df = SnapshotHandler.read(league, 'clubs', legacy_csv=cls.spec['legacy_csv']['clubs'])
+
+        return [Club(x['club_id'], x['club_name'], x.get('club_slug'), x.get('club_abbreviation'),
+                     x.get('club_display_name'), x.get('club_short_display_name'), x.get('club_location'),
+                     x.get('league') or league, x.get('players_url')) for x in SnapshotHandler.to_records(df)]
+
+    @classmethod
+    def cache_clubs(cls):
+        """
+        Collects a snapshot of the clubs for faster fetch in the future.
+        """
+
+        clubs = cls.get_clubs()
+
+        data = {
+            'club_id': [x.club_id for x in clubs],
+            'club_name': [x.name for x in clubs],
+            'club_slug': [x.slug for x in clubs],
+            'club_abbreviation': [x.abbreviation for x in clubs],
+            'club_display_name': [x.display_name for x in clubs],
+            'club_short_display_name': [x.short_display_name for x in clubs],
+            'club_location': [x.location for x in clubs],
+            'league': [cls.spec['league'] for x in clubs],
+            'players_url': [x.players_url for x in clubs],
+        }
+
+        SnapshotHandler.write(cls.spec['league'], 'clubs', pd.DataFrame(data))
+
+    @classmethod
+    def __get_clubs(cls, fast_fetch=False):
+        """
+        Calls http://site.api.espn.com/apis/site/v2/sports/{sport}/{league}/teams to fetch all clubs ids.
+
+        :param bool fast_fetch: Retrieves clubs from a saved snapshot instantly
+        :return: A list of clubs object
+        """
+
+        clubs = []
+
+        response = HttpHandler.get(f'http://site.api.espn.com/apis/site/v2/sports/'
+                                   f'{cls.spec["sport"]}/{cls.spec["league"]}/teams')
+
+        for club in response.json()['sports'][0]['leagues'][0]['teams']:
+            team = club['team']
+            link = club['team']['links']
+            if len(link) != 0:
+                href = club['team']['links'][1]['href']
+            else:
+                href = None
+            clubs.append(Club(team['id'], team['name'], team['slug'], team['abbreviation'], team['displayName'],
+                              team['shortDisplayName'], team['location'], cls.spec['league'], href))
+
+        return clubs
+
+    @classmethod
+    def get_clubs(cls, fast_fetch=False):
+        """
+        Calls __get_clubs if __clubs is None, otherwise, it retrieves __clubs immediately.
+
+        :param bool fast_fetch: Retrieves clubs from a saved snapshot instantly
+        :return: A list of clubs object
+        """
+
+        if cls.__clubs is None:
+            print('Fetching clubs, this is a one time process...')
+            cls.__clubs = cls.__get_clubs(fast_fetch=fast_fetch)
+            print('Received clubs\n')
+
+        return cls.__clubs.copy()
+
+    @classmethod
+    def __get_cached_players(cls):
+        """
+        Retrieves the player's snapshot.
+        """
+
+        players = SnapshotHandler.read(cls.spec['league'], 'players', legacy_csv=cls.spec['legacy_csv']['players'])
+
+        return players
+
+    @classmethod
+    def cache_players(cls):
+        """
+        Collects a snapshot of the players for faster fetch in the future.
+        """
+
+        players = cls.scrap_players(fast_fetch_clubs=False)
+
+        SnapshotHandler.write(cls.spec['league'], 'players', players)
+
+    @classmethod
+    def scrap_players(cls, season_years=None, leagues=None, clubs=None, fast_fetch_clubs=False, fast_fetch=False,
+                      max_workers=8, source='json'):
+        """
+        Scraps data containing information about club's players.
+
+        :param list[int] season_years: Collect the data from the provided year(s)
+        :param list[str] leagues: Specify the desired league(s)
+        :param list[str] clubs: Specify the desired club(s)
+        :param bool fast_fetch_clubs: Retrieves clubs from a saved snapshot instantly
+        :param bool fast_fetch: Retrieves players from a saved snapshot instantly
+        :param int max_workers: Specify the number of club rosters fetched at once
+        :param str source: Specify where rosters are read from, 'json' (roster api, falling back to the roster pages
+            for the clubs it fails to serve) or 'html' (roster pages only)
+        :return: A dataframe containing club players
+        """
+
+        if fast_fetch:
+            df = cls.__get_cached_players()
+            if clubs is not None:
+                df = df[df.CLUB.isin(clubs)]
+            return df
+
+        else:
+            return cls.__scrap_players(clubs, fast_fetch_clubs, max_workers, source)
+
+    @classmethod
+    def __get_roster_row(cls, group, athlete):
+        """
+        Builds a player row from a roster api athlete, with the same columns as the roster pages.
+
+        :param str group: Specify the roster group of the athlete, None if the league does not split its rosters
+        :param dict athlete: Specify the athlete
+        :return: A player row
+        """
+
+        return [cls.spec['roster_groups'].get(group, group) if x == 'group' else _ROSTER_FIELDS[x](athlete)
+                for x in cls.spec['roster_fields']]
+
+    @classmethod
+    def fetch_club_players(cls, club):
+        """
+        Fetches the roster page of a single club, the fetch stage of the players pipeline.
+
+        :param Club club: Specify the club
+        :return: The raw roster page, None if the club has none
+        """
+
+        if club.players_url is None:
+            return None
+
+        res = HttpHandler.get(club.players_url)
+        if res.status_code != 200:  # Also the case of pages missing from the archive in replay mode
+            return None
+
+        return res.content
+
+    @classmethod
+    def parse_club_players(cls, club, page):
+        """
+        Parses the roster page of a single club, the parse stage of the players pipeline. The rows of each table are
+        tagged with the group the spec's roster_tables gives it, tables past those of the spec are ignored.
+
+        :param Club club: Specify the club
+        :param str page: Specify the roster page
+        :return: A list of player rows
+        """
+
+        data = []
+        document = ParserHandler.parse(page, tables_only=True)
+        tables = document.select('table.Table')
+
+        for table, group in zip(tables, cls.spec['roster_tables']):
+            for row in table.select('tr'):
+                cols = [ele.text.strip() for ele in row.select('td')]  # Strips elements
+                if len(cols) != 0:
+                    if group is not None:
+                        cols.append(group)
+                    data.append(cols[1:])
+
+        return data
+
+    @classmethod
+    def __scrap_club_players(cls, club):
+        """
+        Scraps the roster of a single club.
+
+        :param Club club: Specify the club
+        :return: A list of player rows
+        """
+
+        page = cls.fetch_club_players(club)
+        if page is None:
+            return []
+
+        return cls.parse_club_players(club, ParseExecutor.decode(page))
+
+    @classmethod
+    def __scrap_club_rows(cls, club, source='json'):
+        """
+        Scraps the roster of a single club, from the roster api when source is 'json', falling back to its roster page
+        if the api fails to serve it.
+
+        :param Club club: Specify the club
+        :param str source: Specify where the roster is read from, 'json' or 'html'
+        :return: A list of (player row, [athlete id, source]) pairs
+        """
+
+        if source == 'json':
+            roster = RosterHandler.get_roster(cls.spec['sport'], cls.spec['league'], club)
+            if roster is not None:
+                return [(cls.__get_roster_row(group, athlete), [athlete.get('id'), 'json'])
+                        for group, athlete in roster]
+
+        return [(row, [None, 'html']) for row in cls.__scrap_club_players(club)]
+
+    @classmethod
+    def __build_players_frame(cls, rows):
+        """
+        Builds a players frame out of scraped player rows.
+
+        :param list[tuple] rows: Specify the (player row, [athlete id, source]) pairs
+        :return: A dataframe containing club players
+        """
+
+        players = RowAccumulator(cls.spec['player_columns'] + ['ATHLETE_ID', 'SOURCE'])
+        for row, tail in rows:
+            players.append(row, tail)
+
+        return NormalizationHandler.normalize_players(players.to_frame(), cls.spec['numeric_columns'])
+
+    @classmethod
+    def iter_players(cls, clubs=None, fast_fetch_clubs=False, max_workers=8, source='json'):
+        """
+        Scraps data containing information about club's players club by club, yielding each club's players as soon
+        as they are parsed. Up to max_workers rosters are fetched at once and only a few more are held in memory,
+        whatever the number of clubs.
+
+        :param list[str] clubs: Specify the desired club(s), by name, display name or abbreviation, e.g. Celtics,
+            Boston Celtics or BOS
+        :param bool fast_fetch_clubs: Retrieves clubs from a saved snapshot instantly
+        :param int max_workers: Specify the number of club rosters fetched at once
+        :param str source: Specify where rosters are read from, 'json' (roster api, falling back to the roster pages
+            for the clubs it fails to serve) or 'html' (roster pages only)
+        :return: A generator of dataframes, one per club with players
+        """
+
+        if source not in ('json', 'html'):
+            raise ValueError("source must be 'json' or 'html'")
+
+        if clubs is not None and not all(isinstance(x, str) for x in clubs):
+            raise ValueError('clubs must be a list of string')
+
+        if fast_fetch_clubs:
+            scraped_clubs = cls.__get_cached_clubs()
+        else:
+            scraped_clubs = cls.get_clubs()
+
+        if (clubs is not None) and (len(clubs) != 0):
+            scraped_clubs = list(filter(
+                lambda x: x.name in clubs or x.display_name in clubs or x.abbreviation in clubs, scraped_clubs))
+
+        for club_rows in ConcurrencyHandler.imap_threaded(lambda x: cls.__scrap_club_rows(x, source),
+                                                          scraped_clubs, max_workers):
+            if club_rows:
+                yield cls.__build_players_frame(club_rows)
+
+    @classmethod
+    def __scrap_players(cls, clubs=None, fast_fetch_clubs=False, max_workers=8, source='json'):
+        """
+        Scraps data containing information about club's players, collects iter_players into a single frame.
+
+        :param list[str] clubs: Specify the desired club(s)
+        :param bool fast_fetch_clubs: Retrieves clubs from a saved snapshot instantly
+        :param int max_workers: Specify the number of club rosters fetched at once
+        :param str source: Specify where rosters are read from, 'json' or 'html'
+        :return: A dataframe containing club players
+        """
+
+        frames = list(cls.iter_players(clubs, fast_fetch_clubs, max_workers, source))
+        if not frames:
+            return cls.__build_players_frame([])
+
+        return pd.concat(frames, ignore_index=True)
+
+    @classmethod
+    def __get_cached_matches(cls, start_date=None, end_date=None):
+        """
+        Retrieves the match's snapshot, reading only its months overlapping the given dates.
+
+        :param datetime.date start_date: Specify the start date of the search
+        :param datetime.date end_date: Specify the end date of the search
+        """
+
+        matches = SnapshotHandler.read_range(cls.spec['league'], 'matches', start_date, end_date,
+                                             legacy_csv=cls.spec['legacy_csv']['matches'])
+        matches['DATE'] = matches['DATE'].dt.date
+
+        return matches
+
+    @classmethod
+    def cache_matches(cls, start_date=None, end_date=None, incremental=True, checkpoint_days=31, pipeline=False):
+        """
+        Collects a snapshot of the matches for faster fetch in the future.
+
+        Only the days the snapshot is missing, or whose games were not settled when they were scraped, are scraped
+        and merged into it (see SnapshotHandler.merge_partitioned), a daily refresh scrapes a day or two. Days older
+        than TierHandler's horizon are frozen, they are never scraped again once in the snapshot.
+
+        Days are scraped and merged by ranges of up to checkpoint_days days, the snapshot's manifest recording the
+        merged days acts as the progress journal: an interrupted run resumes from its last merged range when run
+        again. Days whose page failed to be fetched are not recorded, the next run scrapes them again.
+
+        :param datetime.date start_date: Specify the first day of the snapshot, defaults to 2002-10-01
+        :param datetime.date end_date: Specify the last day of the snapshot, defaults to today
+        :param bool incremental: Specify to scrape the missing days only, False scrapes every day again
+        :param int checkpoint_days: Specify the number of days scraped between two checkpoints
+        :param bool pipeline: Specify to scrape the schedule pages through PipelineHandler, fetching and parsing them
+            side by side, the checkpoints being batches of checkpoint_days days
+        """
+
+        league = cls.spec['league']
+        if start_date is None:
+            start_date = datetime.date(2002, 10, 1)
+        if end_date is None:
+            end_date = datetime.date.today()
+
+        if incremental:
+            days = SnapshotHandler.get_missing_days(league, 'matches', start_date, end_date,
+                                                    TierHandler.get_horizon())
+        else:
+            days = [start_date + datetime.timedelta(days=x) for x in range((end_date - start_date).days + 1)]
+
+        if pipeline:
+            clubs = cls.get_clubs()
+            PipelineHandler.run(league, 'matches', [x.strftime('%Y%m%d') for x in days],
+                                lambda x: PipelineHandler.write_days(
+                                    league, 'matches', x,
+                                    lambda rows: cls.__build_matches_frame([(y, 'html') for y in rows], clubs)),
+                                batch_size=checkpoint_days)
+            return
+
+        clubs = cls.get_clubs()
+        for first_day, last_day in DateTimeHandler.get_ranges(days, checkpoint_days):
+            rows, scraped = [], []
+            for day, day_rows in cls.__iter_days_rows(DateTimeHandler.get_dates_between(first_day, last_day)):
+                if day_rows is not None:
+                    rows += day_rows
+                    scraped.append(DateTimeHandler.year_month_day_to_date(day).date())
+
+            SnapshotHandler.merge_partitioned(league, 'matches', cls.__build_matches_frame(rows, clubs),
+                                              first_day, last_day, scraped)
+
+    @classmethod
+    def scrap_matches(cls, start_date=None, end_date=None, fast_fetch=False, source='json', request_tries=None):
+        """
+        Scraps data containing information about the results of the matches.
+
+        :param datetime.date start_date: Specify the start date of the search
+        :param datetime.date end_date: Specify the end date of the search
+        :param bool fast_fetch: Retrieves matches from a saved snapshot instantly
+        :param str source: Specify where matches are read from, 'json' (scoreboard api, falling back to the schedule
+            pages for the days it fails to serve) or 'html' (schedule pages only)
+        :param int request_tries: Determine to number of tries for each schedule page request whenever it fails,
+            defaults to RateLimitHandler.max_tries
+        :return: A dataframe containing match results
+        """
+
+        if fast_fetch:
+            return cls.__get_cached_matches(start_date, end_date)
+
+        else:
+            return cls.__scrap_matches(start_date, end_date, request_tries, source)
+
+    @classmethod
+    def __format_date(cls, date):
+        """
+        Formats a date as the DATE column of the league.
+
+        :param datetime.date date: Specify the date
+        :return: The date in YYYYmmDD format, or as a schedule page table title
+        """
+
+        if cls.spec['date_format'] == 'title':
+            return f'{date:%A}, {date:%B} {date.day}, {date.year}'
+
+        return date.strftime('%Y%m%d')
+
+    @classmethod
+    def __get_scoreboard_row(cls, event):
+        """
+        Builds a match row from a scoreboard api game, with the same columns as the schedule pages.
+
+        :param dict event: Specify the event
+        :return: A match row
+        """
+
+        away, home = ScoreboardHandler.get_competitors(event)
+        date = ScoreboardHandler.get_local_date(event)
+
+        row = [away['team']['location'], f'@  {home["team"]["location"]}', ScoreboardHandler.get_result(event)] + \
+              [_SCOREBOARD_FIELDS[field](event, name) for field, name in cls.spec['scoreboard_fields']] + \
+              [cls.__format_date(date)]
+
+        return row
+
+    @classmethod
+    def fetch_matches_day(cls, singleDay, request_tries=None):
+        """
+        Fetches the schedule page of a single day, the fetch stage of the matches pipeline.
+
+        :param str singleDay: Specify the day in YYYYmmDD format
+        :param int request_tries: Determine to number of tries for each webpage request whenever it fails, defaults
+            to RateLimitHandler.max_tries
+        :return: The raw schedule page, None if it failed to be fetched
+        """
+
+        try:
+            response = HttpHandler.get(cls.spec['schedule_url'].format(day=singleDay), tries=request_tries)
+        except requests.RequestException:
+            return None
+
+        return response.content if response.status_code == 200 else None
+
+    @classmethod
+    def parse_matches_day(cls, singleDay, page):
+        """
+        Parses the schedule page of a single day, the parse stage of the matches pipeline.
+
+        :param str singleDay: Specify the day in YYYYmmDD format
+        :param str page: Specify the schedule page
+        :return: A list of match rows
+        """
+
+        data = []
+        document = ParserHandler.parse(page, tables_only=True)
+        tables = document.select('table.Table')
+
+        if cls.spec['schedule_tables'] == 'first':
+            tables = tables[:1]
+
+        for table in tables:
+            # Find the previous sibling with the class "table_name"
+            title = table.find_previous('Table__Title')
+            previous = None if title is None else title.text.strip()
+
+            for row in table.select('tr'):
+                cells = row.select('td')
+                if len(cells) == 0:
+                    continue
+
+                cols = [ele.text.strip() for ele in cells]  # Strips elements
+                if cls.spec['schedule_notes']:
+                    team = cells[0].select_one('.matchTeams')
+                    note = cells[0].select_one('.gameNote.pt3')
+                    if team is not None:
+                        cols[0] = team.text
+
+                if not cls.spec['schedule_last_cell']:
+                    cols = cols[:-1]
+                if cls.spec['schedule_notes']:
+                    cols.append(None if note is None else note.text)
+                cols.append(previous if cls.spec['date_format'] == 'title' else singleDay)
+                data.append(cols)
+
+        return data
+
+    @classmethod
+    def __scrap_matches_day(cls, singleDay, request_tries=None):
+        """
+        Scraps the matches of a single day from its schedule page.
+
+        :param str singleDay: Specify the day in YYYYmmDD format
+        :param int request_tries: Determine to number of tries for each webpage request whenever it fails
+        :return: A list of match rows, None if the page failed to be fetched
+        """
+
+        page = cls.fetch_matches_day(singleDay, request_tries)
+        if page is None:
+            return None
+
+        return cls.parse_matches_day(singleDay, ParseExecutor.decode(page))
+
+    @classmethod
+    def __build_matches_frame(cls, rows, clubs):
+        """
+        Builds a matches frame out of scraped match rows.
+
+        :param list[tuple] rows: Specify the (match row, source) pairs
+        :param list[Club] clubs: Specify the clubs of the league
+        :return: A dataframe containing match results, with their parsed scores (see ScoreHandler.parse_results)
+        """
+
+        matches = RowAccumulator(cls.spec['match_columns'] + ['SOURCE'])
+        for row, source in rows:
+            matches.append(row, [source])
+
+        return ScoreHandler.parse_results(matches.to_frame(), clubs)
+
+    @classmethod
+    def __iter_days_rows(cls, days_between, source='json', request_tries=None):
+        """
+        Scraps the matches of the given days by windows of ScoreboardHandler.days_per_request *
+        ScoreboardHandler.max_workers days, from the scoreboard api, those it fails to serve from their schedule page.
+
+        :param list[str] days_between: Specify the days in YYYYmmDD format, ascending
+        :param str source: Specify where matches are read from, 'json' or 'html'
+        :param int request_tries: Determine to number of tries for each schedule page request whenever it fails
+        :return: A generator of (day in YYYYmmDD format, (match row, source) pairs) tuples, ascending, the pairs being
+            None for the days that failed to be fetched
+        """
+
+        window = ScoreboardHandler.days_per_request * ScoreboardHandler.max_workers
+
+        for i in range(0, len(days_between), window):
+            days = days_between[i:i + window]
+            days_rows = {x: [] for x in days}
+            html_days = days
+
+            if source == 'json':
+                events, html_days = ScoreboardHandler.get_events(cls.spec['sport'], cls.spec['league'], days)
+                for event in events:
+                    day = ScoreboardHandler.get_local_date(event).strftime('%Y%m%d')
+                    days_rows.setdefault(day, []).append((cls.__get_scoreboard_row(event), 'json'))
+
+            for singleDay in html_days:
+                rows = cls.__scrap_matches_day(singleDay, request_tries)
+                days_rows[singleDay] = None if rows is None else days_rows[singleDay] + [(x, 'html') for x in rows]
+
+            yield from sorted(days_rows.items())
+
+    @classmethod
+    def iter_matches(cls, start_date=None, end_date=None, source='json', request_tries=None):
+        """
+        Scraps data containing information about the results of the matches day by day, yielding each day's matches
+        as soon as they are parsed.
+
+        Days are read by windows of ScoreboardHandler.days_per_request * ScoreboardHandler.max_workers days, from the
+        scoreboard api, those it fails to serve from their schedule page, only a window is held in memory.
+
+        :param datetime.date start_date: Specify the start date of the search, defaults to a week ago
+        :param datetime.date end_date: Specify the end date of the search, defaults to today
+        :param str source: Specify where matches are read from, 'json' or 'html'
+        :param int request_tries: Determine to number of tries for each schedule page request whenever it fails
+        :return: A generator of dataframes, one per day with matches, with their parsed scores
+        """
+
+        if source not in ('json', 'html'):
+            raise ValueError("source must be 'json' or 'html'")
+
+        if start_date is None:
+            start_date = datetime.date.today() - datetime.timedelta(days=7)
+        if end_date is None:
+            end_date = datetime.date.today()
+
+        days_between = DateTimeHandler.get_dates_between(start_date, end_date)
+        clubs = cls.get_clubs()
+
+        for day, rows in cls.__iter_days_rows(days_between, source, request_tries):
+            if rows:
+                yield cls.__build_matches_frame(rows, clubs)
+
+    @classmethod
+    def __scrap_matches(cls, start_date=None, end_date=None, request_tries=None, source='json'):
+        """
+        Scraps data containing information about the results of the matches, collects iter_matches into a single
+        frame.
+
+        :param datetime.date start_date: Specify the start date of the search, defaults to a week ago
+        :param datetime.date end_date: Specify the end date of the search, defaults to today
+        :param int request_tries: Determine to number of tries for each webpage request whenever it fails
+        :param str source: Specify where matches are read from, 'json' or 'html'
+        :return: A dataframe containing match results, with their parsed scores (see ScoreHandler.parse_results)
+        """
+
+        frames = list(cls.iter_matches(start_date, end_date, source, request_tries))
+        if not frames:
+            return cls.__build_matches_frame([], cls.get_clubs())
+
+        return pd.concat(frames, ignore_index=True)
+
+    @classmethod
+    def __get_formatted_news(cls):
+        response = HttpHandler.get(f'http://site.api.espn.com/apis/site/v2/sports/'
+                                   f'{cls.spec["sport"]}/{cls.spec["league"]}/news')
+
+        articles = response.json()['articles']
+        formated_articles = []
+        for article in articles:
+            formated_article = {}
+            formated_article['type'] = article['type']
+            formated_article['headline'] = article['headline']
+            formated_article['description'] = article['description']
+            formated_article['lastModified'] = article['lastModified']
+            formated_article['published'] = article['published']
+            formated_article['dataSourceIdentifier'] = article['dataSourceIdentifier']
+            formated_article['links'] = article['links']['web']['href']
+
+            c = []
+            for r in article['categories']:
+                if r['type'] != 'guid':
+                    d = {}
+                    d['type'] = r['type']
+                    d['desc'] = r['description']
+                    c.append(d)
+
+            formated_article['categories'] = c
+
+            try:
+                formated_article['images'] = article['images']
+            except KeyError:
+                formated_article['images'] = []
+
+            formated_articles.append(formated_article)
+
+        return formated_articles
+
+    @classmethod
+    def get_formatted_news(cls, fast_fetch=False, refresh=False):
+        """
+        Retrieves the league's news articles, fetched once per process unless refreshed.
+
+        :param bool fast_fetch: Unused, kept for compatibility
+        :param bool refresh: Fetches the articles again, get_news_images and get_news_categories then read them
+        :return: A list of articles
+        """
+
+        if cls.__news is None or refresh:
+            print('Fetching news, this is a one time process...')
+            cls.__news = cls.__get_formatted_news()
+            print('Received news\n')
+        return cls.__news
+
+    @classmethod
+    def get_news_images(cls, fast_fetch=False):
+        all_imgs = []
+        for artic in cls.__news:
+            id = artic['dataSourceIdentifier']
+
+            for im in artic['images']:
+                img = {}
+                img['name'] = im['name']
+                img['credit'] = im.get('credit', '')
+                img['caption'] = im.get('caption', '')
+                img['height'] = im.get('height', '')
+                img['width'] = im.get('width', '')
+                img['url'] = im['url']
+                img['article_id'] = id
+                all_imgs.append(img)
+        df = pd.DataFrame(all_imgs)
+        return df
+
+    @classmethod
+    def get_news_categories(cls, fast_fetch=False):
+        all_categs = []
+        for artic in cls.__news:
+            for cat in artic['categories']:
+                categ = {}
+                categ['type'] = cat['type']
+                categ['description'] = cat['desc']
+                categ['article_id'] = artic['dataSourceIdentifier']
+                all_categs.append(categ)
+        df = pd.DataFrame(all_categs)
+        return df
@@ -0,0 +1,63 @@
+import os
+import sys
+
+import pytest
+import requests
+
+# The scrapers and helpers are imported from the backend directory, as main.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from helpers.archive_handler import ArchiveHandler  # noqa: E402
+from helpers.cache_handler import CacheHandler  # noqa: E402
+from helpers.congestion_handler import CongestionHandler  # noqa: E402
+from helpers.http_handler import HttpHandler  # noqa: E402
+from helpers.rate_limit_handler import RateLimitHandler  # noqa: E402
+
+
+def make_response(status=200, content=b'', headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = content
+    response.headers.update(headers or {})
+    return response
+
+
+class FakeSession:
+    """Session answering with the queued replies, responses or exceptions, then with empty 200 responses."""
+
+    def __init__(self):
+        self.replies = []
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        self.requests.append((url, dict(headers or {})))
+        reply = self.replies.pop(0) if self.replies else make_response()
+        if isinstance(reply, BaseException):
+            raise reply
+        reply.url = url
+        return reply
+
+
+@pytest.fixture
+def session(tmp_path, monkeypatch):
+    """Sends HttpHandler's requests to a FakeSession, with fresh limiter, cache and archive state."""
+
+    fake = FakeSession()
+    monkeypatch.setattr(HttpHandler, 'get_session', staticmethod(lambda: fake))
+    monkeypatch.setattr(HttpHandler, 'use_cache', False)
+    monkeypatch.setattr(HttpHandler, 'use_archive', False)
+    monkeypatch.setattr(HttpHandler, 'replay', False)
+    monkeypatch.setattr(RateLimitHandler, 'backoff_base', 0.001)
+
+    cache_directory, archive_directory = CacheHandler.directory, ArchiveHandler.directory
+    CacheHandler.configure(directory=str(tmp_path / 'http'))
+    ArchiveHandler.configure(directory=str(tmp_path / 'archive'))
+    RateLimitHandler.configure()
+    CongestionHandler.configure()
+
+    yield fake
+
+    CacheHandler.configure(directory=cache_directory)
+    ArchiveHandler.configure(directory=archive_directory)
+    RateLimitHandler.configure()
+    CongestionHandler.configure()
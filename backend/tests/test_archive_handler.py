@@ -0,0 +1,108 @@
+import multiprocessing
+import os
+
+import pytest
+
+from conftest import make_response
+from helpers.archive_handler import ArchiveHandler
+from helpers.http_handler import HttpHandler
+from helpers.parse_executor import ParseExecutor
+
+
+@pytest.fixture
+def archive(tmp_path):
+    directory, segment_bytes = ArchiveHandler.directory, ArchiveHandler.segment_bytes
+    ArchiveHandler.configure(directory=str(tmp_path / 'archive'))
+    yield tmp_path / 'archive'
+    ArchiveHandler.configure(directory=directory, segment_bytes=segment_bytes)
+
+
+def append_pages(directory, name, count):
+    """Appends pages from a shard process."""
+
+    ArchiveHandler.configure(directory=directory, segment_bytes=64)
+    for i in range(count):
+        ArchiveHandler.append(f'https://example.com/{name}/{i}', make_response(content=f'{name} {i}'.encode() * 8))
+
+
+def test_round_trip(archive):
+    response = make_response(content='<p>Café</p>'.encode('utf-8'),
+                             headers={'Content-Type': 'text/html; charset=utf-8'})
+    ArchiveHandler.append('https://example.com/page', response)
+    ArchiveHandler.close()
+
+    page = ArchiveHandler.read('https://example.com/page')
+
+    assert page.status_code == 200
+    assert page.text == '<p>Café</p>'
+    assert page.headers['Content-Type'] == 'text/html; charset=utf-8'
+    assert ArchiveHandler.read('https://example.com/other') is None
+
+
+def test_read_at(archive):
+    ArchiveHandler.append('https://example.com/page', make_response(content=b'first'))
+    ArchiveHandler.append('https://example.com/page', make_response(content=b'second'))
+    first, second = ArchiveHandler.get_entries('https://example.com/page')
+
+    assert ArchiveHandler.read('https://example.com/page').content == b'second'
+    assert ArchiveHandler.read('https://example.com/page', at=first['fetched_at']).content == b'first'
+    assert ArchiveHandler.read('https://example.com/page', at=first['fetched_at'] - 1) is None
+
+
+def test_segments_roll_over(archive):
+    ArchiveHandler.configure(segment_bytes=16)
+    for i in range(3):
+        ArchiveHandler.append(f'https://example.com/{i}', make_response(content=os.urandom(32)))
+
+    assert [ArchiveHandler.get_entries(f'https://example.com/{i}')[0]['segment'] for i in range(3)] == [0, 1, 2]
+
+
+def test_interrupted_append_is_ignored(archive):
+    ArchiveHandler.append('https://example.com/page', make_response(content=b'page'))
+    with open(archive / 'index.jsonl', 'a', encoding='utf-8') as f:
+        f.write('{"url": "https://example.com/cut"')
+    ArchiveHandler.close()
+
+    assert ArchiveHandler.read('https://example.com/page').content == b'page'
+    assert ArchiveHandler.get_entries('https://example.com/cut') == []
+
+    # The next append replaces the partial entry
+    ArchiveHandler.append('https://example.com/next', make_response(content=b'next'))
+    ArchiveHandler.close()
+
+    assert ArchiveHandler.read('https://example.com/next').content == b'next'
+
+
+def test_shards_share_a_directory(archive):
+    context = multiprocessing.get_context(ParseExecutor.start_method)
+    processes = [context.Process(target=append_pages, args=(str(archive), f'shard{x}', 20)) for x in range(2)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    ArchiveHandler.close()
+
+    for name in ['shard0', 'shard1']:
+        assert [ArchiveHandler.read(f'https://example.com/{name}/{i}').content for i in range(20)] == \
+               [f'{name} {i}'.encode() * 8 for i in range(20)]
+
+
+def test_replay_reads_the_archive_only(session, archive, monkeypatch):
+    monkeypatch.setattr(HttpHandler, 'use_archive', True)
+    session.replies = [make_response(content=b'live'), make_response(status=500)]
+    HttpHandler.get('https://example.com/page')
+    HttpHandler.get('https://example.com/error', tries=1)
+
+    with HttpHandler.replaying():
+        hit = HttpHandler.get('https://example.com/page')
+        miss = HttpHandler.get('https://example.com/never')
+        error = HttpHandler.get('https://example.com/error')
+
+    assert hit.content == b'live'
+    # Only pages served with a 200 status are archived
+    assert (miss.status_code, miss.content) == (error.status_code, error.content) == (404, b'')
+    assert len(session.requests) == 2
+
+
+def test_archive_is_off_by_default():
+    assert HttpHandler.use_archive is False
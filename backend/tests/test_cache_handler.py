@@ -0,0 +1,92 @@
+import datetime
+import time
+
+import pytest
+
+from conftest import make_response
+from helpers.cache_handler import CacheHandler
+from helpers.http_handler import HttpHandler
+
+URL = 'https://site.api.espn.com/apis/site/v2/sports/basketball/nba/teams'
+
+
+@pytest.fixture
+def cache(session, monkeypatch):
+    monkeypatch.setattr(HttpHandler, 'use_cache', True)
+    return session
+
+
+def test_fresh_responses_are_served_from_the_cache(cache):
+    cache.replies = [make_response(content=b'teams')]
+
+    first = HttpHandler.get(URL)
+    second = HttpHandler.get(URL)
+
+    assert first.content == second.content == b'teams'
+    assert len(cache.requests) == 1
+
+
+def test_refresh_ignores_the_cache(cache):
+    cache.replies = [make_response(content=b'old'), make_response(content=b'new')]
+
+    HttpHandler.get(URL)
+    HttpHandler.get(URL, refresh=True)
+
+    assert HttpHandler.get(URL).content == b'new'
+    assert len(cache.requests) == 2
+
+
+def test_expired_response_is_revalidated(cache, monkeypatch):
+    monkeypatch.setattr(CacheHandler, 'ttls', [])
+    monkeypatch.setattr(CacheHandler, 'default_ttl', 0)
+    cache.replies = [make_response(content=b'teams', headers={'ETag': '"v1"', 'Last-Modified': 'Mon, 07 Oct 2024'}),
+                     make_response(status=304)]
+
+    HttpHandler.get(URL)
+    response = HttpHandler.get(URL)
+
+    assert response.status_code == 200
+    assert response.content == b'teams'
+    assert cache.requests[1][1]['If-None-Match'] == '"v1"'
+    assert cache.requests[1][1]['If-Modified-Since'] == 'Mon, 07 Oct 2024'
+
+
+def test_expired_response_is_replaced(cache, monkeypatch):
+    monkeypatch.setattr(CacheHandler, 'ttls', [])
+    monkeypatch.setattr(CacheHandler, 'default_ttl', 0)
+    cache.replies = [make_response(content=b'old'), make_response(content=b'new')]
+
+    HttpHandler.get(URL)
+
+    assert HttpHandler.get(URL).content == b'new'
+    assert CacheHandler.lookup(URL)[0].content == b'new'
+
+
+def test_failed_responses_are_not_stored(cache):
+    cache.replies = [make_response(status=404)]
+
+    HttpHandler.get(URL)
+
+    assert CacheHandler.lookup(URL) == (None, False)
+
+
+def test_ttl_of_dated_urls():
+    url = 'https://www.espn.com/soccer/fixtures/_/date/20241005'
+    day = datetime.datetime(2024, 10, 5, 20).timestamp()
+
+    # Games of a day may be played or corrected until settle_days after it
+    assert CacheHandler.get_ttl(url, day) == CacheHandler.default_ttl
+    assert CacheHandler.get_ttl(url, day + 2 * 24 * 3600) is None
+    assert CacheHandler.get_ttl('https://site.api.espn.com/apis/site/v2/sports/football/nfl/news') == 15 * 60
+
+
+def test_least_recently_used_responses_are_evicted(cache, monkeypatch):
+    monkeypatch.setattr(CacheHandler, 'max_bytes', 10)
+    for name in ['a', 'b']:
+        CacheHandler.store(f'{URL}/{name}', make_response(content=b'12345'))
+    time.sleep(0.01)
+    CacheHandler.lookup(f'{URL}/a')
+
+    CacheHandler.store(f'{URL}/c', make_response(content=b'12345'))
+
+    assert [CacheHandler.lookup(f'{URL}/{x}')[0] is not None for x in ['a', 'b', 'c']] == [True, False, True]
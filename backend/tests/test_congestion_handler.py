@@ -0,0 +1,106 @@
+import threading
+
+import pytest
+import requests
+
+from helpers.congestion_handler import CongestionHandler
+from helpers.http_handler import HttpHandler
+
+
+@pytest.mark.parametrize('error', [requests.TooManyRedirects('loop'), requests.exceptions.ChunkedEncodingError('cut'),
+                                   requests.exceptions.InvalidURL('bad')], ids=lambda x: type(x).__name__)
+def test_unexpected_errors_release_the_host_slot(session, error):
+    session.replies = [error]
+
+    with pytest.raises(type(error)):
+        HttpHandler.get('https://example.com/page')
+
+    stats = CongestionHandler.get_stats()['example.com']
+    assert stats['in_flight'] == 0
+    assert stats['failures'] == 1
+
+
+def test_retry_if_raising_releases_the_host_slot(session):
+    def retry_if(response):
+        raise ValueError('broken check')
+
+    with pytest.raises(ValueError):
+        HttpHandler.get('https://example.com/page', retry_if=retry_if)
+
+    assert CongestionHandler.get_stats()['example.com']['in_flight'] == 0
+
+
+@pytest.fixture
+def congestion():
+    CongestionHandler.configure()
+    yield
+    CongestionHandler.configure()
+
+
+def send(host, latency=0.01, failed=False, count=1):
+    for _ in range(count):
+        CongestionHandler.acquire(host, 16)
+        CongestionHandler.release(host, latency, failed)
+
+
+def test_successes_increase_the_limit_by_one_per_round(congestion):
+    send('example.com', count=4)
+    assert CongestionHandler.get_limits()['example.com'] == 4
+
+    # Each success adds 1 / limit, the limit grows by one every limit successes
+    send('example.com', count=1)
+    assert CongestionHandler.get_limits()['example.com'] == 5
+    send('example.com', count=5)
+    assert CongestionHandler.get_limits()['example.com'] == 6
+    assert CongestionHandler.get_stats()['example.com']['peak_limit'] == 6
+
+
+def test_failures_halve_the_limit_once_per_round(congestion):
+    # Failures of the requests sent before a decrease report the same congestion
+    send('example.com', failed=True, count=3)
+    assert CongestionHandler.get_limits()['example.com'] == 4
+    send('example.com', failed=True, count=1)
+    assert CongestionHandler.get_limits()['example.com'] == 2
+    send('example.com', failed=True, count=4)
+    assert CongestionHandler.get_limits()['example.com'] == 1
+
+    stats = CongestionHandler.get_stats()['example.com']
+    assert (stats['requests'], stats['failures'], stats['congested']) == (8, 8, 0)
+
+
+def test_slow_requests_count_as_congestion(congestion):
+    send('example.com', latency=0.01, count=4)
+    send('example.com', latency=1.0, count=1)
+
+    stats = CongestionHandler.get_stats()['example.com']
+    assert stats['congested'] == 1
+    assert stats['limit'] == 2
+    # The usual latency is a moving average, a single slow request barely moves it
+    assert stats['latency'] == pytest.approx(0.9 * 0.01 + 0.1 * 1.0)
+
+
+def test_acquire_waits_for_a_free_slot(congestion):
+    CongestionHandler.configure(initial_limit=1)
+    CongestionHandler.acquire('example.com', 16)
+    acquired = threading.Event()
+
+    thread = threading.Thread(target=lambda: (CongestionHandler.acquire('example.com', 16), acquired.set()))
+    thread.start()
+    assert not acquired.wait(0.05)
+
+    CongestionHandler.release('example.com', 0.01, False)
+    assert acquired.wait(1)
+    thread.join()
+
+    # Hosts have limits of their own
+    send('other.com', count=1)
+    assert CongestionHandler.get_stats()['example.com']['in_flight'] == 1
+
+
+def test_limit_is_capped_by_max_limit(congestion):
+    for _ in range(20):
+        CongestionHandler.acquire('example.com', 5)
+        CongestionHandler.release('example.com', 0.01, False)
+    CongestionHandler.acquire('example.com', 5)
+
+    assert CongestionHandler.get_limits()['example.com'] == 5
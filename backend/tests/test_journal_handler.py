@@ -0,0 +1,58 @@
+import os
+
+import pandas as pd
+import pytest
+
+from helpers.journal_handler import JournalHandler
+from helpers.snapshot_handler import SnapshotHandler
+
+pytest.importorskip('pyarrow')
+
+
+@pytest.fixture
+def journal(tmp_path, monkeypatch):
+    monkeypatch.setattr(SnapshotHandler, 'directory', str(tmp_path / 'snapshots'))
+    return JournalHandler.get_directory('soccer', 'players')
+
+
+def players(club, year, names):
+    return pd.DataFrame({'LEAGUE': 'ENG.1', 'CLUB': club, 'YEAR': year, 'NAME': names})
+
+
+def test_commits_are_read_back(journal):
+    JournalHandler.commit('soccer', 'players', [(2024, 'eng.1', '359')], players('Arsenal', 2024, ['A', 'B']))
+    JournalHandler.commit('soccer', 'players', [(2024, 'eng.1', '1')], players('Empty', 2024, []))
+
+    assert JournalHandler.get_done('soccer', 'players') == {(2024, 'eng.1', '359'), (2024, 'eng.1', '1')}
+    assert JournalHandler.read('soccer', 'players')['NAME'].tolist() == ['A', 'B']
+
+
+def test_resume_after_an_interrupted_commit(journal):
+    JournalHandler.commit('soccer', 'players', [(2024, 'eng.1', '359')], players('Arsenal', 2024, ['A', 'B']))
+
+    # The run stops while committing its second batch, after writing the part but before its journal line ends
+    JournalHandler.commit('soccer', 'players', [(2024, 'eng.1', '364')], players('Liverpool', 2024, ['C']))
+    path = os.path.join(journal, 'journal.jsonl')
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(lines[0] + lines[1][:20])
+
+    assert JournalHandler.get_done('soccer', 'players') == {(2024, 'eng.1', '359')}
+    assert JournalHandler.read('soccer', 'players')['NAME'].tolist() == ['A', 'B']
+
+    # The next run scrapes the batch again, its line replaces the partial one and its part the orphan one
+    JournalHandler.commit('soccer', 'players', [(2024, 'eng.1', '364')], players('Liverpool', 2024, ['C', 'D']))
+
+    assert len(JournalHandler.get_done('soccer', 'players')) == 2
+    assert JournalHandler.read('soccer', 'players')['NAME'].tolist() == ['A', 'B', 'C', 'D']
+
+
+def test_clear(journal):
+    JournalHandler.commit('soccer', 'players', [(2024, 'eng.1', '359')], players('Arsenal', 2024, ['A']))
+
+    JournalHandler.clear('soccer', 'players')
+
+    assert not os.path.exists(journal)
+    assert JournalHandler.get_done('soccer', 'players') == set()
+    assert JournalHandler.read('soccer', 'players').empty
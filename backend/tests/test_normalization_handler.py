@@ -0,0 +1,50 @@
+import pandas as pd
+import pytest
+
+from helpers.normalization_handler import NormalizationHandler
+
+
+def test_clean_replaces_missing_values():
+    df = NormalizationHandler.clean(pd.DataFrame({'NAME': ['A', ' -- ', '', None], 'AGE': [20, 21, 22, 23]}))
+
+    assert df['NAME'].isna().tolist() == [False, True, True, True]
+    assert df['AGE'].tolist() == [20, 21, 22, 23]
+
+
+def test_height_to_cm():
+    heights = pd.Series(["6' 2\"", '--', "5'11\"", "6' 2\"", None], index=[4, 3, 2, 1, 0])
+
+    cm = NormalizationHandler.height_to_cm(heights)
+
+    assert cm.index.tolist() == [4, 3, 2, 1, 0]
+    assert cm.iloc[2] == pytest.approx(5 * 30.48 + 11 * 2.54)
+    assert cm.iloc[0] == cm.iloc[3] == pytest.approx(6 * 30.48 + 2 * 2.54)
+    assert cm.isna().tolist() == [False, True, False, False, True]
+
+
+def test_weight_to_kg():
+    kg = NormalizationHandler.weight_to_kg(pd.Series(['220 lbs', '180.5 lbs', 'unknown', None]))
+
+    assert kg.iloc[0] == pytest.approx(220 / 2.205)
+    assert kg.iloc[1] == pytest.approx(180.5 / 2.205)
+    assert kg.isna().tolist() == [False, False, True, True]
+
+
+def test_split_number():
+    names, numbers = NormalizationHandler.split_number(pd.Series(['Lionel Messi30', 'Pedri', 'Lionel Messi30', None]))
+
+    assert names.tolist()[:3] == ['Lionel Messi', 'Pedri', 'Lionel Messi']
+    assert numbers.tolist()[:1] == [30.0]
+    assert numbers.isna().tolist() == [False, True, False, True]
+
+
+def test_normalize_players():
+    df = NormalizationHandler.normalize_players(pd.DataFrame({
+        'NAME': ['A', 'B'], 'HT': ["6' 2\"", '--'], 'WT': ['220 lbs', ''], 'AGE': ['24', '--'], 'POS': ['G', 'F'],
+    }), ['AGE', 'HT'])
+
+    assert df['HT'].iloc[0] == pytest.approx(187.96)
+    assert df['WT'].iloc[0] == pytest.approx(220 / 2.205)
+    assert df['AGE'].tolist()[:1] == [24]
+    assert df[['HT', 'WT', 'AGE']].iloc[1].isna().all()
+    assert df['POS'].tolist() == ['G', 'F']
@@ -0,0 +1,144 @@
+import datetime
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from conftest import make_response
+from helpers.concurrency_handler import ConcurrencyHandler
+from helpers.http_handler import HttpHandler
+from helpers.orchestrator_handler import OrchestratorHandler
+from helpers.snapshot_handler import SnapshotHandler
+
+pytest.importorskip('pyarrow')
+
+
+class FakeScraper:
+    """Scraper writing made up matches, players and news, news changing at every fetch."""
+
+    fetches = 0
+    __news = None
+
+    @staticmethod
+    def cache_matches(start_date=None, end_date=None, incremental=True):
+        days = pd.date_range(start_date, end_date)
+        SnapshotHandler.merge_partitioned('nba', 'matches', pd.DataFrame({
+            'DATE': days, 'TEAM1': 'Detroit', 'TEAM2': '@ Boston', 'RESULT': 'DET 100, BOS 90',
+        }), start_date, end_date)
+
+    @staticmethod
+    def cache_players(season_years=None):
+        SnapshotHandler.write('nba', 'players', pd.DataFrame({'NAME': ['A', 'B'], 'SEASON': season_years * 2}))
+
+    @staticmethod
+    def get_formatted_news(fast_fetch=False, refresh=False):
+        if FakeScraper.__news is None or refresh:
+            FakeScraper.fetches += 1
+            FakeScraper.__news = [{'headline': f'fetch {FakeScraper.fetches}', 'dataSourceIdentifier': 'a',
+                                   'categories': [], 'images': []}]
+        return FakeScraper.__news
+
+    @staticmethod
+    def get_news_images(fast_fetch=False):
+        return pd.DataFrame({'article_id': [x['dataSourceIdentifier'] for x in FakeScraper.__news]})
+
+    @staticmethod
+    def get_news_categories(fast_fetch=False):
+        return pd.DataFrame({'article_id': [x['dataSourceIdentifier'] for x in FakeScraper.__news]})
+
+
+class SlowSession:
+    """Session taking a while to answer, recording the largest number of requests in flight."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(0.02)
+        with self.lock:
+            self.in_flight -= 1
+        response = make_response()
+        response.url = url
+        return response
+
+
+@pytest.fixture
+def orchestrator(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(SnapshotHandler, 'directory', str(tmp_path / 'snapshots'))
+    monkeypatch.setattr(OrchestratorHandler, 'scrapers', {'nba': 'test_orchestrator_handler:FakeScraper'})
+    monkeypatch.setattr(OrchestratorHandler, 'season_years', [2024])
+    monkeypatch.setattr(FakeScraper, 'fetches', 0)
+
+
+def test_plan_splits_missing_days_into_windows(orchestrator):
+    tasks = OrchestratorHandler.plan(start_date=datetime.date(2024, 10, 1), end_date=datetime.date(2024, 10, 10))
+
+    assert [x['entity'] for x in tasks] == ['players', 'news', 'matches', 'matches']
+    assert [(x['start_date'], x['end_date']) for x in tasks[2:]] == [
+        (datetime.date(2024, 10, 1), datetime.date(2024, 10, 7)),
+        (datetime.date(2024, 10, 8), datetime.date(2024, 10, 10)),
+    ]
+
+
+def test_run_writes_every_entity(orchestrator):
+    report = OrchestratorHandler.run(start_date=datetime.date(2024, 10, 1), end_date=datetime.date(2024, 10, 10),
+                                     max_workers=2)
+
+    assert report['error'].isna().all()
+    assert report['rows'].tolist() == [2, 1, 7, 3]
+    assert len(SnapshotHandler.read_range('nba', 'matches')) == 10
+    assert SnapshotHandler.read('nba', 'players')['SEASON'].tolist() == [2024, 2024]
+
+
+def test_failed_task_does_not_stop_the_others(orchestrator, monkeypatch):
+    def fail(season_years=None):
+        raise RuntimeError('roster page changed')
+
+    monkeypatch.setattr(FakeScraper, 'cache_players', staticmethod(fail))
+
+    report = OrchestratorHandler.run(entities=['players', 'news'])
+
+    assert report['error'].tolist()[0] == "RuntimeError('roster page changed')"
+    assert report['rows'].tolist()[1] == 1
+
+
+def test_every_run_fetches_the_news_again(orchestrator):
+    for _ in range(2):
+        OrchestratorHandler.run(entities=['news'])
+
+    assert FakeScraper.fetches == 2
+    assert SnapshotHandler.read('nba', 'news')['headline'].tolist() == ['fetch 2']
+
+
+def test_limiting_is_scoped_to_its_context(session, monkeypatch):
+    slow = SlowSession()
+    monkeypatch.setattr(HttpHandler, 'get_session', staticmethod(lambda: slow))
+    urls = [f'https://example{x % 4}.com/{x}' for x in range(16)]
+
+    with HttpHandler.limiting(2):
+        assert HttpHandler.max_in_flight is None
+        ConcurrencyHandler.map_threaded(HttpHandler.get, urls, max_workers=8)
+
+    assert slow.peak == 2
+
+    # Runs overlapping in other threads keep budgets of their own
+    slow.peak = 0
+
+    def run():
+        with HttpHandler.limiting(1):
+            ConcurrencyHandler.map_threaded(HttpHandler.get, urls, max_workers=4)
+
+    threads = [threading.Thread(target=run) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert slow.peak == 2
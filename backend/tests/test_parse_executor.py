@@ -0,0 +1,68 @@
+import os
+
+import pytest
+
+from helpers.parse_executor import ParseExecutor
+from helpers.parser_handler import ParserHandler
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), 'rb') as file:
+        return file.read()
+
+
+def report_engine(key, page):
+    """Parse function telling which engine the worker parses with."""
+
+    return [(key, ParserHandler.engine, len(page))]
+
+
+@pytest.fixture
+def lxml_engine():
+    pytest.importorskip('lxml')
+    previous = ParserHandler.engine
+    ParserHandler.configure(engine='lxml')
+    yield 'lxml'
+    ParserHandler.configure(engine=previous)
+
+
+@pytest.fixture
+def specs(monkeypatch):
+    monkeypatch.setattr(ParseExecutor, 'specs', dict(ParseExecutor.specs))
+    monkeypatch.setattr(ParseExecutor, 'use_processes', True)
+    return ParseExecutor.specs
+
+
+def test_workers_use_the_configured_engine(lxml_engine, specs):
+    ParseExecutor.register('test', 'engine', 'test_parse_executor:report_engine')
+
+    with ParseExecutor(max_workers=2, chunk_size=2) as executor:
+        rows = list(executor.map('test', 'engine', [(x, b'<p></p>') for x in range(5)]))
+
+    assert rows == [(x, ((x, 'lxml', 7),)) for x in range(5)]
+
+
+def test_workers_parse_like_the_calling_process(lxml_engine, specs):
+    pages = [('20241005', read_fixture('soccer_fixtures.html'))] * 3
+    expected = ParseExecutor.parse('soccer', 'fixtures', *pages[0])
+
+    with ParseExecutor(max_workers=2) as executor:
+        rows = list(executor.map('soccer', 'fixtures', pages, chunk_size=1))
+
+    assert len(expected) == 3
+    assert rows == [('20241005', expected)] * 3
+
+
+def test_rows_are_compacted_into_tuples(specs):
+    ParseExecutor.register('test', 'engine', 'test_parse_executor:report_engine')
+
+    rows = ParseExecutor.parse('test', 'engine', 'day', 'é'.encode('utf-8'))
+
+    assert rows == (('day', ParserHandler.engine, 1),)
+
+
+def test_unknown_page_kind(specs):
+    with pytest.raises(ValueError):
+        ParseExecutor.parse('test', 'unknown', 'day', b'')
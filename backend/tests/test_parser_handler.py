@@ -0,0 +1,161 @@
+import os
+import re
+
+import pytest
+import requests
+
+from helpers.archive_handler import ArchiveHandler
+
+from helpers.parser_handler import LexborHTMLParser, ParserHandler
+from scrapers.mlb_scraper import MLBScraper
+from scrapers.nba_scraper import NBAScraper
+from scrapers.nfl_scraper import NFLScraper
+from scrapers.nhl_scraper import NHLScraper
+from scrapers.soccer_scraper import SoccerScraper
+from scrapers.wnba_scraper import WNBAScraper
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+US_SCRAPERS = [NBAScraper, NFLScraper, MLBScraper, NHLScraper, WNBAScraper]
+
+
+def available(engine):
+    if engine == 'lxml':
+        return pytest.importorskip('lxml') is not None
+    if engine == 'lexbor' and LexborHTMLParser is None:
+        pytest.skip('selectolax is not installed')
+    return True
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as file:
+        return file.read()
+
+
+@pytest.fixture(params=ParserHandler.ENGINES)
+def engine(request):
+    available(request.param)
+    previous = ParserHandler.engine
+    ParserHandler.configure(engine=request.param)
+    yield request.param
+    ParserHandler.configure(engine=previous)
+
+
+def parse_with(engine, parse):
+    """Runs parse with html.parser then with engine, returning both results."""
+
+    ParserHandler.configure(engine='html.parser')
+    expected = parse()
+    ParserHandler.configure(engine=engine)
+    return expected, parse()
+
+
+@pytest.mark.parametrize('tables_only', [False, True])
+@pytest.mark.parametrize('name', ['soccer_fixtures.html', 'us_schedule.html', 'us_roster.html'])
+def test_extract_tables_parity(engine, name, tables_only):
+    page = read_fixture(name)
+
+    expected = ParserHandler.extract_tables(ParserHandler.parse(page, 'html.parser'))
+    tables = ParserHandler.extract_tables(ParserHandler.parse(page, engine, tables_only))
+
+    assert expected
+    assert tables == expected
+
+
+def test_soccer_matches_parity(engine):
+    page = read_fixture('soccer_fixtures.html')
+
+    expected, rows = parse_with(engine, lambda: SoccerScraper.parse_matches_day('20241005', page))
+
+    assert len(expected) == 3
+    assert rows == expected
+
+
+@pytest.mark.parametrize('scraper', US_SCRAPERS, ids=lambda x: x.__name__)
+def test_us_matches_parity(engine, scraper):
+    page = read_fixture('us_schedule.html')
+
+    expected, rows = parse_with(engine, lambda: scraper.parse_matches_day('20241010', page))
+
+    assert expected
+    assert rows == expected
+
+
+@pytest.mark.parametrize('scraper', US_SCRAPERS, ids=lambda x: x.__name__)
+def test_us_roster_parity(engine, scraper):
+    page = read_fixture('us_roster.html')
+
+    expected, rows = parse_with(engine, lambda: scraper.parse_club_players(None, page))
+
+    assert expected
+    assert rows == expected
+
+
+@pytest.mark.parametrize('tables_only', [False, True])
+def test_check_parity_on_archived_pages(tmp_path, tables_only):
+    previous = ArchiveHandler.directory
+    ArchiveHandler.configure(directory=str(tmp_path))
+    try:
+        urls = []
+        for name in ['soccer_fixtures.html', 'us_schedule.html', 'us_roster.html']:
+            response = requests.Response()
+            response.status_code = 200
+            response.headers['Content-Type'] = 'text/html; charset=utf-8'
+            response._content = read_fixture(name).encode('utf-8')
+            ArchiveHandler.append(f'https://www.espn.com/{name}', response)
+            urls.append(f'https://www.espn.com/{name}')
+
+        engines = [x for x in ParserHandler.ENGINES if x != 'lexbor' or LexborHTMLParser is not None]
+        assert ParserHandler.check_parity(urls, engines=engines, tables_only=tables_only) == []
+    finally:
+        ArchiveHandler.configure(directory=previous)
+
+
+def test_lexbor_collapses_whitespace_strings():
+    available('lexbor')
+    page = '<table class="Table"><tr><td><span>@</span>  <span>Detroit</span><pre>  </pre></td>' \
+           '<td><span>@</span> &nbsp;<span>Boston</span></td></tr></table>'
+
+    texts = [[y.text for y in ParserHandler.parse(page, x).select('td')] for x in ('html.parser', 'lexbor')]
+
+    assert texts[0] == texts[1] == ['@ Detroit  ', '@ \xa0Boston']
+
+
+def tbody_rows(document):
+    return [[x.text for x in row.select('td')] for table in document.select('tbody') for row in table.select('tr')]
+
+
+def test_soccer_fixtures_without_table_class(tmp_path):
+    # A fixtures table with no Table class and no title ahead of it is still read
+    page = read_fixture('soccer_fixtures.html') \
+        .replace('<div class="Table__Title">English Premier League</div>', '', 1) \
+        .replace('<table class="Table">', '<table class="Schedule">', 1)
+    previous = ArchiveHandler.directory
+    ArchiveHandler.configure(directory=str(tmp_path))
+    try:
+        urls = []
+        for name, content in [('soccer_fixtures.html', read_fixture('soccer_fixtures.html')), ('untitled.html', page)]:
+            response = requests.Response()
+            response.status_code = 200
+            response.headers['Content-Type'] = 'text/html; charset=utf-8'
+            response._content = content.encode('utf-8')
+            ArchiveHandler.append(f'https://www.espn.com/{name}', response)
+            urls.append(f'https://www.espn.com/{name}')
+
+        engines = [x for x in ParserHandler.ENGINES if x != 'lexbor' or LexborHTMLParser is not None]
+        assert ParserHandler.check_parity(urls, tbody_rows, engines, tables_only=True, by_tag=True) == []
+        assert ParserHandler.check_parity(urls[1:], tbody_rows, ['html.parser'], tables_only=True)
+    finally:
+        ArchiveHandler.configure(directory=previous)
+
+    assert len(SoccerScraper.parse_matches_day('20241005', page)) == 3
+
+
+@pytest.mark.parametrize('scraper', US_SCRAPERS, ids=lambda x: x.__name__)
+def test_us_matches_without_title(scraper):
+    page = re.sub(r'<div class="Table__Title">[^<]*</div>', '', read_fixture('us_schedule.html'))
+
+    rows = scraper.parse_matches_day('20241010', page)
+
+    assert rows
+    assert {x[-1] for x in rows} == {None if scraper.spec['date_format'] == 'title' else '20241010'}
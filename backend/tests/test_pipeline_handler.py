@@ -0,0 +1,105 @@
+import datetime
+
+import pandas as pd
+import pytest
+
+from helpers.parse_executor import ParseExecutor
+from helpers.pipeline_handler import PipelineHandler
+from helpers.snapshot_handler import SnapshotHandler
+
+
+def fetch_page(key):
+    """Fetch function skipping the odd keys and failing on negative ones."""
+
+    if key < 0:
+        raise RuntimeError(f'cannot fetch {key}')
+    if key % 2:
+        return None
+    return f'page {key}'.encode('utf-8')
+
+
+def parse_page(key, page):
+    """Parse function returning the key and the length of its page."""
+
+    return [(key, len(page))]
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    monkeypatch.setattr(PipelineHandler, 'pipelines', dict(PipelineHandler.pipelines))
+    monkeypatch.setattr(ParseExecutor, 'specs', dict(ParseExecutor.specs))
+    monkeypatch.setattr(ParseExecutor, 'use_processes', False)
+    PipelineHandler.register('test', 'pages', 'test_pipeline_handler:fetch_page', 'page')
+    ParseExecutor.register('test', 'page', 'test_pipeline_handler:parse_page')
+
+
+def test_pages_are_fetched_parsed_and_written(pipeline):
+    batches = []
+
+    written = PipelineHandler.run('test', 'pages', range(10), batches.append, fetch_workers=3, parse_workers=2,
+                                  queue_size=2, batch_size=2)
+
+    # Odd keys are skipped, the others written by batches of up to 2 keys
+    assert written == 5
+    assert all(1 <= len(x) <= 2 for x in batches)
+    assert sorted(x for batch in batches for x in batch) == [(x, ((x, len(f'page {x}')),)) for x in range(0, 10, 2)]
+
+
+def test_pages_are_parsed_by_processes(pipeline, monkeypatch):
+    monkeypatch.setattr(ParseExecutor, 'use_processes', True)
+    batches = []
+
+    written = PipelineHandler.run('test', 'pages', [0, 2, 4], batches.append, fetch_workers=2, parse_workers=2)
+
+    assert written == 3
+    assert sorted(x for batch in batches for x in batch) == [(x, ((x, 6),)) for x in [0, 2, 4]]
+
+
+def test_fetch_error_stops_the_pipeline(pipeline):
+    batches = []
+
+    with pytest.raises(RuntimeError, match='cannot fetch -1'):
+        PipelineHandler.run('test', 'pages', [0, 2, -1] + list(range(4, 1000, 2)), batches.append, fetch_workers=2,
+                            parse_workers=1, queue_size=2, batch_size=2)
+
+    assert sum(len(x) for x in batches) < 500
+
+
+def test_writer_error_stops_the_pipeline(pipeline):
+    def write(batch):
+        raise OSError('disk full')
+
+    with pytest.raises(OSError, match='disk full'):
+        PipelineHandler.run('test', 'pages', range(100), write, fetch_workers=2, parse_workers=1, batch_size=1)
+
+
+def test_unknown_pipeline(pipeline):
+    with pytest.raises(ValueError):
+        PipelineHandler.run('test', 'unknown', [0], print)
+    with pytest.raises(AttributeError):
+        PipelineHandler.register('test', 'missing', 'test_pipeline_handler:missing', 'page')
+    with pytest.raises(ValueError):
+        PipelineHandler.run('test', 'pages', [0], print, batch_size=-1)
+
+
+def test_write_days_records_the_fetched_days_only(tmp_path, monkeypatch):
+    pytest.importorskip('pyarrow')
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(SnapshotHandler, 'directory', str(tmp_path / 'snapshots'))
+
+    def build(rows):
+        return pd.DataFrame(rows, columns=['date', 'club1', 'SCORE', 'club2'])
+
+    # Batches are not ordered, the 7th was not fetched
+    PipelineHandler.write_days('soccer', 'matches', [
+        ('20241008', [(pd.Timestamp(2024, 10, 8), 'Chelsea', '0 - 0', 'Everton')]),
+        ('20241005', [(pd.Timestamp(2024, 10, 5), 'Arsenal', '3 - 1', 'Brighton')]),
+        ('20241006', []),
+    ], build)
+
+    df = SnapshotHandler.read_range('soccer', 'matches')
+    missing = SnapshotHandler.get_missing_days('soccer', 'matches', datetime.date(2024, 10, 5),
+                                               datetime.date(2024, 10, 8), frozen_before=datetime.date(2024, 10, 5))
+
+    assert df['club1'].tolist() == ['Arsenal', 'Chelsea']
+    assert missing == [datetime.date(2024, 10, 7)]
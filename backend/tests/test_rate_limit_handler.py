@@ -0,0 +1,96 @@
+import time
+
+import pytest
+import requests
+
+from conftest import make_response
+from helpers.http_handler import HttpHandler
+from helpers.rate_limit_handler import CircuitOpenError, RateLimitHandler
+
+URL = 'https://example.com/page'
+
+
+@pytest.fixture
+def limiter(session, monkeypatch):
+    """Sends requests to the fake session, the settings given to configure are restored afterwards."""
+
+    def configure(**settings):
+        for name, value in settings.items():
+            monkeypatch.setattr(RateLimitHandler, name, value)
+        RateLimitHandler.configure()
+
+    session.configure = configure
+    yield session
+    RateLimitHandler.configure()
+
+
+def test_failures_are_retried(limiter):
+    limiter.replies = [make_response(status=503), requests.ConnectionError('reset'), make_response(content=b'ok')]
+
+    assert HttpHandler.get(URL).content == b'ok'
+    assert len(limiter.requests) == 3
+
+
+def test_last_failure_is_returned_or_raised(limiter):
+    limiter.replies = [make_response(status=503)] * 2 + [requests.ConnectionError('reset')] * 2
+
+    assert HttpHandler.get(URL, tries=2).status_code == 503
+    with pytest.raises(requests.ConnectionError):
+        HttpHandler.get(URL, tries=2)
+
+
+def test_circuit_opens_then_lets_a_trial_through(limiter):
+    limiter.configure(failure_threshold=3, cooldown=0.05)
+    limiter.replies = [make_response(status=500)] * 3
+
+    HttpHandler.get(URL, tries=3)
+    with pytest.raises(CircuitOpenError):
+        HttpHandler.get(URL)
+    assert len(limiter.requests) == 3
+
+    # Once the cooldown is over a single trial request decides, a success closes the circuit
+    time.sleep(0.06)
+    limiter.replies = [make_response(content=b'ok'), make_response(content=b'again')]
+    assert HttpHandler.get(URL).content == b'ok'
+    assert HttpHandler.get(URL).content == b'again'
+
+
+def test_failed_trial_opens_the_circuit_again(limiter):
+    limiter.configure(failure_threshold=2, cooldown=0.05)
+    limiter.replies = [make_response(status=500)] * 3
+
+    HttpHandler.get(URL, tries=2)
+    time.sleep(0.06)
+    assert HttpHandler.get(URL, tries=1).status_code == 500
+
+    with pytest.raises(CircuitOpenError):
+        HttpHandler.get(URL)
+
+
+def test_retry_budget_bounds_the_retries(limiter):
+    limiter.configure(min_retries=2, retry_ratio=0)
+    limiter.replies = [make_response(status=503)] * 10
+
+    # The budget pays 2 retries in total, whatever the number of tries allowed
+    HttpHandler.get(URL, tries=5)
+    HttpHandler.get(URL, tries=5)
+
+    assert len(limiter.requests) == 4
+
+
+def test_token_bucket_spaces_requests_once_the_burst_is_spent(limiter):
+    limiter.configure(rate=50.0, burst=2)
+
+    started_at = time.monotonic()
+    for _ in range(5):
+        RateLimitHandler.acquire('example.com')
+
+    # 2 requests from the burst, then 3 at 50 per second
+    assert time.monotonic() - started_at >= 0.05
+
+
+def test_get_delay():
+    assert RateLimitHandler.get_delay(1, '3') == 3
+    assert RateLimitHandler.get_delay(1, '3600') == RateLimitHandler.backoff_max
+    assert RateLimitHandler.get_delay(1, 'Mon, 07 Oct 2024 00:00:00 GMT') == 0
+    assert 0 <= RateLimitHandler.get_delay(3) <= RateLimitHandler.backoff_base * 4
@@ -0,0 +1,59 @@
+import pandas as pd
+import pytest
+
+from helpers.row_accumulator import RowAccumulator
+
+
+def test_builds_the_frame_across_chunks():
+    rows = RowAccumulator(['NAME', 'AGE'], dtypes={'AGE': 'Int64'}, chunk_rows=2)
+    rows.extend([['A', 20], ['B', None], ['C', 31]])
+
+    df = rows.to_frame()
+
+    assert len(rows) == 3
+    assert df['NAME'].tolist() == ['A', 'B', 'C']
+    assert df['AGE'].dtype == 'Int64'
+    assert df['AGE'].isna().tolist() == [False, True, False]
+    assert df.index.tolist() == [0, 1, 2]
+
+
+def test_repairs_are_counted_and_reported(capsys):
+    rows = RowAccumulator(['NAME', 'AGE', 'SOURCE'])
+    rows.append(['A'], ['json'])
+    rows.append(['B', 20, 'extra'], ['html'])
+    rows.append(['C', 31], ['html'])
+
+    df = rows.to_frame()
+
+    assert df['NAME'].tolist() == ['A', 'B', 'C']
+    assert df['AGE'].isna().tolist() == [True, False, False]
+    assert df['SOURCE'].tolist() == ['json', 'html', 'html']
+    assert (rows.padded, rows.truncated) == (1, 1)
+    assert '1 rows padded and 1 rows truncated' in capsys.readouterr().out
+
+
+def test_strict_rejects_mismatched_rows():
+    rows = RowAccumulator(['NAME', 'AGE'], strict=True)
+    rows.append(['A', 20])
+
+    with pytest.raises(ValueError):
+        rows.append(['B'])
+    with pytest.raises(ValueError):
+        rows.append(['C', 31, 'extra'])
+
+    assert len(rows) == 1
+
+
+def test_empty_frame_keeps_its_columns():
+    df = RowAccumulator(['NAME', 'AGE']).to_frame()
+
+    assert df.empty
+    assert df.columns.tolist() == ['NAME', 'AGE']
+
+
+def test_to_arrow():
+    pytest.importorskip('pyarrow')
+    rows = RowAccumulator(['NAME', 'AGE'])
+    rows.append(['A', 20])
+
+    assert rows.to_arrow().to_pandas().equals(pd.DataFrame({'NAME': ['A'], 'AGE': [20]}))
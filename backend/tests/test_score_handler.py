@@ -0,0 +1,65 @@
+import pandas as pd
+
+from helpers.score_handler import ScoreHandler
+from models.club import Club
+
+CLUBS = [Club(1, 'Tigers', 'tigers', 'DET', 'Detroit Tigers', 'Tigers', 'Detroit', None, None),
+         Club(2, 'Guardians', 'guardians', 'CLE', 'Cleveland Guardians', 'Guardians', 'Cleveland', None, None)]
+
+
+def winners(df):
+    return [None if pd.isna(x) else x for x in df['WINNER']]
+
+
+def results(*rows):
+    return ScoreHandler.parse_results(pd.DataFrame(rows, columns=['TEAM1', 'TEAM2', 'RESULT']), CLUBS)
+
+
+def test_results_winner_listed_first():
+    df = results(('Detroit', '@ Cleveland', 'DET 3, CLE 1'))
+
+    assert df.loc[0, ['HOME', 'AWAY', 'WINNER', 'MARGIN']].tolist() == ['CLE', 'DET', 'DET', 2]
+    assert df.loc[0, ['HOME_SCORE', 'AWAY_SCORE']].tolist() == [1, 3]
+
+
+def test_results_loser_listed_first():
+    df = results(('Detroit', '@ Cleveland', 'DET 1, CLE 3'))
+
+    assert df.loc[0, ['HOME', 'AWAY', 'WINNER', 'MARGIN']].tolist() == ['CLE', 'DET', 'CLE', 2]
+    assert df.loc[0, ['HOME_SCORE', 'AWAY_SCORE']].tolist() == [3, 1]
+
+
+def test_results_without_clubs():
+    df = ScoreHandler.parse_results(pd.DataFrame({'TEAM1': ['Detroit', 'Detroit'], 'TEAM2': ['@ Cleveland'] * 2,
+                                                  'RESULT': ['DET 1, CLE 3', 'DET 2, CLE 2']}))
+
+    assert winners(df) == ['CLE', None]
+    assert df['MARGIN'].tolist() == [2, 0]
+    assert df['HOME'].isna().all()
+
+
+def test_results_overtime_shootout_and_unplayed():
+    df = results(('Detroit', '@ Cleveland', 'CLE 4, DET 3 (OT)'),
+                 ('Detroit', '@ Cleveland', 'DET 2, CLE 1 (SO)'),
+                 ('Detroit', '@ Cleveland', 'Postponed'))
+
+    assert df['OVERTIME'].tolist() == [True, False, False]
+    assert df['SHOOTOUT'].tolist() == [False, True, False]
+    assert winners(df) == ['CLE', 'DET', None]
+    assert df['HOME_SCORE'].isna().tolist() == [False, False, True]
+
+
+def test_scores():
+    df = ScoreHandler.parse_scores(pd.DataFrame({
+        'club1': ['Arsenal', 'Liverpool', 'Everton', 'Barcelona'],
+        'club2': ['Brighton', 'Chelsea', 'Fulham', 'Real Madrid'],
+        'SCORE': ['3 - 1', '2 - 2', '0 - 2', 'v'],
+        'DURATION': ['FT', 'FT-Pens', 'AET', '7:00 PM'],
+    }))
+
+    # Home wins, draws, away wins and fixtures
+    assert winners(df) == ['Arsenal', None, 'Fulham', None]
+    assert df['MARGIN'].tolist()[:3] == [2, 0, 2]
+    assert df['MARGIN'].isna().tolist() == [False, False, False, True]
+    assert df['OVERTIME'].tolist() == [False, False, True, False]
+    assert df['SHOOTOUT'].tolist() == [False, True, False, False]
@@ -0,0 +1,100 @@
+import datetime
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from helpers.snapshot_handler import SnapshotHandler
+from scrapers.mlb_scraper import MLBScraper
+from scrapers.soccer_scraper import SoccerScraper
+
+pytest.importorskip('pyarrow')
+
+LEGACY_CSV = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'cached_matches.csv')
+
+
+@pytest.fixture
+def snapshots(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(SnapshotHandler, 'directory', str(tmp_path / 'snapshots'))
+    shutil.copy(LEGACY_CSV, tmp_path / 'cached_matches_mlb.csv')
+    return tmp_path
+
+
+def scraped_day(legacy, day):
+    df = legacy.iloc[:1].copy()
+    df['DATE'] = pd.Timestamp(day)
+    df['RESULT'] = 'DET 1, CLE 0'
+    return df
+
+
+def test_merge_keeps_the_legacy_csv_history(snapshots):
+    legacy = SnapshotHandler.read('mlb', 'matches', legacy_csv='cached_matches_mlb.csv')
+    day = datetime.date(2024, 11, 18)
+
+    SnapshotHandler.merge_partitioned('mlb', 'matches', scraped_day(legacy, day), day, day)
+
+    df = SnapshotHandler.read_range('mlb', 'matches')
+    assert len(df) == len(legacy) + 1
+    assert len(SnapshotHandler.read_range('mlb', 'matches', datetime.date(2024, 10, 1),
+                                          datetime.date(2024, 10, 31))) == len(legacy)
+
+
+def test_legacy_days_are_not_missing(snapshots):
+    legacy = SnapshotHandler.read('mlb', 'matches', legacy_csv='cached_matches_mlb.csv')
+    first, last = legacy['DATE'].min().date(), legacy['DATE'].max().date()
+
+    missing = SnapshotHandler.get_missing_days('mlb', 'matches', first - datetime.timedelta(days=2), last)
+
+    # The days the legacy cache covers were scraped on the day of its timestamp, 2024-11-16
+    assert missing == [first - datetime.timedelta(days=2), first - datetime.timedelta(days=1)]
+    assert SnapshotHandler.get_manifest('mlb', 'matches')['month=2024-10.parquet']['days'][last.isoformat()] == \
+        '2024-11-16'
+
+
+def test_migrates_the_unpartitioned_snapshot(snapshots):
+    legacy = SnapshotHandler.read('mlb', 'matches', legacy_csv='cached_matches_mlb.csv')
+    os.remove(snapshots / 'cached_matches_mlb.csv')
+    SnapshotHandler.write('mlb', 'matches', legacy)
+
+    manifest = SnapshotHandler.migrate('mlb', 'matches')
+
+    assert sum(x['rows'] for x in manifest.values()) == len(legacy)
+    assert SnapshotHandler.get_missing_days('mlb', 'matches', datetime.date(2024, 10, 10),
+                                            datetime.date(2024, 10, 31), datetime.date.today()) == []
+
+
+def test_write_partitioned_records_months_without_rows(snapshots):
+    legacy = SnapshotHandler.read('mlb', 'matches', legacy_csv='cached_matches_mlb.csv')
+    df = pd.concat([legacy, scraped_day(legacy, datetime.date(2024, 12, 2))], ignore_index=True)
+
+    manifest = SnapshotHandler.write_partitioned('mlb', 'matches', df, datetime.date(2024, 12, 10))
+
+    assert manifest['month=2024-11.parquet']['rows'] == 0
+    assert len(manifest['month=2024-11.parquet']['days']) == 30
+    assert SnapshotHandler.get_missing_days('mlb', 'matches', datetime.date(2024, 10, 10),
+                                            datetime.date(2024, 12, 2)) == []
+    assert len(SnapshotHandler.read_range('mlb', 'matches', datetime.date(2024, 11, 1),
+                                          datetime.date(2024, 11, 30))) == 0
+
+
+def test_without_history(snapshots):
+    os.remove(snapshots / 'cached_matches_mlb.csv')
+
+    assert SnapshotHandler.migrate('mlb', 'matches') is None
+    with pytest.raises(FileNotFoundError):
+        SnapshotHandler.read_range('mlb', 'matches')
+
+
+def test_fast_fetch_returns_dates(snapshots):
+    SnapshotHandler.write_partitioned('soccer', 'matches', pd.DataFrame({
+        'date': [pd.Timestamp(2024, 10, 5)], 'club1': ['Arsenal'], 'SCORE': ['3 - 1'], 'club2': ['Brighton'],
+    }))
+
+    matches = [MLBScraper.scrap_matches(fast_fetch=True)['DATE'],
+               SoccerScraper.scrap_matches(datetime.date(2024, 10, 1), datetime.date(2024, 10, 31), True)['date']]
+
+    for dates in matches:
+        assert len(dates)
+        assert all(type(x) is datetime.date for x in dates)